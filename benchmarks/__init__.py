@@ -0,0 +1,4 @@
+"""
+Benchmark package for poker game.
+Contains throughput benchmarks for the evaluator, deck, betting loop and full hands.
+"""
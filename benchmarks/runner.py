@@ -0,0 +1,107 @@
+"""
+Timing, reporting and baseline comparison for the benchmark suite.
+"""
+import json
+import platform
+import random
+import time
+
+class BenchmarkResult:
+    """Timing of one benchmark: per-operation times of several samples."""
+    
+    def __init__(self, name, ops_per_sample, sample_times):
+        self.name = name
+        self.ops_per_sample = ops_per_sample
+        # Seconds per operation, one entry per sample
+        self.per_op = sorted(t / ops_per_sample for t in sample_times)
+        
+    @property
+    def ops_per_sec(self):
+        return len(self.per_op) / sum(self.per_op)
+    
+    def percentile(self, pct):
+        """Per-operation time (seconds) at a percentile of the samples, nearest-rank."""
+        index = min(len(self.per_op) - 1, max(0, round(pct / 100 * len(self.per_op)) - 1))
+        return self.per_op[index]
+    
+    def to_dict(self):
+        return {
+            "ops_per_sec": self.ops_per_sec,
+            "p50_us": self.percentile(50) * 1e6,
+            "p90_us": self.percentile(90) * 1e6,
+            "p99_us": self.percentile(99) * 1e6,
+            "samples": len(self.per_op),
+            "ops_per_sample": self.ops_per_sample,
+        }
+
+def run_benchmark(name, setup, ops_per_sample, samples, seed):
+    """
+    Time one benchmark.
+    
+    Args:
+        name: Benchmark name
+        setup: Function(rng) returning a zero-argument operation to time
+        ops_per_sample: Operations per timed sample
+        samples: Number of timed samples
+        seed: Seed for the benchmark's inputs and for the global random module
+        
+    Returns:
+        BenchmarkResult: Timing results
+    """
+    # Seed both the inputs and anything inside the game that uses the global generator
+    random.seed(seed)
+    operation = setup(random.Random(seed))
+    # One untimed warm-up sample (builds lookup tables, fills caches)
+    for _ in range(ops_per_sample):
+        operation()
+        
+    sample_times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(ops_per_sample):
+            operation()
+        sample_times.append(time.perf_counter() - start)
+    return BenchmarkResult(name, ops_per_sample, sample_times)
+
+def format_results(results):
+    """Return a text table of benchmark results."""
+    lines = [f"{'benchmark':<28}{'ops/sec':>14}{'p50 us':>12}{'p90 us':>12}{'p99 us':>12}"]
+    for result in results:
+        d = result.to_dict()
+        lines.append(f"{result.name:<28}{d['ops_per_sec']:>14,.0f}{d['p50_us']:>12.2f}"
+                     f"{d['p90_us']:>12.2f}{d['p99_us']:>12.2f}")
+    return "\n".join(lines)
+
+def save_results(results, path):
+    """Write results to a JSON file."""
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": {result.name: result.to_dict() for result in results},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+def compare_to_baseline(results, path, threshold):
+    """
+    Compare results with a saved JSON baseline.
+    
+    Args:
+        results: List of BenchmarkResult
+        path: Baseline file written by save_results()
+        threshold: Allowed slowdown as a fraction (0.1 = 10% fewer ops/sec)
+        
+    Returns:
+        list: (name, baseline ops/sec, current ops/sec, change) for each regression
+    """
+    with open(path) as f:
+        baseline = json.load(f)["benchmarks"]
+    regressions = []
+    for result in results:
+        if result.name not in baseline:
+            continue
+        before = baseline[result.name]["ops_per_sec"]
+        change = (result.ops_per_sec - before) / before
+        if change < -threshold:
+            regressions.append((result.name, before, result.ops_per_sec, change))
+    return regressions
@@ -0,0 +1,140 @@
+"""
+Benchmark definitions.
+
+Each benchmark is (name, setup, ops per sample). setup(rng) prepares inputs
+from a seeded generator and returns the operation to time.
+"""
+import os
+import subprocess
+import sys
+from models.card import Card
+from models.deck import Deck, IndexedDeck
+from game import evaluator
+from game.poker_game import Game
+from game.events import EventSink
+from game.npc import get_npc_action
+from game.simulation import play_hand
+
+NUM_INPUTS = 1000
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _random_hands(rng, size):
+    return [rng.sample(range(evaluator.NUM_CARDS), size) for _ in range(NUM_INPUTS)]
+
+def _cycle(items):
+    """Return a function that yields the next item on each call, wrapping around."""
+    state = {"i": 0}
+    def next_item():
+        i = state["i"]
+        state["i"] = (i + 1) % len(items)
+        return items[i]
+    return next_item
+
+def setup_evaluate7(rng):
+    next_hand = _cycle(_random_hands(rng, 7))
+    def op():
+        evaluator.evaluate7(*next_hand())
+    return op
+
+def setup_evaluate_hand(rng):
+    game = Game(["Player 1", "Player 2"], events=EventSink())
+    player = game.players[0]
+    spots = []
+    for indices in _random_hands(rng, 7):
+        spots.append([Card.from_index(i) for i in indices])
+    next_spot = _cycle(spots)
+    def op():
+        cards = next_spot()
+        player.hand.clear()
+        game.community_cards.clear()
+        for card in cards[:2]:
+            player.hand.add_card(card)
+        for card in cards[2:]:
+            game.community_cards.add_card(card)
+        game.evaluate_hand(player)
+    return op
+
+def setup_showdown8(rng):
+    game = Game([f"Player {i+1}" for i in range(8)], deck=IndexedDeck(), events=EventSink())
+    def op():
+        game.start_hand()
+        game.deal_cards()
+        for street in (1, 2, 3):
+            game.round = street
+            game.deal_community_cards()
+        game.determine_winner()
+    return op
+
+def setup_deck(rng):
+    deck = Deck()
+    def op():
+        deck.reset()
+        deck.shuffle()
+        for _ in range(21):
+            deck.deal()
+    return op
+
+def setup_indexed_deck(rng):
+    deck = IndexedDeck()
+    def op():
+        deck.reset()
+        deck.shuffle()
+        for _ in range(21):
+            deck.deal()
+    return op
+
+def setup_betting_round(rng):
+    game = Game([f"Player {i+1}" for i in range(8)], deck=IndexedDeck(), events=EventSink(), human_seat=None)
+    def op():
+        game.start_hand()
+        for player in game.players:
+            player.chips = 1000
+        game.deal_cards()
+        game.post_blinds()
+        game.current_player_index = (game.dealer_position + 3) % len(game.players)
+        game.betting_round(None, get_npc_action)
+    return op
+
+def setup_headless_hand(rng):
+    game = Game([f"Player {i+1}" for i in range(8)], deck=IndexedDeck(), events=EventSink(), human_seat=None)
+    def op():
+        for player in game.players:
+            player.chips = 1000
+        play_hand(game)
+    return op
+
+def setup_startup(rng):
+    # Cold start of a one-hand headless run in a fresh interpreter; the table file is built beforehand
+    evaluator.build_tables()
+    command = [sys.executable, os.path.join(ROOT, "poker.py"), "--headless", "1"]
+    def op():
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+    return op
+
+def setup_state_apply(rng):
+    game = Game([f"Player {i+1}" for i in range(8)], deck=IndexedDeck(), events=EventSink(), human_seat=None)
+    game.start_hand()
+    game.deal_cards()
+    game.post_blinds()
+    game.current_player_index = (game.dealer_position + 3) % len(game.players)
+    root = game.snapshot()
+    def op():
+        # One random playout from the root, forking a child state per action
+        state = root
+        while not state.terminal:
+            actions = state.valid_actions()
+            action = rng.choice([a for a in actions if a != "raise"] or actions)
+            state = state.apply(action)
+    return op
+
+BENCHMARKS = [
+    ("evaluator.evaluate7", setup_evaluate7, 10000),
+    ("game.evaluate_hand", setup_evaluate_hand, 1000),
+    ("showdown.8_players", setup_showdown8, 500),
+    ("deck.shuffle_deal", setup_deck, 1000),
+    ("indexed_deck.shuffle_deal", setup_indexed_deck, 1000),
+    ("game.betting_round", setup_betting_round, 200),
+    ("simulation.headless_hand", setup_headless_hand, 100),
+    ("state.apply_playout", setup_state_apply, 1000),
+    ("startup.headless_hand", setup_startup, 2),
+]
@@ -0,0 +1,98 @@
+"""
+Vectorized hand evaluation over NumPy arrays of card indices.
+
+Evaluates many hands at once with the same lookup tables as game.evaluator,
+viewed as NumPy arrays over the memory-mapped table file (game.eval_tables)
+without copying them.
+Requires NumPy; import this module only where NumPy is wanted.
+"""
+import numpy as np
+from game import evaluator
+
+class _Tables:
+    """NumPy views of the evaluator tables, mapped on first use."""
+    
+    def __init__(self):
+        evaluator.build_tables()
+        self.low = np.frombuffer(evaluator._rank_low, dtype=np.uint32)
+        self.high = np.frombuffer(evaluator._rank_high, dtype=np.uint32)
+        self.rank = np.frombuffer(evaluator._rank_table, dtype=np.uint32)
+        self.flush = np.frombuffer(evaluator._flush_table, dtype=np.uint32)
+        self.rank_key = np.asarray(evaluator.RANK_KEY, dtype=np.int64)
+        self.suit_count = np.asarray(evaluator.SUIT_COUNT, dtype=np.int64)
+        self.suit = np.asarray(evaluator.CARD_SUIT, dtype=np.int8)
+        self.rank_bit = np.asarray(evaluator.RANK_BIT, dtype=np.int64)
+
+_tables = None
+
+def get_tables():
+    """Return the shared NumPy lookup tables, building them if needed."""
+    global _tables
+    if _tables is None:
+        _tables = _Tables()
+    return _tables
+
+def evaluate_batch(cards):
+    """
+    Score many hands at once.
+    
+    Args:
+        cards: Integer array of shape (N, M), M <= 7, holding card indices (0-51)
+        
+    Returns:
+        numpy.ndarray: int64 array of N hand strengths (same values as evaluator.evaluate_indices)
+    """
+    t = get_tables()
+    cards = np.asarray(cards, dtype=np.intp)
+    
+    # Non-flush strength: sum of base-5 rank keys, looked up in two parts
+    keys = t.rank_key[cards].sum(axis=1)
+    low, high = keys % evaluator.LOW_BASE, keys // evaluator.LOW_BASE
+    strength = t.rank[t.high[high].astype(np.int64) + t.low[low]].astype(np.int64)
+    
+    # Flush check on the packed per-suit counters
+    suit_counts = t.suit_count[cards].sum(axis=1)
+    rows = np.nonzero((suit_counts + evaluator.FLUSH_CHECK_ADD) & evaluator.FLUSH_CHECK_MASK)[0]
+    if rows.size:
+        strength[rows] = _flush_strength(t, cards[rows])
+    return strength
+
+def evaluate_with_board(holes, board):
+    """
+    Score every player's hole cards with their table's board.
+
+    Same values as evaluate_batch on the seven cards, but the board's key
+    sums are looked up once per table and each player only adds their own
+    two cards.
+
+    Args:
+        holes: Integer array of shape (T, P, 2) of hole card indices
+        board: Integer array of shape (T, 5) of board card indices
+
+    Returns:
+        numpy.ndarray: int64 array (T, P) of hand strengths
+    """
+    t = get_tables()
+    holes = np.asarray(holes, dtype=np.intp)
+    board = np.asarray(board, dtype=np.intp)
+    first, second = holes[..., 0], holes[..., 1]
+
+    keys = t.rank_key[board].sum(axis=1)[:, None] + t.rank_key[first] + t.rank_key[second]
+    low, high = keys % evaluator.LOW_BASE, keys // evaluator.LOW_BASE
+    strength = t.rank[t.high[high].astype(np.int64) + t.low[low]].astype(np.int64)
+
+    suit_counts = t.suit_count[board].sum(axis=1)[:, None] + t.suit_count[first] + t.suit_count[second]
+    tables, players = np.nonzero((suit_counts + evaluator.FLUSH_CHECK_ADD) & evaluator.FLUSH_CHECK_MASK)
+    if tables.size:
+        cards = np.concatenate([holes[tables, players], board[tables]], axis=1)
+        strength[tables, players] = _flush_strength(t, cards)
+    return strength
+
+def _flush_strength(t, cards):
+    """Strengths of hands (rows of cards) known to hold a flush."""
+    suits = t.suit[cards]
+    per_suit = (suits[:, :, None] == np.arange(4)).sum(axis=1)
+    flush_suit = per_suit.argmax(axis=1)
+    # Rank bits are distinct within a suit, so summing them is the same as OR-ing
+    mask = np.where(suits == flush_suit[:, None], t.rank_bit[cards], 0).sum(axis=1)
+    return t.flush[mask]
@@ -0,0 +1,105 @@
+"""
+Suit-isomorphism canonicalization.
+
+Suits have no rank in hold'em, so hands that differ only by a relabeling of
+suits (A♠K♠ and A♥K♥, for example) are strategically identical. These
+helpers map cards to one canonical representative so equity results and
+tables only need to be computed once per class.
+"""
+import itertools
+
+NUM_RANKS = 13
+RANK_LABELS = "23456789TJQKA"
+# 13 pairs + 78 suited + 78 offsuit
+NUM_STARTING_HANDS = 169
+
+SUIT_PERMUTATIONS = list(itertools.permutations(range(4)))
+
+def _index(card):
+    return card if isinstance(card, int) else card.index
+
+def starting_hand_class(card_a, card_b):
+    """
+    Map two hole cards to one of the 169 starting hand classes.
+    
+    Classes are laid out like the usual 13x13 grid with aces first: pairs on
+    the diagonal, suited hands above it and offsuit hands below it.
+    
+    Args:
+        card_a, card_b: Cards or 0-51 indices
+        
+    Returns:
+        int: Class index 0-168
+    """
+    a, b = _index(card_a), _index(card_b)
+    hi, lo = max(a % NUM_RANKS, b % NUM_RANKS), min(a % NUM_RANKS, b % NUM_RANKS)
+    row, col = NUM_RANKS - 1 - hi, NUM_RANKS - 1 - lo
+    if a // NUM_RANKS == b // NUM_RANKS:
+        return row * NUM_RANKS + col  # suited: above the diagonal
+    return col * NUM_RANKS + row      # pairs and offsuit: on or below it
+
+def class_label(hand_class):
+    """Return the usual label for a starting hand class, e.g. 'AKs', 'T9o' or 'QQ'."""
+    row, col = divmod(hand_class, NUM_RANKS)
+    first, second = RANK_LABELS[NUM_RANKS - 1 - row], RANK_LABELS[NUM_RANKS - 1 - col]
+    if row == col:
+        return first + second
+    if row < col:
+        return first + second + "s"
+    return second + first + "o"
+
+def class_representative(hand_class):
+    """Return two card indices belonging to a starting hand class."""
+    row, col = divmod(hand_class, NUM_RANKS)
+    if row < col:
+        # Suited: both cards in the first suit
+        return (NUM_RANKS - 1 - row, NUM_RANKS - 1 - col)
+    # Pair or offsuit: the two cards in the first two suits
+    hi, lo = NUM_RANKS - 1 - col, NUM_RANKS - 1 - row
+    return (hi, NUM_RANKS + lo)
+
+def _relabel(indices, perm):
+    return tuple(sorted(perm[i // NUM_RANKS] * NUM_RANKS + i % NUM_RANKS for i in indices))
+
+def canonicalize(hole_cards, board=()):
+    """
+    Map hole cards and board to a canonical suit-isomorphic form.
+    
+    Two spots get the same canonical form exactly when one can be turned into
+    the other by renaming suits.
+    
+    Args:
+        hole_cards: Cards or 0-51 indices
+        board: Community cards or indices (optional)
+        
+    Returns:
+        tuple: (canonical hole indices, canonical board indices), each sorted
+    """
+    hole = [_index(c) for c in hole_cards]
+    board = [_index(c) for c in board]
+    return min((_relabel(hole, perm), _relabel(board, perm)) for perm in SUIT_PERMUTATIONS)
+
+def canonicalize_spot(holes, board=()):
+    """
+    Canonical form of a multi-player spot (several hole-card pairs plus a board).
+    
+    Both suit relabeling and player order are factored out.
+    
+    Args:
+        holes: One sequence of hole cards (Cards or indices) per player
+        board: Community cards or indices
+        
+    Returns:
+        tuple: (canonical holes, canonical board, order) where order[k] is the
+               original player whose cards are canonical holes[k]
+    """
+    holes = [[_index(c) for c in hole] for hole in holes]
+    board = [_index(c) for c in board]
+    best = None
+    for perm in SUIT_PERMUTATIONS:
+        relabeled = [_relabel(hole, perm) for hole in holes]
+        order = sorted(range(len(holes)), key=relabeled.__getitem__)
+        candidate = (tuple(relabeled[i] for i in order), _relabel(board, perm), order)
+        if best is None or candidate[:2] < best[:2]:
+            best = candidate
+    return best
@@ -0,0 +1,400 @@
+"""
+Equity calculation: how often each player's hole cards win from a given board.
+
+equity() samples random runouts of the unknown board cards (Monte Carlo)
+and stops as soon as every player's equity is known to within the requested
+margin. With NumPy installed, runouts are sampled and scored in large
+vectorized batches; otherwise a pure-Python backend with the same interface
+is used. exact_equity() instead walks every possible runout, which is
+cheaper and exact when only a few cards are unknown.
+"""
+import itertools
+import random
+from functools import lru_cache
+from math import comb
+from statistics import NormalDist
+from game import evaluator
+from game.canonical import canonicalize_spot
+from models.hand import Hand
+
+BOARD_SIZE = 5
+DEFAULT_BATCH_SIZE = 20000
+DEFAULT_MAX_SAMPLES = 1000000
+# Distinct (hole cards, board) spots whose exact results are kept
+EXACT_CACHE_SIZE = 4096
+
+class EquityResult:
+    """Win/tie/lose percentages for each player, in the order the hole cards were given."""
+    
+    def __init__(self, num_players):
+        self.samples = 0
+        self.wins = [0] * num_players
+        self.ties = [0] * num_players
+        # Pot share won across all runouts (a two-way tie counts 1/2)
+        self.shares = [0.0] * num_players
+        # True when every runout was counted rather than sampled
+        self.exact = False
+        
+    def add(self, wins, ties, shares, samples):
+        """Accumulate per-player counts from one batch of runouts."""
+        self.samples += samples
+        for i in range(len(self.wins)):
+            self.wins[i] += wins[i]
+            self.ties[i] += ties[i]
+            self.shares[i] += shares[i]
+            
+    def _percent(self, counts):
+        return [100.0 * c / self.samples if self.samples else 0.0 for c in counts]
+        
+    @property
+    def win(self):
+        return self._percent(self.wins)
+    
+    @property
+    def tie(self):
+        return self._percent(self.ties)
+    
+    @property
+    def lose(self):
+        return [100.0 - w - t for w, t in zip(self.win, self.tie)]
+    
+    @property
+    def equity(self):
+        return self._percent(self.shares)
+        
+    def margin(self, confidence):
+        """Largest confidence-interval half-width (in percent) over all players' equity."""
+        if self.samples == 0:
+            return 100.0
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        worst = 0.0
+        for share in self.shares:
+            p = share / self.samples
+            worst = max(worst, z * (p * (1 - p) / self.samples) ** 0.5)
+        return 100.0 * worst
+        
+    def __str__(self):
+        lines = []
+        for i, (w, t, l) in enumerate(zip(self.win, self.tie, self.lose)):
+            lines.append(f"Player {i+1}: win {w:.2f}%, tie {t:.2f}%, lose {l:.2f}%")
+        return "\n".join(lines)
+
+def to_indices(cards):
+    """Convert a Hand, or a list of Card objects or 0-51 indices, to a list of indices."""
+    if isinstance(cards, Hand):
+        cards = cards.cards
+    return [card if isinstance(card, int) else card.index for card in cards]
+
+def _validate(hole_indices, board_indices, min_players=2):
+    """Check card counts and duplicates; return the indices still in the deck."""
+    if len(hole_indices) < min_players:
+        raise ValueError(f"Equity needs at least {min_players} players")
+    if any(len(hole) != 2 for hole in hole_indices):
+        raise ValueError("Each player needs exactly two hole cards")
+    if len(board_indices) > BOARD_SIZE:
+        raise ValueError("The board has at most five cards")
+    used = [i for hole in hole_indices for i in hole] + board_indices
+    if len(set(used)) != len(used):
+        raise ValueError("The same card appears more than once")
+    used = set(used)
+    return [i for i in range(evaluator.NUM_CARDS) if i not in used]
+
+def score_showdown(strengths):
+    """
+    Split one runout between players.
+    
+    Args:
+        strengths: Hand strength of each player
+        
+    Returns:
+        tuple: (winner indices, whether the pot is split)
+    """
+    best = max(strengths)
+    winners = [i for i, s in enumerate(strengths) if s == best]
+    return winners, len(winners) > 1
+
+def _sample_python(hole_indices, board_indices, deck, count, rng):
+    """Score count random runouts in pure Python; returns (wins, ties, shares)."""
+    num_players = len(hole_indices)
+    wins = [0] * num_players
+    ties = [0] * num_players
+    shares = [0.0] * num_players
+    missing = BOARD_SIZE - len(board_indices)
+    evaluate = evaluator.evaluate_indices
+    
+    for _ in range(count):
+        board = board_indices + rng.sample(deck, missing)
+        winners, split = score_showdown([evaluate(hole + board) for hole in hole_indices])
+        for i in winners:
+            if split:
+                ties[i] += 1
+            else:
+                wins[i] += 1
+            shares[i] += 1.0 / len(winners)
+    return wins, ties, shares
+
+def _sample_numpy(hole_indices, board_indices, deck, count, rng):
+    """Score count random runouts as one NumPy batch; returns (wins, ties, shares)."""
+    import numpy as np
+    from game.batch_evaluator import evaluate_batch
+    
+    missing = BOARD_SIZE - len(board_indices)
+    deck = np.asarray(deck, dtype=np.intp)
+    
+    # Draw the missing board cards without replacement: the positions of the
+    # smallest random keys in each row form a uniform random subset
+    board = np.empty((count, BOARD_SIZE), dtype=np.intp)
+    board[:, :len(board_indices)] = board_indices
+    if missing:
+        keys = rng.random((count, len(deck)))
+        picks = np.argpartition(keys, missing - 1, axis=1)[:, :missing]
+        board[:, len(board_indices):] = deck[picks]
+        
+    # Score every player's 7 cards: (players x samples) strengths
+    strengths = np.empty((len(hole_indices), count), dtype=np.int64)
+    seven = np.empty((count, 7), dtype=np.intp)
+    seven[:, 2:] = board
+    for p, hole in enumerate(hole_indices):
+        seven[:, :2] = hole
+        strengths[p] = evaluate_batch(seven)
+        
+    best = strengths.max(axis=0)
+    is_best = strengths == best
+    num_best = is_best.sum(axis=0)
+    split = num_best > 1
+    wins = (is_best & ~split).sum(axis=1)
+    ties = (is_best & split).sum(axis=1)
+    shares = (is_best / num_best).sum(axis=1)
+    return wins.tolist(), ties.tolist(), shares.tolist()
+
+def _sample_python_vs_random(hole, board_indices, deck, num_opponents, count, rng):
+    """Score count runouts against random opponent hands in pure Python; returns ([wins], [ties], [shares])."""
+    wins = ties = 0
+    shares = 0.0
+    missing = BOARD_SIZE - len(board_indices)
+    evaluate = evaluator.evaluate_indices
+    
+    for _ in range(count):
+        drawn = rng.sample(deck, missing + 2 * num_opponents)
+        board = board_indices + drawn[:missing]
+        hero = evaluate(hole + board)
+        best_opponent = max(evaluate(drawn[j:j + 2] + board) for j in range(missing, len(drawn), 2))
+        if hero > best_opponent:
+            wins += 1
+            shares += 1.0
+        elif hero == best_opponent:
+            tied = 1 + sum(1 for j in range(missing, len(drawn), 2)
+                           if evaluate(drawn[j:j + 2] + board) == hero)
+            ties += 1
+            shares += 1.0 / tied
+    return [wins], [ties], [shares]
+
+def _sample_numpy_vs_random(hole, board_indices, deck, num_opponents, count, rng):
+    """Score count runouts against random opponent hands as one NumPy batch."""
+    import numpy as np
+    from game.batch_evaluator import evaluate_batch
+    
+    missing = BOARD_SIZE - len(board_indices)
+    deck = np.asarray(deck, dtype=np.intp)
+    draw = missing + 2 * num_opponents
+    keys = rng.random((count, len(deck)))
+    drawn = deck[np.argpartition(keys, draw - 1, axis=1)[:, :draw]]
+    
+    seven = np.empty((count, 7), dtype=np.intp)
+    seven[:, 2:2 + len(board_indices)] = board_indices
+    seven[:, 2 + len(board_indices):] = drawn[:, :missing]
+    seven[:, :2] = hole
+    hero = evaluate_batch(seven)
+    
+    # Best opponent strength and how many opponents share it
+    best = np.zeros(count, dtype=np.int64)
+    num_best = np.zeros(count, dtype=np.int64)
+    for j in range(num_opponents):
+        seven[:, :2] = drawn[:, missing + 2 * j:missing + 2 * j + 2]
+        strength = evaluate_batch(seven)
+        num_best = np.where(strength > best, 1, num_best + (strength == best))
+        best = np.maximum(best, strength)
+        
+    won = hero > best
+    tied = hero == best
+    shares = won.sum() + (tied / (num_best + 1)).sum()
+    return [int(won.sum())], [int(tied.sum())], [float(shares)]
+
+def _numpy_available():
+    try:
+        import numpy
+    except ImportError:
+        return False
+    return True
+
+@lru_cache(maxsize=EXACT_CACHE_SIZE)
+def _enumerate_spot(holes, board):
+    """Count wins, ties and pot shares over every runout of a canonical spot."""
+    num_players = len(holes)
+    wins = [0] * num_players
+    ties = [0] * num_players
+    shares = [0.0] * num_players
+    used = set(board).union(*holes)
+    deck = [i for i in range(evaluator.NUM_CARDS) if i not in used]
+    
+    # Score the known cards once per player; each runout only adds its own cards
+    board_state = evaluator.partial_state(board)
+    player_states = [evaluator.combine_states(board_state, evaluator.partial_state(hole)) for hole in holes]
+    evaluate_state = evaluator.evaluate_state
+    
+    runouts = 0
+    for runout in itertools.combinations(deck, BOARD_SIZE - len(board)):
+        runouts += 1
+        key, suits, masks = evaluator.partial_state(runout)
+        strengths = []
+        for p_key, p_suits, p_masks in player_states:
+            strengths.append(evaluate_state(
+                p_key + key, p_suits + suits,
+                (p_masks[0] | masks[0], p_masks[1] | masks[1], p_masks[2] | masks[2], p_masks[3] | masks[3])))
+        winners, split = score_showdown(strengths)
+        for i in winners:
+            if split:
+                ties[i] += 1
+            else:
+                wins[i] += 1
+            shares[i] += 1.0 / len(winners)
+    return tuple(wins), tuple(ties), tuple(shares), runouts
+
+def exact_equity(hole_cards, board=()):
+    """
+    Compute each player's equity exactly by enumerating every runout of the board.
+    
+    Only practical when few cards are unknown (turn to river, a flop heads-up).
+    Results are cached per canonical (hole cards, board) spot, so asking about
+    the same spot again, in any player or card order or with the suits
+    renamed, is free.
+    
+    Args:
+        hole_cards: One entry per player: a Hand or two Cards (or 0-51 indices)
+        board: Known community cards (0-5), as a Hand or list of Cards
+        
+    Returns:
+        EquityResult: Exact win/tie/lose percentages per player
+    """
+    hole_indices = [to_indices(hole) for hole in hole_cards]
+    board_indices = to_indices(board)
+    _validate(hole_indices, board_indices)
+    holes, board_key, order = canonicalize_spot(hole_indices, board_indices)
+    wins, ties, shares, runouts = _enumerate_spot(holes, board_key)
+    
+    # Put the counts back in the caller's player order
+    result = EquityResult(len(hole_indices))
+    for canonical, player in enumerate(order):
+        result.wins[player] = wins[canonical]
+        result.ties[player] = ties[canonical]
+        result.shares[player] = shares[canonical]
+    result.samples = runouts
+    result.exact = True
+    return result
+
+def count_runouts(num_players, board_size):
+    """Number of distinct boards that complete a spot."""
+    return comb(evaluator.NUM_CARDS - 2 * num_players - board_size, BOARD_SIZE - board_size)
+
+def equity(hole_cards, board=(), margin=0.1, confidence=0.95, max_samples=DEFAULT_MAX_SAMPLES,
+           batch_size=DEFAULT_BATCH_SIZE, backend="auto", seed=None):
+    """
+    Estimate each player's chance to win by sampling runouts of the board.
+    
+    Spots with fewer possible runouts than batch_size are handed to exact_equity().
+    
+    Args:
+        hole_cards: One entry per player: a Hand or two Cards (or 0-51 indices)
+        board: Known community cards (0-5), as a Hand or list of Cards
+        margin: Stop once every player's equity is within this many percentage points
+        confidence: Confidence level for the margin (e.g. 0.95)
+        max_samples: Upper limit on runouts regardless of margin
+        batch_size: Runouts scored between margin checks
+        backend: "numpy", "python", or "auto" (NumPy if installed)
+        seed: Optional seed for reproducible sampling
+        
+    Returns:
+        EquityResult: Win/tie/lose percentages per player
+    """
+    hole_indices = [to_indices(hole) for hole in hole_cards]
+    board_indices = to_indices(board)
+    deck = _validate(hole_indices, board_indices)
+    
+    # When there are fewer runouts than one sampling batch, counting them all is cheaper and exact
+    if count_runouts(len(hole_indices), len(board_indices)) <= batch_size:
+        return exact_equity(hole_indices, board_indices)
+    
+    backend, rng = _select_backend(backend, seed)
+    sample = _sample_numpy if backend == "numpy" else _sample_python
+    result = EquityResult(len(hole_indices))
+    
+    def sample_batch(count):
+        return sample(hole_indices, board_indices, deck, count, rng)
+    return _run_batches(result, sample_batch, margin, confidence, max_samples, batch_size)
+
+def equity_vs_random(hole_cards, num_opponents, board=(), margin=0.1, confidence=0.95,
+                     max_samples=DEFAULT_MAX_SAMPLES, batch_size=DEFAULT_BATCH_SIZE,
+                     backend="auto", seed=None):
+    """
+    Estimate one player's chance to win against opponents holding random cards.
+    
+    Each sample deals every opponent two random cards from the rest of the deck
+    and completes the board. Arguments are as for equity().
+    
+    Args:
+        hole_cards: The player's two hole cards (Hand, Cards or indices)
+        num_opponents: How many opponents with unknown cards
+        board: Known community cards (0-5)
+        
+    Returns:
+        EquityResult: Win/tie/lose percentages for the one player
+    """
+    hole = to_indices(hole_cards)
+    board_indices = to_indices(board)
+    deck = _validate([hole], board_indices, min_players=1)
+    if num_opponents < 1 or 2 * num_opponents + BOARD_SIZE - len(board_indices) > len(deck):
+        raise ValueError(f"Cannot deal to {num_opponents} opponents")
+    
+    backend, rng = _select_backend(backend, seed)
+    sample = _sample_numpy_vs_random if backend == "numpy" else _sample_python_vs_random
+    result = EquityResult(1)
+    
+    def sample_batch(count):
+        return sample(hole, board_indices, deck, num_opponents, count, rng)
+    return _run_batches(result, sample_batch, margin, confidence, max_samples, batch_size)
+
+def _select_backend(backend, seed):
+    """Resolve the backend name and create its random generator."""
+    if backend == "auto":
+        backend = "numpy" if _numpy_available() else "python"
+    if backend == "numpy":
+        import numpy as np
+        return backend, np.random.default_rng(seed)
+    if backend == "python":
+        return backend, random.Random(seed)
+    raise ValueError(f"Unknown equity backend: {backend}")
+
+def _run_batches(result, sample_batch, margin, confidence, max_samples, batch_size):
+    """Add sampled batches to result until the margin is met or max_samples is reached."""
+    while result.samples < max_samples:
+        count = min(batch_size, max_samples - result.samples)
+        wins, ties, shares = sample_batch(count)
+        result.add(wins, ties, shares, count)
+        if result.margin(confidence) <= margin:
+            break
+    return result
+
+def game_equity(game, **options):
+    """
+    Equity of every player still in the hand, using their hole cards and the current board.
+    
+    Args:
+        game: A Game in progress
+        **options: Passed through to equity()
+        
+    Returns:
+        dict: Player -> equity percentage
+    """
+    players = [p for p in game.players if not p.is_folded]
+    result = equity([p.hand for p in players], game.community_cards, **options)
+    return dict(zip(players, result.equity))
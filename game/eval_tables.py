@@ -0,0 +1,250 @@
+"""
+Shared, memory-mapped evaluator lookup tables.
+
+The rank-multiset table behind game.evaluator is stored densely: a rank key
+(one base-5 digit per rank) is split into its low part (ranks 2-8) and high
+part (ranks 9-A), each part is mapped to a dense row or column by a small
+index table, and the strength sits at row + column of a flat uint32 table.
+That is about 20 MB, so it is built once, written to a binary file and
+opened with mmap: every process evaluating hands (tournament workers, table
+hosts) maps the same file and shares the same physical pages, and opening
+it costs milliseconds instead of rebuilding the tables.
+
+The file lives in the user's cache directory ($XDG_CACHE_HOME or ~/.cache,
+under poker/), never in the installed package, so read-only and
+site-packages installs share it too. POKER_EVAL_TABLES overrides the path,
+and "python -m game.eval_tables" builds it ahead of time (e.g. in an image
+build step). If the file can be neither read nor written, each process
+keeps private tables and a warning says so.
+
+A file is only used if it was built by the current code: the header holds a
+fingerprint of the build inputs (the bytecode of the scoring functions and
+builder, plus the key layout constants), so changing how strengths are
+scored makes the old file stale and it is rebuilt rather than served.
+
+File layout (little-endian):
+    header: magic b"EVTB", version (uint16), reserved (uint16),
+            low index entries (uint32), high index entries (uint32),
+            rank table entries (uint32), flush table entries (uint32),
+            build fingerprint (uint32), CRC-32 of the body (uint32)
+    body:   uint32 arrays, one after the other: low index (key % LOW_BASE ->
+            column), high index (key // LOW_BASE -> row offset), rank table
+            (row offset + column -> strength), flush table (13-bit rank
+            mask -> strength)
+"""
+import argparse
+import itertools
+import mmap
+import os
+import struct
+import sys
+import warnings
+import zlib
+from array import array
+from game import evaluator
+from models import strength
+
+MAGIC = b"EVTB"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIIIIII")
+
+# Rank keys split into ranks 2-8 (key % LOW_BASE) and ranks 9-A (key // LOW_BASE)
+LOW_BASE = evaluator.LOW_BASE
+HIGH_BASE = 5 ** (evaluator.NUM_RANKS - 7)
+
+def _code_digest(code):
+    # Bytecode, names and constants only: moving a function or renaming its file does not matter
+    parts = [code.co_code, repr(code.co_names).encode()]
+    for const in code.co_consts:
+        parts.append(_code_digest(const) if hasattr(const, "co_code") else repr(const).encode())
+    return b"".join(parts)
+
+def fingerprint():
+    """
+    Fingerprint of everything the tables are built from.
+
+    Covers the evaluator's scoring functions, EvalTables.build and the key
+    layout, so any change to them (or a new Python bytecode format) gives a
+    different value.
+    """
+    functions = [strength.straight_high, strength.make_strength, strength.score_flush,
+                 strength.score_counts, EvalTables.build.__func__]
+    parts = [_code_digest(f.__code__) for f in functions]
+    parts.append(repr((strength.NUM_RANKS, strength.RANK_SHIFT, LOW_BASE, HIGH_BASE)).encode())
+    return zlib.crc32(b"\0".join(parts))
+
+def default_table_path():
+    """Where the table file is kept: $POKER_EVAL_TABLES, else a file in the user's cache directory."""
+    override = os.environ.get("POKER_EVAL_TABLES")
+    if override:
+        return override
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "poker", f"eval_tables-v{VERSION}.bin")
+
+TABLE_PATH = default_table_path()
+
+class EvalTables:
+    """The evaluator lookup tables, as flat uint32 sequences (memoryviews when mapped from a file)."""
+
+    def __init__(self, low, high, rank, flush, mapping=None):
+        self.low = low
+        self.high = high
+        self.rank = rank
+        self.flush = flush
+        # The open mmap backing the memoryviews, if any
+        self.mapping = mapping
+
+    def lookup(self, key):
+        """Strength of the rank multiset with the given rank key (no flush)."""
+        return self.rank[self.high[key // LOW_BASE] + self.low[key % LOW_BASE]]
+
+    def _sections(self):
+        return (self.low, self.high, self.rank, self.flush)
+
+    def save(self, path=TABLE_PATH):
+        """Write the tables to path, atomically, so concurrent readers never see half a file."""
+        import tempfile
+        body = []
+        for section in self._sections():
+            cells = array("I", section)
+            if sys.byteorder != "little":
+                cells.byteswap()
+            body.append(cells.tobytes())
+        body = b"".join(body)
+        header = HEADER.pack(MAGIC, VERSION, 0, *(len(s) for s in self._sections()), fingerprint(),
+                             zlib.crc32(body))
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".eval_tables.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(body)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path=TABLE_PATH, verify=True):
+        """
+        Map a table file into memory.
+
+        Args:
+            path: File written by save()
+            verify: Check the body against the stored CRC-32 (reads every page once)
+
+        Raises:
+            ValueError: If the file is not a valid, current-version table file, or
+                was built by different scoring code (see fingerprint())
+        """
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < HEADER.size:
+            mapping.close()
+            raise ValueError(f"{path} is truncated")
+        magic, version, _, *sizes, built_by, checksum = HEADER.unpack_from(mapping)
+        if magic != MAGIC or version != VERSION:
+            mapping.close()
+            raise ValueError(f"{path} is not a version {VERSION} evaluator table file")
+        if built_by != fingerprint():
+            mapping.close()
+            raise ValueError(f"{path} was built by different evaluator code")
+        if len(mapping) != HEADER.size + 4 * sum(sizes):
+            mapping.close()
+            raise ValueError(f"{path} is truncated")
+        view = memoryview(mapping)[HEADER.size:]
+        if verify and zlib.crc32(view) != checksum:
+            view.release()
+            mapping.close()
+            raise ValueError(f"{path} failed its checksum")
+
+        sections = []
+        offset = 0
+        for size in sizes:
+            chunk = view[offset:offset + 4 * size]
+            if sys.byteorder == "little":
+                sections.append(chunk.cast("I"))
+            else:
+                # Big-endian hosts get a private, byte-swapped copy
+                cells = array("I", bytes(chunk))
+                cells.byteswap()
+                sections.append(cells)
+            offset += 4 * size
+        return cls(*sections, mapping=mapping)
+
+    @classmethod
+    def build(cls):
+        """Score every rank multiset and flush mask from scratch (takes about a second)."""
+        strengths = {}
+        # Every multiset of 1-7 ranks with at most four cards of a rank
+        for n in range(1, 8):
+            for ranks in itertools.combinations_with_replacement(range(evaluator.NUM_RANKS), n):
+                counts = [0] * evaluator.NUM_RANKS
+                for r in ranks:
+                    counts[r] += 1
+                if max(counts) > 4:
+                    continue
+                strengths[sum(5 ** r for r in ranks)] = strength.score_counts(counts)
+
+        columns = sorted({key % LOW_BASE for key in strengths})
+        rows = sorted({key // LOW_BASE for key in strengths})
+        low = array("I", bytes(4 * LOW_BASE))
+        high = array("I", bytes(4 * HIGH_BASE))
+        for column, part in enumerate(columns):
+            low[part] = column
+        for row, part in enumerate(rows):
+            high[part] = row * len(columns)
+        tables = cls(low, high, array("I", bytes(4 * len(rows) * len(columns))), None)
+        for key, value in strengths.items():
+            tables.rank[high[key // LOW_BASE] + low[key % LOW_BASE]] = value
+
+        # Flush table is indexed directly by the flush suit's 13-bit rank mask
+        tables.flush = array("I", (
+            strength.score_flush(mask) if bin(mask).count("1") >= 5 else 0
+            for mask in range(1 << evaluator.NUM_RANKS)
+        ))
+        return tables
+
+_tables = None
+
+def get_tables(path=TABLE_PATH):
+    """
+    Return the shared tables, mapping the table file on first use.
+
+    A missing, stale or corrupt file is rebuilt and rewritten; if it cannot be
+    written the tables are kept in this process only, with a RuntimeWarning,
+    since other processes then cannot share them.
+    """
+    global _tables
+    if _tables is None:
+        _tables = load_or_build(path)
+    return _tables
+
+def load_or_build(path=TABLE_PATH):
+    """Map the table file at path, (re)building and saving it first if it is missing or unusable."""
+    try:
+        return EvalTables.load(path)
+    except (OSError, ValueError):
+        pass
+    tables = EvalTables.build()
+    try:
+        tables.save(path)
+        return EvalTables.load(path, verify=False)
+    except OSError as error:
+        warnings.warn(f"Cannot write evaluator tables to {path} ({error}); using private in-process "
+                      "tables. Set POKER_EVAL_TABLES to a writable path to share them.",
+                      RuntimeWarning, stacklevel=2)
+        return tables
+
+def main(argv=None):
+    """Rebuild the evaluator table file."""
+    parser = argparse.ArgumentParser(description="Build the evaluator lookup table file")
+    parser.add_argument("--output", default=TABLE_PATH, help="where to write the tables")
+    args = parser.parse_args(argv)
+    EvalTables.build().save(args.output)
+    print(f"Saved {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Table-driven poker hand evaluator.
+
+Scores a set of up to seven cards with a handful of table lookups instead of
+building every 5-card combination. Each card is identified by its Card.index
+(0-51, the same order a fresh Deck is built in) and hand strength is a
+single integer: the hand rank (0-9, same scale as Game.evaluate_hand) in the
+high bits, followed by up to five kicker ranks. A bigger number is a better hand.
+
+The encoding and the scoring rules live in models.strength, which models.hand
+shares; this module adds the lookup tables and re-exports those names.
+"""
+from models.card import Card
+from models.strength import (HIGH_CARD, PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT, FLUSH, FULL_HOUSE,
+                             FOUR_OF_A_KIND, STRAIGHT_FLUSH, ROYAL_FLUSH, HAND_NAMES, RANK_SHIFT, NUM_RANKS,
+                             FLUSH_CHECK_ADD, FLUSH_CHECK_MASK, FLUSH_SUIT, straight_high, hand_rank, kickers)
+
+NUM_CARDS = 52
+
+# Per-index card attributes, taken from the shared Card table
+CARD_SUIT = [card.suit_index for card in Card.DECK]
+RANK_BIT = [card.bit for card in Card.DECK]
+# Rank key: a base-5 digit per rank, so summing keys gives a unique rank multiset
+RANK_KEY = [5 ** (card.rank - 2) for card in Card.DECK]
+# Suit counter: a 4-bit field per suit, so summing counts cards per suit
+SUIT_COUNT = [1 << (4 * card.suit_index) for card in Card.DECK]
+
+# Rank keys are looked up in two parts: ranks 2-8 (key % LOW_BASE) and 9-A
+LOW_BASE = 5 ** 7
+
+# Lookup tables, mapped by build_tables() on first use: the strength of rank key k
+# is _rank_table[_rank_high[k // LOW_BASE] + _rank_low[k % LOW_BASE]]
+_rank_table = None
+_rank_low = None
+_rank_high = None
+_flush_table = None
+
+
+def build_tables():
+    """Map the rank-multiset and flush lookup tables (see game.eval_tables); runs once."""
+    global _rank_table, _rank_low, _rank_high, _flush_table
+    if _rank_table is not None:
+        return
+    from game.eval_tables import get_tables
+    tables = get_tables()
+    _rank_low, _rank_high, _flush_table = tables.low, tables.high, tables.flush
+    _rank_table = tables.rank
+
+
+def evaluate_indices(indices):
+    """
+    Score the best poker hand that can be made from up to seven card indices.
+
+    Args:
+        indices: Iterable of card indices (0-51)
+
+    Returns:
+        int: Hand strength; compare with < and >, extract the rank with hand_rank()
+    """
+    if _rank_table is None:
+        build_tables()
+    key = 0
+    suits = 0
+    for i in indices:
+        key += RANK_KEY[i]
+        suits += SUIT_COUNT[i]
+
+    flush = (suits + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK
+    if flush:
+        # At most one suit can hold five of seven cards
+        suit = FLUSH_SUIT[flush]
+        mask = 0
+        for i in indices:
+            if CARD_SUIT[i] == suit:
+                mask |= RANK_BIT[i]
+        return _flush_table[mask]
+    return _rank_table[_rank_high[key // LOW_BASE] + _rank_low[key % LOW_BASE]]
+
+
+def evaluate7(a, b, c, d, e, f, g):
+    """Unrolled evaluate_indices() for exactly seven card indices."""
+    if _rank_table is None:
+        build_tables()
+    K = RANK_KEY
+    S = SUIT_COUNT
+    flush = (S[a] + S[b] + S[c] + S[d] + S[e] + S[f] + S[g] + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK
+    if flush:
+        return evaluate_indices((a, b, c, d, e, f, g))
+    key = K[a] + K[b] + K[c] + K[d] + K[e] + K[f] + K[g]
+    return _rank_table[_rank_high[key // LOW_BASE] + _rank_low[key % LOW_BASE]]
+
+
+def partial_state(indices):
+    """
+    Summarize a set of cards so more cards can be added to it later.
+    
+    Rank keys, suit counters and rank masks are all additive, so the state of a
+    shared board can be computed once and combined with each player's cards.
+    
+    Args:
+        indices: Iterable of card indices (0-51)
+        
+    Returns:
+        tuple: (rank key, packed suit counts, tuple of four per-suit rank masks)
+    """
+    key = 0
+    suits = 0
+    masks = [0, 0, 0, 0]
+    for i in indices:
+        key += RANK_KEY[i]
+        suits += SUIT_COUNT[i]
+        masks[CARD_SUIT[i]] |= RANK_BIT[i]
+    return key, suits, tuple(masks)
+
+
+def combine_states(a, b):
+    """Combine the partial states of two disjoint sets of cards."""
+    masks_a, masks_b = a[2], b[2]
+    return (a[0] + b[0], a[1] + b[1],
+            (masks_a[0] | masks_b[0], masks_a[1] | masks_b[1],
+             masks_a[2] | masks_b[2], masks_a[3] | masks_b[3]))
+
+
+def evaluate_state(key, suits, masks):
+    """Score a partial state (see partial_state()) of up to seven cards."""
+    if _rank_table is None:
+        build_tables()
+    flush = (suits + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK
+    if flush:
+        return _flush_table[masks[FLUSH_SUIT[flush]]]
+    return _rank_table[_rank_high[key // LOW_BASE] + _rank_low[key % LOW_BASE]]
+
+
+def evaluate_cards(cards):
+    """Score the best hand that can be made from a list of Card objects."""
+    return evaluate_indices([card.index for card in cards])
+
+
+def best_five(cards, strength):
+    """
+    Pick the five cards that make up a hand of the given strength.
+
+    Args:
+        cards: List of Card objects the strength was computed from
+        strength: Value returned by evaluate_cards() for those cards
+
+    Returns:
+        list: The five Card objects forming the best hand
+    """
+    rank = hand_rank(strength)
+    top = kickers(strength)
+
+    if rank in (STRAIGHT, STRAIGHT_FLUSH, ROYAL_FLUSH):
+        high = top[0]
+        wanted = [high - i for i in range(5)] if high > 5 else [5, 4, 3, 2, 14]
+    else:
+        # How many cards of each kicker value the hand uses
+        shapes = {
+            HIGH_CARD: [1, 1, 1, 1, 1], PAIR: [2, 1, 1, 1], TWO_PAIR: [2, 2, 1],
+            THREE_OF_A_KIND: [3, 1, 1], FLUSH: [1, 1, 1, 1, 1],
+            FULL_HOUSE: [3, 2], FOUR_OF_A_KIND: [4, 1],
+        }
+        wanted = []
+        for value, count in zip(top, shapes[rank]):
+            wanted.extend([value] * count)
+
+    pool = cards
+    if rank in (FLUSH, STRAIGHT_FLUSH, ROYAL_FLUSH):
+        # Only cards of the flush suit can take part
+        suit_counts = [0, 0, 0, 0]
+        for card in cards:
+            suit_counts[card.suit_index] += 1
+        flush_suit = suit_counts.index(max(suit_counts))
+        pool = [card for card in cards if card.suit_index == flush_suit]
+
+    chosen = []
+    remaining = list(pool)
+    for value in wanted:
+        card = next(c for c in remaining if c.rank == value)
+        remaining.remove(card)
+        chosen.append(card)
+    return chosen
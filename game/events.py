@@ -0,0 +1,29 @@
+"""
+Event sinks for game narration.
+
+Game and the hand loop report what happens at the table (actions, pots,
+winners) through an event sink instead of printing directly, so the same
+code can drive the terminal UI or run headless.
+"""
+
+class EventSink:
+    """Receives narration messages. The base sink discards everything."""
+    
+    def emit(self, message):
+        """Handle one line of narration."""
+        pass
+
+class PrintSink(EventSink):
+    """Prints every message to the terminal (the interactive default)."""
+    
+    def emit(self, message):
+        print(message)
+
+class ListSink(EventSink):
+    """Collects messages in a list, e.g. for tests or later inspection."""
+    
+    def __init__(self):
+        self.messages = []
+        
+    def emit(self, message):
+        self.messages.append(message)
@@ -0,0 +1,267 @@
+"""
+Compact binary hand histories.
+
+Every hand a Game plays can be appended to a binary log: seats and starting
+stacks, hole cards, board, every action with its amount and the pot after
+it, and the winners. Cards are single bytes (Card.index) and actions are
+fixed-width records, so a typical 8-handed hand takes a few hundred bytes.
+HandHistoryReader memory-maps the file and decodes one hand at a time, so
+even very large logs can be scanned without loading them.
+
+The hand id in a record is the game's own hand number, which restarts at 1
+in every run, so a log appended to by several runs repeats ids. Every
+decoded hand also carries the byte offset of its record, which is unique
+within the file: hand_at(offset) reads that one record back.
+
+File layout (little-endian):
+    file header:  magic b"PKHH", version (uint16)
+    records:      type (uint8), payload length (uint32), payload
+    PLAYER (1):   player id (uint16), UTF-8 name       -- written once per name
+    HAND (2):     hand id (uint64), seats, dealer seat, actions (uint16),
+                  board cards, winners (uint8 each), then
+                  seats x   (player id uint16, stack uint32, 2 card bytes)
+                  board x   card byte
+                  actions x (seat, street, action code, 0, chips uint32, pot after uint32)
+                  winners x (seat uint8, chips won uint32)
+"""
+import mmap
+import os
+import struct
+
+MAGIC = b"PKHH"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+RECORD_HEADER = struct.Struct("<BI")
+PLAYER_RECORD = 1
+HAND_RECORD = 2
+
+HAND_HEADER = struct.Struct("<QBBHBB")
+SEAT = struct.Struct("<HIBB")
+ACTION = struct.Struct("<BBBBII")
+WINNER = struct.Struct("<BI")
+
+# Card byte for a card that was never dealt (e.g. a seat that joined late)
+NO_CARD = 255
+
+# Action codes; blinds are logged as actions so the pot can be followed from the start
+ACTIONS = ["fold", "check", "call", "raise", "small_blind", "big_blind"]
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+class HandRecord:
+    """One decoded hand."""
+    
+    def __init__(self, hand_id, dealer, seats, board, actions, winners, offset=None):
+        # The game's hand number (restarts at 1 in every run appended to a log)
+        self.hand_id = hand_id
+        # Byte offset of the record in its file, unique within the file
+        self.offset = offset
+        # Seat index of the dealer button
+        self.dealer = dealer
+        # (player name, starting stack, [hole card indices]) per seat
+        self.seats = seats
+        # Board card indices in the order they were dealt
+        self.board = board
+        # (seat, street, action, chips put in, pot after) per action
+        self.actions = actions
+        # (seat, chips won) per winner
+        self.winners = winners
+        
+    @property
+    def pot(self):
+        """Total pot awarded at the end of the hand."""
+        return sum(amount for _, amount in self.winners)
+
+class HandHistoryWriter:
+    """
+    Appends hands to a binary log. Attach it to a Game as its recorder.
+    
+    Game calls begin_hand() from start_hand(), action() for blinds and every
+    successful execute_action(), and end_hand() from award_pot().
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "ab")
+        self.player_ids = {}
+        if new_file:
+            self.file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        else:
+            # Keep ids consistent with names already in the file
+            for player_id, name in _read_player_table(path):
+                self.player_ids[name] = player_id
+        self._seats = None
+        self._actions = []
+        self.hands_written = 0
+        
+    def _player_id(self, name):
+        player_id = self.player_ids.get(name)
+        if player_id is None:
+            player_id = len(self.player_ids)
+            self.player_ids[name] = player_id
+            payload = struct.pack("<H", player_id) + name.encode("utf-8")
+            self.file.write(RECORD_HEADER.pack(PLAYER_RECORD, len(payload)) + payload)
+        return player_id
+        
+    def begin_hand(self, game):
+        """Note seats and starting stacks before any chips go in."""
+        self._seats = [(self._player_id(p.name), p.chips) for p in game.players]
+        self._actions = []
+        
+    def action(self, game, seat, action, chips):
+        """Log one action (or blind) after it was applied to the game."""
+        if self._seats is None:
+            return
+        self._actions.append(ACTION.pack(seat, min(game.round, 3), ACTION_CODES[action], 0, chips, game.pot))
+        
+    def end_hand(self, game, winners, amounts):
+        """Write the finished hand."""
+        if self._seats is None:
+            return
+        seats = []
+        for (player_id, stack), player in zip(self._seats, game.players):
+            cards = [card.index for card in player.hand.cards[:2]]
+            cards += [NO_CARD] * (2 - len(cards))
+            seats.append(SEAT.pack(player_id, stack, cards[0], cards[1]))
+        board = bytes(card.index for card in game.community_cards.cards)
+        seat_of = {id(p): i for i, p in enumerate(game.players)}
+        winner_records = [WINNER.pack(seat_of[id(p)], amount) for p, amount in zip(winners, amounts)]
+        
+        payload = b"".join([
+            HAND_HEADER.pack(game.hand_number, len(seats), game.dealer_position, len(self._actions),
+                             len(board), len(winner_records)),
+            *seats, board, *self._actions, *winner_records,
+        ])
+        self.file.write(RECORD_HEADER.pack(HAND_RECORD, len(payload)) + payload)
+        self.hands_written += 1
+        self._seats = None
+        self._actions = []
+        
+    def flush(self):
+        self.file.flush()
+        
+    def close(self):
+        self.file.close()
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def _iter_records(data):
+    """Yield (type, payload offset, payload length) for every record in a mapped file.
+
+    The record itself starts RECORD_HEADER.size bytes before its payload.
+    """
+    magic, version = FILE_HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a version {VERSION} hand history file")
+    offset = FILE_HEADER.size
+    end = len(data)
+    while offset + RECORD_HEADER.size <= end:
+        record_type, length = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        if offset + length > end:
+            break  # partially written last record
+        yield record_type, offset, length
+        offset += length
+
+def _read_player_table(path):
+    with HandHistoryReader(path) as reader:
+        reader.count_hands()
+        return [(player_id, name) for name, player_id in reader.player_ids.items()]
+
+def decode_hand(data, offset, names):
+    """Decode one HAND payload starting at offset."""
+    hand_id, num_seats, dealer, num_actions, num_board, num_winners = HAND_HEADER.unpack_from(data, offset)
+    offset += HAND_HEADER.size
+    seats = []
+    for _ in range(num_seats):
+        player_id, stack, a, b = SEAT.unpack_from(data, offset)
+        offset += SEAT.size
+        seats.append((names.get(player_id, str(player_id)), stack, [c for c in (a, b) if c != NO_CARD]))
+    board = list(data[offset:offset + num_board])
+    offset += num_board
+    actions = []
+    for _ in range(num_actions):
+        seat, street, code, _, chips, pot = ACTION.unpack_from(data, offset)
+        offset += ACTION.size
+        actions.append((seat, street, ACTIONS[code], chips, pot))
+    winners = []
+    for _ in range(num_winners):
+        winners.append(WINNER.unpack_from(data, offset))
+        offset += WINNER.size
+    return HandRecord(hand_id, dealer, seats, board, actions, winners)
+
+class HandHistoryReader:
+    """
+    Iterates over the hands in a log through a read-only memory map.
+    
+    Only the hand being decoded is turned into Python objects; the rest of the
+    file stays in the page cache.
+    """
+    
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.player_ids = {}
+        self._names = {}
+        
+    def __iter__(self):
+        data = self.data
+        for record_type, offset, length in _iter_records(data):
+            if record_type == PLAYER_RECORD:
+                self._add_player(offset, length)
+            elif record_type == HAND_RECORD:
+                record = decode_hand(data, offset, self._names)
+                record.offset = offset - RECORD_HEADER.size
+                yield record
+                
+    def _add_player(self, offset, length):
+        player_id = struct.unpack_from("<H", self.data, offset)[0]
+        name = bytes(self.data[offset + 2:offset + length]).decode("utf-8")
+        self._names[player_id] = name
+        self.player_ids[name] = player_id
+        
+    def hand_at(self, offset):
+        """
+        Decode the hand whose record starts at offset (a HandRecord.offset).
+
+        Player names are only known once the file has been read up to that
+        point, so the player table is loaded first if needed.
+
+        Raises:
+            ValueError: If no hand record starts at offset
+        """
+        if not self._names:
+            self.count_hands()
+        if offset < FILE_HEADER.size or offset + RECORD_HEADER.size > len(self.data):
+            raise ValueError(f"No hand record at byte {offset}")
+        record_type, length = RECORD_HEADER.unpack_from(self.data, offset)
+        payload = offset + RECORD_HEADER.size
+        if record_type != HAND_RECORD or payload + length > len(self.data):
+            raise ValueError(f"No hand record at byte {offset}")
+        record = decode_hand(self.data, payload, self._names)
+        record.offset = offset
+        return record
+
+    def count_hands(self):
+        """Count hands without decoding them."""
+        count = 0
+        for record_type, offset, length in _iter_records(self.data):
+            if record_type == PLAYER_RECORD:
+                self._add_player(offset, length)
+            elif record_type == HAND_RECORD:
+                count += 1
+        return count
+    
+    def close(self):
+        self.data.close()
+        self.file.close()
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
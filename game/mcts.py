@@ -0,0 +1,237 @@
+"""
+Monte Carlo tree search NPC policy.
+
+MCTSPolicy is a drop-in replacement for game.npc.get_npc_action. At each
+decision it snapshots the game (see game.state) and runs information-set
+MCTS until its time budget runs out: every iteration deals the cards the
+acting player cannot see (opponents' hole cards and the rest of the deck) at
+random, walks the shared tree of betting actions with UCB1, expands one new
+action, and finishes the hand with a check/call rollout. The most visited
+action is played.
+
+The tree is keyed on betting actions only, so it stays valid whatever cards
+were sampled, and it is kept between a seat's decisions in the same hand:
+the next decision starts from the node the actions in between led to.
+
+Trees and random numbers are kept per game, so one policy instance can drive
+many tables (e.g. every NPC table of a TableHost) without them sharing
+either: by default each game's search samples from a child of that game's
+own stream, game.rng.child("mcts"), and a seeded table searches the same
+way every time (given a fixed max_iterations).
+"""
+import math
+import random
+import time
+import weakref
+from models.card import Card
+from config import BIG_BLIND
+
+class _Node:
+    """One betting history in the search tree."""
+
+    __slots__ = ('children', 'visits', 'reward', 'public')
+
+    def __init__(self, public=None):
+        # action key -> _Node
+        self.children = {}
+        self.visits = 0
+        # Sum of the rewards of the seat that chose the action leading here
+        self.reward = 0.0
+        # Public state reached here, used to find this node again next decision
+        self.public = public
+
+def public_key(state):
+    """Everything about a state that every player can see, apart from the board cards."""
+    return (state.street, state.to_act, state.pot, state.current_bet, state.active_mask,
+            state.all_in_mask, state.acted, tuple(state.chips), tuple(state.bets))
+
+def action_keys(state):
+    """
+    The actions searched at a state, as (action, amount) pairs.
+
+    Raises are limited to three sizes: double the current bet, the pot, and all-in.
+    """
+    keys = []
+    valid = state.valid_actions()
+    for action in ("fold", "check", "call"):
+        if action in valid:
+            keys.append((action, 0))
+    if "raise" in valid:
+        seat = state.to_act
+        to_call = state.current_bet - state.bets[seat]
+        most = state.chips[seat] - to_call
+        sizes = {max(state.current_bet, BIG_BLIND), state.pot, most}
+        for amount in sorted(sizes):
+            if 0 < amount <= most and to_call + amount > 0:
+                keys.append(("raise", amount))
+    return keys
+
+class MCTSStats:
+    """Search effort so far, to trade bot strength against table latency."""
+
+    def __init__(self):
+        self.decisions = 0
+        self.iterations = 0
+        self.elapsed = 0.0
+        # Visits inherited from the previous decision's tree
+        self.reused_visits = 0
+        self.last_iterations = 0
+
+    @property
+    def iterations_per_second(self):
+        return self.iterations / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        """Return a one-line text summary."""
+        average = self.iterations / self.decisions if self.decisions else 0
+        return (f"MCTS: {self.decisions} decisions, {self.iterations} iterations "
+                f"({self.iterations_per_second:.0f}/sec, {average:.0f} per decision), "
+                f"{self.reused_visits} visits reused")
+
+class MCTSPolicy:
+    """
+    Anytime information-set MCTS, usable anywhere an NPC policy is expected.
+
+    One instance can drive every NPC at any number of tables; each seat keeps
+    its own tree for the hand in progress.
+    """
+
+    def __init__(self, budget_ms=50, exploration=0.7, max_iterations=None, rng=None, preflop_policy=None):
+        """
+        Args:
+            budget_ms: Wall-clock time to search per decision, in milliseconds
+            exploration: UCB1 exploration constant (rewards are scaled to about -1..1)
+            max_iterations: Optional cap on iterations per decision (e.g. for repeatable tests)
+            rng: Optional random.Random used for sampling at every table; defaults to
+                game.rng.child("mcts") per game (a new random.Random for games without an RNG)
+            preflop_policy: Optional policy that makes pre-flop decisions instead of searching,
+                e.g. game.npc.get_preflop_table_action (a table lookup)
+        """
+        self.budget = budget_ms / 1000.0
+        self.exploration = exploration
+        self.max_iterations = max_iterations
+        self.rng = rng
+        self.preflop_policy = preflop_policy
+        self.stats = MCTSStats()
+        # game -> (random stream, {seat: (hand number, root node of that seat's last search)})
+        self._games = weakref.WeakKeyDictionary()
+
+    def _game_state(self, game):
+        """The random stream and search trees this policy keeps for one game."""
+        entry = self._games.get(game)
+        if entry is None:
+            rng = self.rng
+            if rng is None:
+                rng = game.rng.child("mcts") if hasattr(game.rng, "child") else random.Random()
+            entry = (rng, {})
+            self._games[game] = entry
+        return entry
+
+    def __call__(self, game, valid_actions):
+        """Choose an action for the current player; same signature as get_npc_action."""
+        if self.preflop_policy is not None and game.round == 0:
+            return self.preflop_policy(game, valid_actions)
+        start = time.perf_counter()
+        root_state = game.snapshot()
+        seat = root_state.to_act
+        rng, trees = self._game_state(game)
+        root = self._reuse_tree(trees, game.hand_number, seat, root_state)
+        self.stats.reused_visits += root.visits
+
+        # Cards this seat cannot see, resampled every iteration
+        known = set(root_state.holes[seat]) | set(root_state.board)
+        unknown = [i for i in range(len(Card.DECK)) if i not in known]
+        opponents = [s for s in range(root_state.num_seats) if s != seat]
+        # Rewards are chip changes, scaled by what is at stake for this seat
+        scale = float(root_state.pot + root_state.chips[seat] + root_state.bets[seat]) or 1.0
+
+        deadline = start + self.budget
+        iterations = 0
+        while iterations == 0 or time.perf_counter() < deadline:
+            if self.max_iterations is not None and iterations >= self.max_iterations:
+                break
+            rng.shuffle(unknown)
+            holes = list(root_state.holes)
+            for n, opponent in enumerate(opponents):
+                holes[opponent] = (unknown[2 * n], unknown[2 * n + 1])
+            state = root_state.with_cards(holes, unknown[2 * len(opponents):])
+            self._iterate(rng, root, state, root_state.chips, scale)
+            iterations += 1
+
+        best = max(root.children.items(), key=lambda item: item[1].visits)
+        action, amount = best[0]
+        if action not in valid_actions:
+            # Should not happen (the state mirrors the game); stay safe anyway
+            action, amount = ("check", 0) if "check" in valid_actions else ("fold", 0)
+        trees[seat] = (game.hand_number, best[1])
+
+        self.stats.decisions += 1
+        self.stats.iterations += iterations
+        self.stats.last_iterations = iterations
+        self.stats.elapsed += time.perf_counter() - start
+        return action, amount
+
+    def _reuse_tree(self, trees, hand_number, seat, state):
+        """Find the node of this seat's previous tree (in one game's trees) that the actions since then led to."""
+        entry = trees.pop(seat, None)
+        key = public_key(state)
+        if entry is not None and entry[0] == hand_number:
+            # Breadth-first through the histories that followed our last action
+            frontier = [entry[1]]
+            for _ in range(2 * state.num_seats + 2):
+                next_frontier = []
+                for node in frontier:
+                    if node.public == key:
+                        return node
+                    next_frontier.extend(node.children.values())
+                frontier = next_frontier
+                if not frontier:
+                    break
+        return _Node(key)
+
+    def _iterate(self, rng, root, state, root_chips, scale):
+        """One selection / expansion / rollout / backpropagation pass."""
+        path = [(root, None)]
+        node = root
+        # Selection: descend while every action here has been tried
+        while not state.terminal:
+            keys = action_keys(state)
+            untried = [k for k in keys if k not in node.children]
+            seat = state.to_act
+            if untried:
+                key = rng.choice(untried)
+                state = state.apply(*key)
+                child = _Node(public_key(state))
+                node.children[key] = child
+                path.append((child, seat))
+                break
+            key = self._select(node, keys)
+            state = state.apply(*key)
+            node = node.children[key]
+            if node.public is None:
+                node.public = public_key(state)
+            path.append((node, seat))
+
+        # Rollout: everyone checks or calls to the end of the hand
+        while not state.terminal:
+            valid = state.valid_actions()
+            state = state.apply("check" if "check" in valid else "call")
+
+        # Backpropagation: each node is scored for the seat that chose it
+        chips = state.chips
+        for node, seat in path:
+            node.visits += 1
+            if seat is not None:
+                node.reward += (chips[seat] - root_chips[seat]) / scale
+
+    def _select(self, node, keys):
+        """Pick the child with the best UCB1 score."""
+        log_visits = math.log(node.visits or 1)
+        best_key = None
+        best_score = -math.inf
+        for key in keys:
+            child = node.children[key]
+            score = child.reward / child.visits + self.exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key
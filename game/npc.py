@@ -0,0 +1,85 @@
+"""
+NPC decision policies.
+
+A policy is a function (game, valid_actions) -> (action, amount), the same
+signature Game.betting_round expects for both human and NPC players.
+Policies draw their random numbers from game.rng, so a seeded game replays
+the same decisions.
+"""
+from config import BIG_BLIND
+
+def get_npc_action(game, valid_actions):
+    """Generate an action for an NPC player using a simple strategy.
+    
+    Args:
+        game: The current game instance
+        valid_actions: List of valid actions for the player
+        
+    Returns:
+        tuple: (action, amount) where action is the chosen action and amount is used for raises
+    """
+    player = game.players[game.current_player_index]
+    rng = game.rng
+    
+    # Simple random strategy with weighted probabilities
+    if "check" in valid_actions:
+        # If check is available, 60% check, 20% raise, 20% fold
+        weights = {"check": 60, "raise": 20, "fold": 20}
+    elif "call" in valid_actions:
+        # If call is required, 50% call, 30% raise, 20% fold
+        weights = {"call": 50, "raise": 30, "fold": 20}
+    else:
+        # Limited options, equal weights
+        weights = {action: 100/len(valid_actions) for action in valid_actions}
+    
+    # Filter to only include valid actions
+    valid_weights = {a: w for a, w in weights.items() if a in valid_actions}
+    
+    # Choose action based on weights
+    actions = list(valid_weights.keys())
+    action_weights = [valid_weights[a] for a in actions]
+    action = rng.choices(actions, weights=action_weights, k=1)[0]
+    
+    # Handle raise amount if needed
+    if action == "raise":
+        min_raise = game.current_bet * 2 - player.current_bet
+        max_raise = player.chips
+        # Choose a random raise amount between min and max
+        amount = rng.randint(min_raise, max_raise)
+        return action, amount
+    
+    # For other actions, amount is not needed
+    return action, 0
+
+def get_preflop_table_action(game, valid_actions):
+    """Play pre-flop by the precomputed equity table (see game.preflop), later streets like get_npc_action.
+    
+    Pre-flop the decision is one table lookup: raise with at least 1.5 times
+    a fair share of the equity against the players still in the hand, call
+    when the equity beats the pot odds, otherwise check or fold.
+    
+    Args:
+        game: The current game instance
+        valid_actions: List of valid actions for the player
+        
+    Returns:
+        tuple: (action, amount) where action is the chosen action and amount is used for raises
+    """
+    if game.round != 0:
+        return get_npc_action(game, valid_actions)
+    from game.preflop import get_table, preflop_equity
+    player = game.players[game.current_player_index]
+    opponents = min(max(bin(game.active_mask).count("1") - 1, 1), get_table().max_opponents)
+    equity = preflop_equity(player.hand, opponents)
+    to_call = game.current_bet - player.current_bet
+    
+    if "raise" in valid_actions and equity >= 150.0 / (opponents + 1):
+        # Raise by the current bet (at least a big blind), if the chips allow it
+        amount = min(max(game.current_bet, BIG_BLIND), player.chips - to_call)
+        if amount > 0:
+            return "raise", amount
+    if "check" in valid_actions:
+        return "check", 0
+    if "call" in valid_actions and equity >= 100.0 * to_call / (game.pot + to_call):
+        return "call", 0
+    return "fold", 0
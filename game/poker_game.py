@@ -1,16 +1,40 @@
 """
 Game class for managing the Texas Hold'em poker game.
 """
+import random
 from models.deck import Deck
 from models.hand import Hand
 from models.player import Player
+from models.card import Card
 from config import STARTING_CHIPS, SMALL_BLIND, BIG_BLIND
-import itertools
+from game import evaluator, showdown
+from game.events import PrintSink
+
+# Rejected attempts at one decision before the fallback action is played instead
+MAX_ACTION_RETRIES = 3
+
+class StalledRoundError(RuntimeError):
+    """Raised when a betting round stops making progress."""
 
 class Game:
-    def __init__(self, player_names):
-        """Initialize the game with player names."""
-        self.deck = Deck()
+    def __init__(self, player_names, deck=None, events=None, human_seat=0, recorder=None, rng=None):
+        """Initialize the game with player names.
+        
+        Args:
+            player_names: Names of the players, in seat order
+            deck: Optional deck to deal from (e.g. an IndexedDeck); defaults to Deck()
+            events: Optional event sink for narration; defaults to printing
+            human_seat: Seat of the human player, or None for an all-NPC table
+            recorder: Optional hand history recorder (e.g. a HandHistoryWriter)
+            rng: Random stream for the default deck and the NPC policies (e.g. a utils.rng.RNG);
+                 defaults to the random module
+        """
+        self.rng = rng if rng is not None else random
+        self.deck = deck if deck is not None else Deck(self.rng)
+        self.events = events if events is not None else PrintSink()
+        self.human_seat = human_seat
+        self.recorder = recorder
+        self.hand_number = 0
         self.community_cards = Hand()
         self.pot = 0
         self.current_bet = 0
@@ -18,18 +42,203 @@ class Game:
         self.round = 0  # 0: pre-flop, 1: flop, 2: turn, 3: river
         self.dealer_position = 0
         self.players = []
+        # Seat bitmasks (bit i = self.players[i]): still in the hand, and all-in
+        self.active_mask = 0
+        self.all_in_mask = 0
+        # Seats that have acted since the last raise in the current betting round
+        self.acted_mask = 0
+        # Livelock protection: retries per decision, and counters per player name
+        self.max_retries = MAX_ACTION_RETRIES
+        self.rejected_actions = {}
+        self.fallback_actions = {}
+        self.profiler = None
         self.setup_game(player_names)
         
+    def enable_profiling(self, profiler=None):
+        """
+        Start recording wall time and call counts per phase, plus Hand allocations
+        and has_* predicate calls. Costs nothing until switched on.
+        
+        Args:
+            profiler: Optional Profiler to record into (shared across games if desired)
+            
+        Returns:
+            Profiler: The profiler in use; read it with snapshot() or summary()
+        """
+        from utils import profiling
+        self.disable_profiling()
+        self.profiler = profiler if profiler is not None else profiling.Profiler()
+        profiling.instrument_game(self, self.profiler)
+        profiling.instrument_hands(Hand, self.profiler)
+        return self.profiler
+        
+    def disable_profiling(self):
+        """Stop recording and restore the uninstrumented methods."""
+        if getattr(self, "profiler", None) is not None:
+            from utils import profiling
+            profiling.uninstrument_game(self)
+            profiling.uninstrument_hands(Hand, self.profiler)
+        self.profiler = None
+        
     def setup_game(self, player_names):
         """Initialize players and set up the game."""
-        # Create players - first player is human, rest are NPCs
+        # Create players - one seat (the first, by default) is human, rest are NPCs
         self.players = []
         for i, name in enumerate(player_names):
-            is_human = (i == 0)  # First player (index 0) is human
+            is_human = (i == self.human_seat)
             self.players.append(Player(name, STARTING_CHIPS, is_human))
+        self.refresh_seat_masks()
             
         # Shuffle deck
         self.deck.shuffle()
+        
+    def start_hand(self):
+        """Reset the table for a new hand: fresh shuffled deck, empty pot and board."""
+        self.deck.reset()
+        self.deck.shuffle()
+        self.community_cards.clear()
+        self.pot = 0
+        self.current_bet = 0
+        self.round = 0
+        for player in self.players:
+            player.hand.clear()
+            player.is_folded = False
+            player.is_all_in = False
+            player.current_bet = 0
+        self.refresh_seat_masks()
+        self.hand_number += 1
+        if self.recorder is not None:
+            self.recorder.begin_hand(self)
+            
+    def award_pot(self, winners):
+        """
+        Split the pot between the winners.
+        
+        Odd chips that don't divide evenly go to the first winners in seat order.
+        
+        Args:
+            winners: List of winning players
+            
+        Returns:
+            int: The share each winner received (before odd chips)
+        """
+        share, odd_chips = divmod(self.pot, len(winners))
+        amounts = [share + (1 if i < odd_chips else 0) for i in range(len(winners))]
+        for winner, amount in zip(winners, amounts):
+            winner.chips += amount
+        if self.recorder is not None:
+            self.recorder.end_hand(self, winners, amounts)
+        self.pot = 0
+        return share
+        
+    def end_hand(self):
+        """
+        Remove busted players and pass the dealer button to the next surviving player.
+        
+        Returns:
+            list: Players eliminated this hand
+        """
+        num_players = len(self.players)
+        next_dealer = None
+        for step in range(1, num_players + 1):
+            candidate = self.players[(self.dealer_position + step) % num_players]
+            if candidate.chips > 0:
+                next_dealer = candidate
+                break
+                
+        busted = [p for p in self.players if p.chips <= 0]
+        self.players = [p for p in self.players if p.chips > 0]
+        self.dealer_position = self.players.index(next_dealer) if next_dealer else 0
+        return busted
+    
+    def refresh_seat_masks(self):
+        """Rebuild the active and all-in seat bitmasks from the players' flags."""
+        self.active_mask = 0
+        self.all_in_mask = 0
+        for seat, player in enumerate(self.players):
+            if not player.is_folded:
+                self.active_mask |= 1 << seat
+            if player.is_all_in:
+                self.all_in_mask |= 1 << seat
+                
+    def update_seat_mask(self, seat):
+        """Bring one seat's active and all-in bits in line with its player after an action."""
+        player = self.players[seat]
+        bit = 1 << seat
+        if player.is_folded:
+            self.active_mask &= ~bit
+        if player.is_all_in:
+            self.all_in_mask |= bit
+            
+    def matched_mask(self):
+        """Return the bitmask of seats whose bet this round equals the current bet."""
+        mask = 0
+        for seat, player in enumerate(self.players):
+            if player.current_bet == self.current_bet:
+                mask |= 1 << seat
+        return mask
+        
+    def next_active_seat(self, seat):
+        """
+        Return the first seat after the given one, wrapping round the table,
+        that is still in the hand (None if nobody is).
+        
+        Clearing the bits up to and including seat leaves the later active seats;
+        the lowest set bit of that (or of the whole mask, after wrapping) is the answer.
+        """
+        later = self.active_mask >> (seat + 1) << (seat + 1)
+        ring = later or self.active_mask
+        if not ring:
+            return None
+        return (ring & -ring).bit_length() - 1
+    
+    def snapshot(self):
+        """
+        Capture the hand in progress as a flat GameState (see game.state).
+        
+        Meant to be called from a betting policy, at the current player's decision.
+        
+        Returns:
+            GameState: A copy that can be searched with apply() or loaded back with restore()
+        """
+        # Imported here: only search policies need game.state
+        from game.state import GameState
+        return GameState.from_game(self)
+        
+    def restore(self, state):
+        """
+        Put the table back to a GameState taken from this game with snapshot().
+        
+        Args:
+            state: The state to restore; the seats must be the same players
+        """
+        for seat, player in enumerate(self.players):
+            player.chips = state.chips[seat]
+            player.current_bet = state.bets[seat]
+            player.is_folded = not state.active_mask >> seat & 1
+            player.is_all_in = bool(state.all_in_mask >> seat & 1)
+            player.hand.clear()
+            for index in state.holes[seat]:
+                player.hand.add_card(Card.DECK[index])
+        self.community_cards.clear()
+        for index in state.board:
+            self.community_cards.add_card(Card.DECK[index])
+        self.pot = state.pot
+        self.current_bet = state.current_bet
+        self.current_player_index = state.to_act
+        self.round = state.street
+        self.dealer_position = state.dealer
+        self.active_mask = state.active_mask
+        self.all_in_mask = state.all_in_mask
+        self.acted_mask = state.acted
+        
+        undealt = state.deck[:state.deck_remaining]
+        if hasattr(self.deck, "order"):
+            dealt = set(undealt)
+            self.deck.order = list(undealt) + [i for i in range(len(Card.DECK)) if i not in dealt]
+            self.deck.remaining = len(undealt)
+        else:
+            self.deck.cards = [Card.DECK[i] for i in undealt]
     
     def deal_cards(self):
         """Deal two cards to each player."""
@@ -54,11 +263,17 @@ class Game:
         sb_pos = (self.dealer_position + 1) % num_players
         sb_amount = self.players[sb_pos].place_bet(SMALL_BLIND)
         self.pot += sb_amount
+        self.update_seat_mask(sb_pos)
+        if self.recorder is not None:
+            self.recorder.action(self, sb_pos, "small_blind", sb_amount)
         
         # Big blind is posted by the player to the left of the small blind
         bb_pos = (sb_pos + 1) % num_players
         bb_amount = self.players[bb_pos].place_bet(BIG_BLIND)
         self.pot += bb_amount
+        self.update_seat_mask(bb_pos)
+        if self.recorder is not None:
+            self.recorder.action(self, bb_pos, "big_blind", bb_amount)
         
         # Set the current bet to the big blind amount
         self.current_bet = BIG_BLIND
@@ -98,7 +313,7 @@ class Game:
             player.current_bet = 0
             
         # Display current pot amount
-        print(f"Current pot: {self.pot}")
+        self.events.emit(f"Current pot: {self.pot}")
         
         # Deal community cards for the new round
         new_cards = self.deal_community_cards()
@@ -116,24 +331,17 @@ class Game:
         if len(self.players) == 0:
             return False
             
-        # Count active players
-        active_players = sum(1 for p in self.players if not p.is_folded)
-        if active_players <= 1:
-            return False  # Game is over or only one player left
-            
-        # Find the next active player
-        start_index = self.current_player_index
-        while True:
-            # Move to the next player; index resets to 0 once everyone is tapped
-            self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        # At most one bit set: game is over or only one player left
+        active = self.active_mask
+        if active & (active - 1) == 0:
+            return False
             
-            # If we've checked all players and come back to the start, exit
-            if self.current_player_index == start_index:
-                return False
-                
-            # If this player is active, we're done
-            if not self.players[self.current_player_index].is_folded:
-                return True
+        # Next set bit in the ring of active seats
+        next_seat = self.next_active_seat(self.current_player_index)
+        if next_seat == self.current_player_index:
+            return False
+        self.current_player_index = next_seat
+        return True
                 
     def get_valid_actions(self):
         """Get the valid actions for the current player."""
@@ -181,21 +389,29 @@ class Game:
         # Execute the action
         if action == "fold":
             player.fold()
-            print(f"{player.name} folds.")
+            self.active_mask &= ~(1 << self.current_player_index)
+            self.events.emit(f"{player.name} folds.")
+            if self.recorder is not None:
+                self.recorder.action(self, self.current_player_index, action, 0)
             return True
             
         elif action == "check":
             if player.check(self.current_bet):
-                print(f"{player.name} checks.")
+                self.events.emit(f"{player.name} checks.")
+                if self.recorder is not None:
+                    self.recorder.action(self, self.current_player_index, action, 0)
                 return True
             else:
-                print(f"Invalid check: {player.name} must match the current bet of {self.current_bet}.")
+                self.events.emit(f"Invalid check: {player.name} must match the current bet of {self.current_bet}.")
                 return False
                 
         elif action == "call":
             call_amount = player.call(self.current_bet)
             self.pot += call_amount
-            print(f"{player.name} calls with {call_amount}.")
+            self.update_seat_mask(self.current_player_index)
+            self.events.emit(f"{player.name} calls with {call_amount}.")
+            if self.recorder is not None:
+                self.recorder.action(self, self.current_player_index, action, call_amount)
             return True
             
         elif action == "raise":
@@ -203,16 +419,37 @@ class Game:
             if success:
                 self.pot += raise_amount
                 self.current_bet = player.current_bet
-                print(f"{player.name} raises to {player.current_bet} (adding {raise_amount}).")
+                self.update_seat_mask(self.current_player_index)
+                self.events.emit(f"{player.name} raises to {player.current_bet} (adding {raise_amount}).")
+                if self.recorder is not None:
+                    self.recorder.action(self, self.current_player_index, action, raise_amount)
                 return True
             else:
-                print(f"Invalid raise: {player.name} doesn't have enough chips.")
+                self.events.emit(f"Invalid raise: {player.name} doesn't have enough chips.")
                 return False
                 
         else:
-            print(f"Invalid action: {action}")
+            self.events.emit(f"Invalid action: {action}")
             return False
             
+    @staticmethod
+    def fallback_action(valid_actions):
+        """The action played for a player whose choices keep being rejected: check, else call, else fold."""
+        for action in ("check", "call"):
+            if action in valid_actions:
+                return action, 0
+        return "fold", 0
+        
+    def is_round_complete(self, acted, matched):
+        """
+        Check whether every active player has acted and matched the current bet (or is all-in).
+        
+        Args:
+            acted: Bitmask of seats that have acted since the last raise
+            matched: Bitmask of seats whose bet equals the current bet
+        """
+        return self.active_mask & ~(acted & (matched | self.all_in_mask)) == 0
+        
     def betting_round(self, func_get_human_action, func_get_npc_action):
         """
         Run a complete betting round where each player acts in turn.
@@ -224,21 +461,60 @@ class Game:
         Returns:
             bool: True if round completed successfully, False if game ended
         """
-        # Track which players have acted and if their bets are matched
-        players_acted = set()
-        last_raiser = None
+        steps = self.betting_steps()
+        try:
+            player, valid_actions = next(steps)
+            while True:
+                if player.is_human:
+                    decision = func_get_human_action(self, valid_actions)
+                else:
+                    decision = func_get_npc_action(self, valid_actions)
+                player, valid_actions = steps.send(decision)
+        except StopIteration as done:
+            return done.value
         
-        # Get all active players at the start of the round
-        active_players = [p for p in self.players if not p.is_folded]
+    def betting_steps(self):
+        """
+        The betting round as a generator, so callers can supply decisions however
+        they like (e.g. awaiting them from an asyncio task, see game.server).
+        
+        Yields (player, valid_actions) for every decision and expects an
+        (action, amount) pair to be sent back. Its return value (the
+        StopIteration value) is the same as betting_round()'s.
+        
+        A player whose action is rejected is asked again, up to max_retries
+        times; after that the fallback action is played for them, so a policy
+        that keeps choosing invalid actions can't spin the loop forever.
+        
+        Raises:
+            StalledRoundError: If the loop goes round the table without any action succeeding
+        """
+        # Seats that have acted since the last raise, and seats whose bet is matched
+        self.refresh_seat_masks()
+        acted = self.acted_mask = 0
+        matched = self.matched_mask()
+        # Rejected attempts at the current decision, and loop passes since the last action
+        retries = 0
+        idle = 0
         
         # Continue until all active players have acted and bets are matched
         while True:
-            player = self.players[self.current_player_index]
+            idle += 1
+            if idle > len(self.players) + self.max_retries + 2:
+                raise StalledRoundError(
+                    f"Betting round stalled at seat {self.current_player_index} "
+                    f"({self.players[self.current_player_index].name})")
+            seat = self.current_player_index
+            bit = 1 << seat
+            player = self.players[seat]
             
             # Skip folded or all-in players
-            if player.is_folded or player.is_all_in:
+            if not self.active_mask & bit or self.all_in_mask & bit:
                 # Mark as acted and move to next player
-                players_acted.add(player)
+                acted |= bit
+                # Nobody left who can act (e.g. everyone still in is all-in)
+                if self.is_round_complete(acted, matched):
+                    return True
                 if not self.next_active_player():
                     break
                 continue
@@ -248,42 +524,51 @@ class Game:
             
             # If player has no valid actions, move to next player
             if not valid_actions:
-                players_acted.add(player)
+                acted |= bit
+                if self.is_round_complete(acted, matched):
+                    return True
                 if not self.next_active_player():
                     break
                 continue
                 
             # Get action from either human or NPC
-            if player.is_human:
-                action, amount = func_get_human_action(self, valid_actions)
+            self.acted_mask = acted
+            if retries < self.max_retries:
+                action, amount = yield player, valid_actions
             else:
-                action, amount = func_get_npc_action(self, valid_actions)
+                action, amount = self.fallback_action(valid_actions)
+                self.fallback_actions[player.name] = self.fallback_actions.get(player.name, 0) + 1
+                self.events.emit(f"{player.name} made {retries} invalid choices; playing {action}.")
                 
             # Execute the action
+            previous_bet = self.current_bet
             if not self.execute_action(action, amount):
                 # If action failed, stay with current player
+                self.rejected_actions[player.name] = self.rejected_actions.get(player.name, 0) + 1
+                retries += 1
                 continue
+            retries = 0
+            idle = 0
                 
-            # If player raised, track them as the last raiser and clear acted set
+            # If player raised, only players who can no longer act keep their acted bit
             if action == "raise":
-                last_raiser = player
-                # Only players who have already acted need to act again
-                players_acted = {p for p in players_acted if p.is_folded or p.is_all_in}
+                acted &= ~self.active_mask | self.all_in_mask
+                # A raise over the old bet leaves the raiser as the only matched seat
+                matched = 0 if self.current_bet > previous_bet else self.matched_mask()
             
-            # Add player to acted set
-            players_acted.add(player)
-            
-            # Re-calculate active players after this action
-            active_players = [p for p in self.players if not p.is_folded]
+            acted |= bit
+            if player.current_bet == self.current_bet:
+                matched |= bit
+            else:
+                matched &= ~bit
             
-            if len(active_players) == 1:
+            active = self.active_mask
+            if active & (active - 1) == 0:
                 # Only one player left, they win
                 return False
                 
             # Round is complete when all active players have acted and all bets are matched
-            if all(p in players_acted for p in active_players) and all(
-                p.current_bet == self.current_bet or p.is_all_in for p in active_players
-            ):
+            if self.is_round_complete(acted, matched):
                 return True
                 
             # Move to next player
@@ -306,56 +591,61 @@ class Game:
         # Combine player's cards with community cards
         all_cards = player.hand.cards + self.community_cards.cards
         
-        # Create all possible 5-card combinations
-        possible_hands = list(itertools.combinations(all_cards, 5))
+        # Need at least five cards to make a hand
+        if len(all_cards) < 5:
+            return -1, None
         
-        # Find the best hand
-        best_hand_rank = -1
-        best_hand = None
+        # Score all cards at once from the running hand summaries
+        strength = self.hand_strength(player)
+        hand_rank = evaluator.hand_rank(strength)
         
-        for cards in possible_hands:
-            # Create a temporary hand to evaluate
-            temp_hand = Hand()
-            for card in cards:
-                temp_hand.add_card(card)
-                
-            # Check for various poker hands (in descending order of rank)
-            hand_rank = -1
-            
-            if temp_hand.has_royal_flush():
-                hand_rank = 9
-            elif temp_hand.has_straight_flush():
-                hand_rank = 8
-            elif temp_hand.has_four_of_a_kind():
-                hand_rank = 7
-            elif temp_hand.has_full_house():
-                hand_rank = 6
-            elif temp_hand.has_flush():
-                hand_rank = 5
-            elif temp_hand.has_straight():
-                hand_rank = 4
-            elif temp_hand.has_three_of_a_kind():
-                hand_rank = 3
-            elif temp_hand.has_two_pairs():
-                hand_rank = 2
-            elif temp_hand.has_pair():
-                hand_rank = 1
-            else:
-                hand_rank = 0  # High card
+        # Build the 5-card hand that produced this strength
+        best_hand = Hand()
+        for card in evaluator.best_five(all_cards, strength):
+            best_hand.add_card(card)
+        best_hand.strength = strength
+        # Calculate the tiebreaker score immediately
+        best_hand.calculate_score(hand_rank)
+        
+        return hand_rank, best_hand
+    
+    def hand_strength(self, player):
+        """
+        Score a player's hole cards plus the community cards as one integer.
+        
+        Combines the running summaries the player's hand and the board keep as
+        cards are dealt, so this is a couple of table lookups at any street.
+        
+        Args:
+            player: The player to evaluate
             
-            # Update best hand if this is better
-            if hand_rank > best_hand_rank:
-                best_hand_rank = hand_rank
-                best_hand = temp_hand
-                # Calculate the tiebreaker score immediately
-                best_hand.calculate_score(best_hand_rank)
+        Returns:
+            int: Comparable hand strength (higher is better)
+        """
+        state = evaluator.combine_states(player.hand.state(), self.community_cards.state())
+        return evaluator.evaluate_state(*state)
+    
+    def current_hand_rank(self, player):
+        """Return the rank (0-9) of the best hand a player has made so far, at any street."""
+        return evaluator.hand_rank(self.hand_strength(player))
+        
+    def showdown_ranking(self):
+        """
+        Rank the active players' hands against the board in one batch.
         
-        return best_hand_rank, best_hand
+        Returns:
+            list: Tiers of (player, strength) pairs, best hand first
+        """
+        active_players = [p for p in self.players if not p.is_folded]
+        return showdown.rank_players(active_players, self.community_cards)
         
     def determine_winner(self):
         """
         Determine the winner(s) among active players at showdown.
         
+        Hands are compared on rank and then every kicker. Hands of exactly
+        equal strength fall back to the suit tiebreaker (see SUIT_VALUES).
+        
         Returns:
             list: List of player(s) who won
         """
@@ -365,24 +655,16 @@ class Game:
         if len(active_players) == 1:
             return active_players
             
-        # Evaluate each player's best hand
-        player_hands = []
-        for player in active_players:
-            hand_rank, best_hand = self.evaluate_hand(player)
-            player_hands.append((player, hand_rank, best_hand))
-            
-        # Find the highest hand rank
-        highest_rank = max(rank for _, rank, _ in player_hands)
-        
-        # Get all players with the highest rank
-        highest_rank_players = [(player, hand) for player, rank, hand in player_hands if rank == highest_rank]
+        # Every player scored against the shared board at once
+        best_tier = self.showdown_ranking()[0]
         
-        # If only one player has the highest rank, they win
-        if len(highest_rank_players) == 1:
-            return [highest_rank_players[0][0]]
+        # If only one player has the best hand, they win
+        if len(best_tier) == 1:
+            return [best_tier[0][0]]
         
-        # Find the highest tiebreaker score among players with the highest rank
-        best_score = max(hand.tiebreaker_score for _, hand in highest_rank_players)
+        # Exactly tied hands: compare the tiebreaker scores of the best 5-card hands
+        tied_hands = [(player, self.evaluate_hand(player)[1]) for player, _ in best_tier]
+        best_score = max(hand.tiebreaker_score for _, hand in tied_hands)
         
         # Return all players who have the highest tiebreaker score
-        return [player for player, hand in highest_rank_players if hand.tiebreaker_score == best_score]
\ No newline at end of file
+        return [player for player, hand in tied_hands if hand.tiebreaker_score == best_score]
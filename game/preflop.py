@@ -0,0 +1,131 @@
+"""
+Precomputed preflop equity table.
+
+Holds the equity of each of the 169 starting hand classes against 1 to
+NUM_PLAYERS - 1 opponents with random cards. The table is built once by
+simulation, stored in a small binary file and loaded on first lookup, so a
+preflop equity query is a dictionary-free list lookup.
+
+File layout (little-endian):
+    header: magic b"PFEQ", version (uint16), hand classes (uint16),
+            max opponents (uint16), samples per cell (uint32)
+    body:   one uint16 per (hand class, opponents) cell, equity in basis
+            points (0-10000), hand class major
+"""
+import argparse
+import os
+import struct
+import sys
+from array import array
+from game.canonical import NUM_STARTING_HANDS, starting_hand_class, class_representative, class_label
+from game.equity import equity_vs_random
+from config import NUM_PLAYERS
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_equity.bin")
+MAGIC = b"PFEQ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHI")
+DEFAULT_SAMPLES = 20000
+
+class PreflopTable:
+    """Equity (in percent) for every starting hand class and opponent count."""
+    
+    def __init__(self, max_opponents, samples, cells):
+        self.max_opponents = max_opponents
+        self.samples = samples
+        # Flat list of basis points: cells[hand_class * max_opponents + opponents - 1]
+        self.cells = cells
+        
+    def equity(self, hand_class, num_opponents):
+        if not 1 <= num_opponents <= self.max_opponents:
+            raise ValueError(f"Preflop table covers 1 to {self.max_opponents} opponents")
+        return self.cells[hand_class * self.max_opponents + num_opponents - 1] / 100.0
+    
+    def save(self, path=TABLE_PATH):
+        cells = array("H", self.cells)
+        if sys.byteorder != "little":
+            cells.byteswap()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, NUM_STARTING_HANDS, self.max_opponents, self.samples))
+            f.write(cells.tobytes())
+            
+    @classmethod
+    def load(cls, path=TABLE_PATH):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, num_classes, max_opponents, samples = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or num_classes != NUM_STARTING_HANDS:
+            raise ValueError(f"{path} is not a version {VERSION} preflop equity table")
+        cells = array("H")
+        cells.frombytes(data[HEADER.size:])
+        if sys.byteorder != "little":
+            cells.byteswap()
+        if len(cells) != num_classes * max_opponents:
+            raise ValueError(f"{path} is truncated")
+        return cls(max_opponents, samples, cells.tolist())
+    
+    @classmethod
+    def build(cls, max_opponents=NUM_PLAYERS - 1, samples=DEFAULT_SAMPLES, seed=0, progress=None):
+        """
+        Simulate every cell of the table.
+        
+        Args:
+            max_opponents: Largest opponent count to cover
+            samples: Runouts simulated per cell
+            seed: Base seed; each cell gets its own derived seed
+            progress: Optional callback(hand_class) called as each class finishes
+        """
+        cells = []
+        for hand_class in range(NUM_STARTING_HANDS):
+            hole = class_representative(hand_class)
+            for opponents in range(1, max_opponents + 1):
+                result = equity_vs_random(hole, opponents, margin=0.0, max_samples=samples,
+                                          seed=seed * 100003 + hand_class * 16 + opponents)
+                cells.append(round(result.equity[0] * 100))
+            if progress:
+                progress(hand_class)
+        return cls(max_opponents, samples, cells)
+
+_table = None
+
+def get_table():
+    """Return the preflop table, loading it (or building and saving it if missing) on first use."""
+    global _table
+    if _table is None:
+        if os.path.exists(TABLE_PATH):
+            _table = PreflopTable.load()
+        else:
+            _table = PreflopTable.build()
+            _table.save()
+    return _table
+
+def preflop_equity(hole_cards, num_opponents):
+    """
+    Look up the equity of two hole cards against random opponents.
+    
+    Args:
+        hole_cards: Two Cards (or 0-51 indices), or a Hand holding them
+        num_opponents: Number of opponents still in the hand
+        
+    Returns:
+        float: Equity in percent
+    """
+    cards = getattr(hole_cards, "cards", hole_cards)
+    return get_table().equity(starting_hand_class(cards[0], cards[1]), num_opponents)
+
+def main(argv=None):
+    """Rebuild the preflop table file."""
+    parser = argparse.ArgumentParser(description="Build the preflop equity table")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="runouts per cell")
+    parser.add_argument("--opponents", type=int, default=NUM_PLAYERS - 1, help="largest opponent count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    def report(hand_class):
+        print(f"{class_label(hand_class)} done ({hand_class + 1}/{NUM_STARTING_HANDS})")
+    table = PreflopTable.build(args.opponents, args.samples, args.seed, progress=report)
+    table.save()
+    print(f"Saved {TABLE_PATH}")
+
+if __name__ == "__main__":
+    main()
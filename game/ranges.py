@@ -0,0 +1,295 @@
+"""
+Weighted hand ranges and range-vs-range equity.
+
+A Range gives a weight (0-1) to each of the 1326 two-card combos, e.g.
+"QQ+, AKs, AQo:0.5". range_equity() computes the exact equity of one range
+against another on a board of three to five cards, with card removal: combos
+that use a board or dead card, or that share a card with each other, never
+meet.
+
+For each runout, every combo is scored once against the board, giving a
+strength array over the 1326 combos. The matchups then reduce to matrix
+products: (outcome matrix * compatibility matrix) @ villain weights gives
+each hero combo's weighted wins, so a river query is one pass of array
+arithmetic rather than a loop over pairs of combos. Requires NumPy when
+computing equity; building ranges does not.
+"""
+import itertools
+from functools import lru_cache
+from game import evaluator
+from game.canonical import NUM_RANKS, RANK_LABELS, starting_hand_class
+from game.equity import BOARD_SIZE, EquityResult, to_indices
+from models.card import Card
+
+# Every two-card combo as a pair of card indices (low index first), in a fixed order
+COMBOS = list(itertools.combinations(range(evaluator.NUM_CARDS), 2))
+NUM_COMBOS = len(COMBOS)
+_COMBO_INDEX = {combo: i for i, combo in enumerate(COMBOS)}
+# Boards whose combo strength arrays are kept
+STRENGTH_CACHE_SIZE = 256
+
+def combo_index(card_a, card_b):
+    """Position of a two-card combo (Cards or 0-51 indices, any order) in COMBOS."""
+    a, b = to_indices([card_a, card_b])
+    if a == b:
+        raise ValueError("A combo needs two different cards")
+    return _COMBO_INDEX[(a, b) if a < b else (b, a)]
+
+def _class_combos():
+    combos = [[] for _ in range(NUM_RANKS * NUM_RANKS)]
+    for i, (a, b) in enumerate(COMBOS):
+        combos[starting_hand_class(a, b)].append(i)
+    return combos
+
+# Combo positions per starting hand class (see game.canonical)
+CLASS_COMBOS = _class_combos()
+
+def _check_weight(weight):
+    if not 0.0 <= weight <= 1.0:
+        raise ValueError(f"Combo weights are between 0 and 1, got {weight}")
+    return weight
+
+def _rank(label):
+    if label not in RANK_LABELS:
+        raise ValueError(f"Unknown rank: {label}")
+    return RANK_LABELS.index(label)
+
+def _class_of(high, low, kind):
+    """Starting hand class of two ranks (0-12, high >= low), kind "s" (suited) or "o" (offsuit)."""
+    # Representative indices: suits 0/0 for suited, 0/1 otherwise
+    return starting_hand_class(high, low if kind == "s" else NUM_RANKS + low)
+
+def parse_classes(token):
+    """
+    Starting hand classes named by one token of range notation.
+
+    Accepts a pair ("TT"), a suited or offsuit hand ("AKs", "AKo"), both ("AK"),
+    and "+" for "this and better": "TT+" is TT to AA, "ATs+" is ATs to AKs.
+
+    Returns:
+        list: Class indices (see game.canonical.starting_hand_class)
+    """
+    plus = token.endswith("+")
+    spec = token[:-1] if plus else token
+    if len(spec) not in (2, 3) or (len(spec) == 3 and spec[2] not in "so"):
+        raise ValueError(f"Cannot parse hand range token: {token}")
+    high, low = _rank(spec[0]), _rank(spec[1])
+    if high < low:
+        high, low = low, high
+    if high == low:
+        if len(spec) == 3:
+            raise ValueError(f"A pair cannot be suited or offsuit: {token}")
+        return [_class_of(rank, rank, "o") for rank in range(high, NUM_RANKS if plus else high + 1)]
+    kinds = spec[2] if len(spec) == 3 else "so"
+    lows = range(low, high) if plus else [low]
+    return [_class_of(high, kicker, kind) for kicker in lows for kind in kinds]
+
+class Range:
+    """A weight between 0 and 1 for each of the 1326 two-card combos."""
+
+    def __init__(self, weights=None):
+        """
+        Args:
+            weights: Optional sequence of NUM_COMBOS weights, in COMBOS order (default: empty range)
+        """
+        self.weights = [_check_weight(w) for w in weights] if weights is not None else [0.0] * NUM_COMBOS
+        if len(self.weights) != NUM_COMBOS:
+            raise ValueError(f"A range has {NUM_COMBOS} combo weights")
+
+    @classmethod
+    def full(cls):
+        """Every combo with weight 1 (a random hand)."""
+        return cls([1.0] * NUM_COMBOS)
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Build a range from comma-separated notation, e.g. "QQ+, AKs, AQo:0.5, 76s".
+
+        Each token may end in ":weight"; tokens without one get weight 1.
+        """
+        hand_range = cls()
+        for token in text.replace(" ", "").split(","):
+            if not token:
+                continue
+            spec, _, weight = token.partition(":")
+            weight = float(weight) if weight else 1.0
+            for hand_class in parse_classes(spec):
+                hand_range.add_class(hand_class, weight)
+        return hand_range
+
+    def add_class(self, hand_class, weight=1.0):
+        """Give every combo of a starting hand class (see game.canonical) this weight."""
+        _check_weight(weight)
+        for i in CLASS_COMBOS[hand_class]:
+            self.weights[i] = weight
+
+    def set(self, card_a, card_b, weight=1.0):
+        """Set the weight of one combo (Cards or 0-51 indices)."""
+        self.weights[combo_index(card_a, card_b)] = _check_weight(weight)
+
+    def weight(self, card_a, card_b):
+        return self.weights[combo_index(card_a, card_b)]
+
+    def combos(self):
+        """The combos in the range as ((Card, Card), weight) pairs."""
+        return [((Card.DECK[a], Card.DECK[b]), w) for (a, b), w in zip(COMBOS, self.weights) if w > 0]
+
+    def __len__(self):
+        """Number of combos with a non-zero weight."""
+        return sum(1 for w in self.weights if w > 0)
+
+@lru_cache(maxsize=1)
+def _combo_arrays():
+    """Combo cards as a (NUM_COMBOS, 2) array and the matrix of combo pairs that share no card."""
+    import numpy as np
+    cards = np.array(COMBOS, dtype=np.intp)
+    masks = (np.int64(1) << cards[:, 0]) | (np.int64(1) << cards[:, 1])
+    disjoint = (masks[:, None] & masks[None, :]) == 0
+    return cards, masks, disjoint
+
+@lru_cache(maxsize=STRENGTH_CACHE_SIZE)
+def _strengths(board):
+    import numpy as np
+    from game.batch_evaluator import evaluate_batch
+    cards, masks, _ = _combo_arrays()
+    board_mask = 0
+    for i in board:
+        board_mask |= 1 << i
+    live = (masks & board_mask) == 0
+    hands = np.concatenate([cards[live], np.broadcast_to(np.array(board, dtype=np.intp),
+                                                         (int(live.sum()), len(board)))], axis=1)
+    strengths = np.full(NUM_COMBOS, -1, dtype=np.int64)
+    strengths[live] = evaluate_batch(hands)
+    strengths.flags.writeable = False
+    return strengths
+
+def combo_strengths(board):
+    """
+    Hand strength of every combo on a complete board (requires NumPy).
+
+    Args:
+        board: Five community cards (Cards or 0-51 indices)
+
+    Returns:
+        numpy.ndarray: NUM_COMBOS strengths in COMBOS order; -1 for combos that use a board card
+    """
+    board = tuple(sorted(to_indices(board)))
+    if len(board) != BOARD_SIZE:
+        raise ValueError("Combo strengths need a complete board")
+    return _strengths(board)
+
+class RangeEquityResult(EquityResult):
+    """
+    EquityResult for two ranges, with per-combo equities.
+
+    Counts are weighted: samples is the total weight of all matchups (combo
+    pairs times runouts), and wins/ties/shares are weighted the same way.
+    """
+
+    def __init__(self):
+        super().__init__(2)
+        self.exact = True
+        # Per player: combo position -> [weighted shares, weighted matchups]
+        self._combo_totals = [{}, {}]
+
+    def _add_combos(self, player, positions, shares, totals):
+        entries = self._combo_totals[player]
+        for i, share, total in zip(positions.tolist(), shares.tolist(), totals.tolist()):
+            entry = entries.setdefault(i, [0.0, 0.0])
+            entry[0] += share
+            entry[1] += total
+
+    def combo_equity(self, player):
+        """
+        Equity of each combo in one player's range against the other range.
+
+        Args:
+            player: 0 or 1, in the order the ranges were given
+
+        Returns:
+            dict: (Card, Card) -> equity in percent, for combos that met at least one opposing combo
+        """
+        result = {}
+        for i, (share, total) in self._combo_totals[player].items():
+            if total > 0:
+                a, b = COMBOS[i]
+                result[(Card.DECK[a], Card.DECK[b])] = 100.0 * share / total
+        return result
+
+def range_equity(ranges, board, dead=()):
+    """
+    Exact equity of one weighted range against another (requires NumPy).
+
+    Every runout of the board is enumerated, so the river is one step, the
+    turn 44-46 and the flop about a thousand.
+
+    Args:
+        ranges: Two Range objects (hero, villain)
+        board: Known community cards (3-5), as a Hand or list of Cards or indices
+        dead: Other cards known to be out of play (e.g. folded hands)
+
+    Returns:
+        RangeEquityResult: Weighted win/tie/lose percentages, plus per-combo equities
+    """
+    import numpy as np
+    if len(ranges) != 2:
+        raise ValueError("Range equity compares exactly two ranges")
+    board_indices = to_indices(board)
+    dead_indices = to_indices(dead)
+    if not 3 <= len(board_indices) <= BOARD_SIZE:
+        raise ValueError("Range equity needs a flop, turn or river board")
+    known = board_indices + dead_indices
+    if len(set(known)) != len(known):
+        raise ValueError("The same card appears more than once")
+
+    _, masks, disjoint = _combo_arrays()
+    known_mask = 0
+    for i in known:
+        known_mask |= 1 << i
+    live = (masks & known_mask) == 0
+    hero = np.asarray(ranges[0].weights, dtype=np.float64) * live
+    villain = np.asarray(ranges[1].weights, dtype=np.float64) * live
+    rows, cols = np.nonzero(hero)[0], np.nonzero(villain)[0]
+    hero, villain = hero[rows], villain[cols]
+    # Combo pairs that can be dealt together
+    compatible = disjoint[np.ix_(rows, cols)].astype(np.float64)
+
+    result = RangeEquityResult()
+    hero_shares = np.zeros(len(rows))
+    hero_totals = np.zeros(len(rows))
+    villain_shares = np.zeros(len(cols))
+    villain_totals = np.zeros(len(cols))
+    wins = [0.0, 0.0]
+    ties = 0.0
+    total = 0.0
+    deck = [i for i in range(evaluator.NUM_CARDS) if not known_mask >> i & 1]
+    for runout in itertools.combinations(deck, BOARD_SIZE - len(board_indices)):
+        strengths = combo_strengths(board_indices + list(runout))
+        hero_strength, villain_strength = strengths[rows], strengths[cols]
+        # Combos holding a runout card are out of this runout
+        possible = compatible * (hero_strength >= 0)[:, None] * (villain_strength >= 0)[None, :]
+        ahead = (hero_strength[:, None] > villain_strength[None, :]) * possible
+        level = (hero_strength[:, None] == villain_strength[None, :]) * possible
+
+        # Weighted wins, ties and matchups per combo, as matrix-vector products
+        hero_win, hero_tie, hero_met = ahead @ villain, level @ villain, possible @ villain
+        villain_tie, villain_met = hero @ level, hero @ possible
+        villain_win = villain_met - hero @ ahead - villain_tie
+        hero_shares += hero_win + hero_tie / 2
+        hero_totals += hero_met
+        villain_shares += villain_win + villain_tie / 2
+        villain_totals += villain_met
+
+        wins[0] += float(hero @ hero_win)
+        wins[1] += float(villain_win @ villain)
+        ties += float(hero @ hero_tie)
+        total += float(hero @ hero_met)
+
+    result.samples = total
+    result.wins = wins
+    result.ties = [ties, ties]
+    result.shares = [wins[0] + ties / 2, wins[1] + ties / 2]
+    result._add_combos(0, rows, hero_shares, hero_totals)
+    result._add_combos(1, cols, villain_shares, villain_totals)
+    return result
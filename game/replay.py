@@ -0,0 +1,197 @@
+"""
+Deterministic replay of recorded hand histories.
+
+Each logged hand is rebuilt as a Game with the recorded seats, stacks and
+dealer button, dealt the recorded cards, and played through the normal
+play_hand()/betting_round()/execute_action() path with the logged decisions
+standing in for the human and NPC policies. The replayed actions, pot and
+payouts are then checked against the log, so a rule change in
+game/poker_game.py (or a new evaluator) can be regression-tested against a
+large corpus of real sessions.
+"""
+import time
+from game.poker_game import Game
+from game.events import EventSink
+from game.history import HandHistoryReader
+from game.simulation import play_hand
+from models.deck import IndexedDeck
+
+class ReplayDivergence(Exception):
+    """Raised when the replayed game asks for a decision the log does not have."""
+
+class ReplayDeck(IndexedDeck):
+    """An IndexedDeck that deals a fixed card order and never shuffles."""
+
+    def stack(self, deal_order):
+        """
+        Arrange the deck so deal() returns deal_order first, then the other cards.
+
+        Args:
+            deal_order: Card indices in the order they should come out
+        """
+        used = set(deal_order)
+        rest = [i for i in range(len(self.CARDS)) if i not in used]
+        # deal() takes from the end of the permutation
+        self.order = (list(deal_order) + rest)[::-1]
+        self.remaining = len(self.order)
+
+    def shuffle(self):
+        pass
+
+class _Transcript:
+    """Recorder that keeps the replayed actions and payouts in HandRecord layout."""
+
+    def __init__(self):
+        self.actions = []
+        self.winners = []
+
+    def begin_hand(self, game):
+        self.actions = []
+        self.winners = []
+
+    def action(self, game, seat, action, chips):
+        self.actions.append((seat, min(game.round, 3), action, chips, game.pot))
+
+    def end_hand(self, game, winners, amounts):
+        seat_of = {id(p): i for i, p in enumerate(game.players)}
+        self.winners = [(seat_of[id(p)], amount) for p, amount in zip(winners, amounts)]
+
+class ScriptedPolicy:
+    """
+    Plays back the logged decisions of one hand as a betting_round() policy.
+
+    Blinds are posted by the game itself, so only the voluntary actions are
+    scripted. Raises are logged as the chips put in; the raise argument is
+    recovered from the live game as those chips minus the amount to call.
+    """
+
+    def __init__(self, actions):
+        self.actions = [a for a in actions if a[2] not in ("small_blind", "big_blind")]
+        self.position = 0
+
+    def __call__(self, game, valid_actions):
+        if self.position >= len(self.actions):
+            raise ReplayDivergence("game asked for more actions than were logged")
+        seat, _, action, chips, _ = self.actions[self.position]
+        self.position += 1
+        if seat != game.current_player_index:
+            raise ReplayDivergence(f"logged action for seat {seat}, but seat "
+                                   f"{game.current_player_index} is to act")
+        if action == "raise":
+            player = game.players[seat]
+            return action, chips - (game.current_bet - player.current_bet)
+        return action, 0
+
+class ReplayResult:
+    """Outcome of replaying one hand."""
+
+    def __init__(self, hand_id, offset=None):
+        self.hand_id = hand_id
+        # Byte offset of the hand's record in the log (see HandHistoryReader.hand_at)
+        self.offset = offset
+        # Human-readable description of every difference from the log
+        self.mismatches = []
+
+    @property
+    def ok(self):
+        return not self.mismatches
+
+class ReplaySummary:
+    """Aggregate outcome of replaying a hand history file."""
+
+    def __init__(self):
+        self.hands = 0
+        self.elapsed = 0.0
+        # ReplayResult of every hand that did not match its log
+        self.failures = []
+
+    @property
+    def hands_per_second(self):
+        return self.hands / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        """Return a short multi-line text summary."""
+        lines = [f"Replayed {self.hands} hands in {self.elapsed:.2f}s "
+                 f"({self.hands_per_second:.0f} hands/sec), {len(self.failures)} mismatched"]
+        for result in self.failures[:10]:
+            where = f" (byte {result.offset})" if result.offset is not None else ""
+            lines.append(f"hand {result.hand_id}{where}: {'; '.join(result.mismatches)}")
+        return "\n".join(lines)
+
+def replay_hand(record):
+    """
+    Re-execute one logged hand and compare the outcome with the log.
+
+    Args:
+        record: A HandRecord from HandHistoryReader
+
+    Returns:
+        ReplayResult: The hand id, record offset and any mismatches found
+    """
+    result = ReplayResult(record.hand_id, record.offset)
+    transcript = _Transcript()
+    deck = ReplayDeck()
+    game = Game([name for name, _, _ in record.seats], deck=deck, events=EventSink(),
+                human_seat=None, recorder=transcript)
+    for player, (_, stack, _) in zip(game.players, record.seats):
+        player.chips = stack
+    game.dealer_position = record.dealer
+    game.hand_number = record.hand_id - 1
+
+    # Hole cards go round the table twice, then the board is dealt in order
+    holes = [hole for _, _, hole in record.seats]
+    deal_order = [hole[i] for i in range(2) for hole in holes if len(hole) > i]
+    deck.stack(deal_order + list(record.board))
+
+    policy = ScriptedPolicy(record.actions)
+    try:
+        play_hand(game, policy, policy)
+    except ReplayDivergence as error:
+        result.mismatches.append(str(error))
+        return result
+
+    if transcript.actions != record.actions:
+        for logged, replayed in zip(record.actions, transcript.actions):
+            if logged != replayed:
+                result.mismatches.append(f"action {logged} replayed as {replayed}")
+                break
+        else:
+            result.mismatches.append(f"{len(record.actions)} actions logged, "
+                                     f"{len(transcript.actions)} replayed")
+    board = [card.index for card in game.community_cards.cards]
+    if board != record.board:
+        result.mismatches.append(f"board {record.board} replayed as {board}")
+    if transcript.winners != [tuple(w) for w in record.winners]:
+        result.mismatches.append(f"winners {record.winners} replayed as {transcript.winners}")
+
+    # Every stack must end where the log says: start - chips put in + chips won
+    expected = [stack for _, stack, _ in record.seats]
+    for seat, _, _, chips, _ in record.actions:
+        expected[seat] -= chips
+    for seat, amount in record.winners:
+        expected[seat] += amount
+    stacks = [player.chips for player in game.players]
+    if stacks != expected:
+        result.mismatches.append(f"stacks {expected} replayed as {stacks}")
+    return result
+
+def replay_file(path):
+    """
+    Replay every hand in a hand history file.
+
+    Args:
+        path: Path to a file written by HandHistoryWriter
+
+    Returns:
+        ReplaySummary: Hands replayed, elapsed time and the mismatched hands
+    """
+    summary = ReplaySummary()
+    start = time.perf_counter()
+    with HandHistoryReader(path) as reader:
+        for record in reader:
+            result = replay_hand(record)
+            summary.hands += 1
+            if not result.ok:
+                summary.failures.append(result)
+    summary.elapsed = time.perf_counter() - start
+    return summary
@@ -0,0 +1,328 @@
+"""
+asyncio table host.
+
+Runs many tables in one process. Every seat has a policy with the usual
+(game, valid_actions) signature; a policy may also return an awaitable, so a
+human seat can wait for a reply from a socket without blocking the other
+tables. Hands are driven through simulation.hand_steps(), so the rules are
+exactly those of Game.betting_round().
+
+Human players connect over TCP ("host:port") or a Unix socket ("unix:path")
+and speak newline-delimited JSON:
+
+    client -> server   {"name": "Alice"}                    once, on connect
+    server -> client   {"type": "event", "message": "..."}  table narration
+    server -> client   {"type": "prompt", "seq": 7, "valid": [...], "hand": [...], ...}
+    client -> server   {"seq": 7, "action": "raise", "amount": 40}    reply to a prompt
+
+A prompt that gets no reply within the timeout is answered with a check
+when that is allowed and a fold otherwise; so is a malformed reply, and
+every prompt after the connection drops. Every prompt carries a sequence
+number that the reply must echo: a reply that arrives after its prompt
+timed out is dropped instead of being applied to the next decision. A
+client that stops reading its socket for a whole timeout is disconnected.
+"""
+import asyncio
+import inspect
+import json
+import socket
+from game.poker_game import Game
+from game.events import EventSink
+from game.npc import get_npc_action
+from game.simulation import hand_steps
+from models.deck import IndexedDeck
+from utils.rng import RNG
+from config import NUM_PLAYERS
+
+DEFAULT_TIMEOUT = 30.0
+
+def auto_action(valid_actions):
+    """The action taken for a player who does not answer in time: check if possible, else fold."""
+    return ("check", 0) if "check" in valid_actions else ("fold", 0)
+
+def parse_address(address):
+    """Split "host:port" or "unix:path" into ("tcp", (host, port)) or ("unix", path)."""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+async def play_hand_async(game, policies):
+    """
+    Play one hand, awaiting the decisions of seats whose policy is asynchronous.
+
+    Args:
+        game: The game to play on
+        policies: Dict mapping each Player to its policy
+
+    Returns:
+        list: The player(s) who won the pot
+    """
+    steps = hand_steps(game)
+    try:
+        player, valid_actions = next(steps)
+        while True:
+            decision = policies[player](game, valid_actions)
+            if inspect.isawaitable(decision):
+                decision = await decision
+            player, valid_actions = steps.send(decision)
+    except StopIteration as done:
+        return done.value
+
+class RemoteSeat:
+    """A human player on the other end of a stream, usable as an async policy."""
+
+    def __init__(self, reader, writer, timeout=DEFAULT_TIMEOUT):
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.closed = False
+        # Prompts answered automatically because the player ran out of time
+        self.timeouts = 0
+        # Sequence number of the last prompt sent
+        self.seq = 0
+        # Late replies to earlier prompts that were dropped
+        self.stale_replies = 0
+
+    def send(self, message):
+        if self.closed:
+            return
+        try:
+            self.writer.write((json.dumps(message) + "\n").encode("utf-8"))
+        except (ConnectionError, RuntimeError):
+            self.closed = True
+
+    async def _read_reply(self):
+        # The next line answering the current prompt; replies to earlier prompts are skipped
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                return line
+            try:
+                reply = json.loads(line)
+                if isinstance(reply, dict) and reply.get("seq") != self.seq:
+                    self.stale_replies += 1
+                    continue
+            except ValueError:
+                pass
+            return line
+
+    async def __call__(self, game, valid_actions):
+        if self.closed:
+            return auto_action(valid_actions)
+        player = game.players[game.current_player_index]
+        self.seq += 1
+        self.send({
+            "type": "prompt",
+            "seq": self.seq,
+            "valid": valid_actions,
+            "hand": [str(card) for card in player.hand.cards],
+            "board": [str(card) for card in game.community_cards.cards],
+            "pot": game.pot,
+            "chips": player.chips,
+            "to_call": game.current_bet - player.current_bet,
+            "min_raise": game.current_bet * 2 - player.current_bet,
+            "timeout": self.timeout,
+        })
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.timeout)
+        except asyncio.TimeoutError:
+            # The client is not reading its socket; stop writing to it
+            self.closed = True
+            return auto_action(valid_actions)
+        except ConnectionError:
+            self.closed = True
+            return auto_action(valid_actions)
+        try:
+            line = await asyncio.wait_for(self._read_reply(), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            action = auto_action(valid_actions)
+            self.send({"type": "event", "message": f"Out of time: auto-{action[0]}."})
+            return action
+        except (ConnectionError, asyncio.IncompleteReadError):
+            line = b""
+        if not line:
+            self.closed = True
+            return auto_action(valid_actions)
+        try:
+            reply = json.loads(line)
+            action, amount = reply["action"], int(reply.get("amount", 0))
+        except (ValueError, KeyError, TypeError):
+            return auto_action(valid_actions)
+        if action not in valid_actions:
+            return auto_action(valid_actions)
+        return action, amount
+
+class SeatSink(EventSink):
+    """Sends a table's narration to every human seated at it."""
+
+    def __init__(self):
+        self.seats = []
+
+    def emit(self, message):
+        for seat in self.seats:
+            seat.send({"type": "event", "message": message})
+
+class Table:
+    """One game hosted by a TableHost."""
+
+    def __init__(self, table_id, names, policies, human_seat=None, max_hands=None, events=None, rng=None):
+        """
+        Args:
+            table_id: Identifier used in logs
+            names: Player names in seat order
+            policies: Policy per seat, in the same order
+            human_seat: Seat of the human player, if any
+            max_hands: Stop after this many hands (default: play until one player is left)
+            events: Optional event sink for narration; defaults to discarding everything
+            rng: Random stream for the table's deck and NPCs; defaults to the random module
+        """
+        self.table_id = table_id
+        self.game = Game(names, deck=IndexedDeck(rng), events=events or EventSink(), human_seat=human_seat,
+                         rng=rng)
+        self.policies = dict(zip(self.game.players, policies))
+        self.max_hands = max_hands
+        self.hands_played = 0
+
+    async def run(self):
+        """Play hands until one player is left, the hand limit is reached, or every human has gone."""
+        game = self.game
+        humans = [p for p in game.players if p.is_human]
+        while len(game.players) > 1 and (self.max_hands is None or self.hands_played < self.max_hands):
+            if humans and not any(p in game.players and not getattr(self.policies[p], "closed", False)
+                                  for p in humans):
+                break
+            await play_hand_async(game, self.policies)
+            self.hands_played += 1
+            for player in game.end_hand():
+                game.events.emit(f"{player.name} is out of chips.")
+            # Let other tables and sockets run between hands
+            await asyncio.sleep(0)
+        return self
+
+class TableHost:
+    """Hosts any number of NPC tables plus one table per connecting human."""
+
+    def __init__(self, players_per_table=NUM_PLAYERS, npc_policy=get_npc_action, timeout=DEFAULT_TIMEOUT,
+                 max_hands=None, seed=None):
+        """
+        Args:
+            players_per_table: Seats at every table
+            npc_policy: Policy used for every NPC seat
+            timeout: Seconds a human has to answer each prompt
+            max_hands: Hand limit per table (default: play until one player is left)
+            seed: Root seed; every table gets its own child stream of it (default: a fresh seed)
+        """
+        self.rng = RNG(seed)
+        self.tables_opened = 0
+        self.players_per_table = players_per_table
+        self.npc_policy = npc_policy
+        self.timeout = timeout
+        self.max_hands = max_hands
+        self.tables = []
+
+    def _npc_names(self, count):
+        return [f"Player {i+1}" for i in range(count)]
+
+    def _open_table(self, names, policies, **kwargs):
+        # Table ids are never reused, so neither are the tables' random streams
+        table_id = self.tables_opened
+        self.tables_opened += 1
+        table = Table(table_id, names, policies, max_hands=self.max_hands, rng=self.rng.child("table", table_id),
+                      **kwargs)
+        self.tables.append(table)
+        return table
+
+    def add_npc_table(self):
+        """Create an all-NPC table (run it with run_tables() or serve())."""
+        names = self._npc_names(self.players_per_table)
+        return self._open_table(names, [self.npc_policy] * len(names))
+
+    async def run_tables(self):
+        """Run every table created so far to completion."""
+        return await asyncio.gather(*(table.run() for table in self.tables))
+
+    async def handle_connection(self, reader, writer):
+        """Seat a connecting human at a new table with NPCs and play until they leave or bust."""
+        try:
+            hello = json.loads(await asyncio.wait_for(reader.readline(), self.timeout))
+            name = str(hello.get("name") or "Human")[:32]
+        except (asyncio.TimeoutError, ValueError, AttributeError, ConnectionError):
+            writer.close()
+            return
+        seat = RemoteSeat(reader, writer, self.timeout)
+        sink = SeatSink()
+        sink.seats.append(seat)
+        names = [name] + self._npc_names(self.players_per_table)[1:]
+        policies = [seat] + [self.npc_policy] * (len(names) - 1)
+        table = self._open_table(names, policies, human_seat=0, events=sink)
+        try:
+            await table.run()
+            seat.send({"type": "event", "message": "Table closed."})
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.tables.remove(table)
+            writer.close()
+
+    async def start(self, address):
+        """
+        Start accepting human players without waiting.
+
+        Args:
+            address: "host:port" or "unix:path"
+
+        Returns:
+            asyncio.Server: The listening server
+        """
+        kind, where = parse_address(address)
+        if kind == "unix":
+            return await asyncio.start_unix_server(self.handle_connection, where)
+        return await asyncio.start_server(self.handle_connection, *where)
+
+    async def serve(self, address):
+        """Accept human players forever while the NPC tables run alongside."""
+        server = await self.start(address)
+        async with server:
+            npc_tables = asyncio.ensure_future(self.run_tables())
+            try:
+                await server.serve_forever()
+            finally:
+                npc_tables.cancel()
+
+def run_client(address, name="Human"):
+    """
+    Play at a TableHost from the terminal: prints the narration and prompts for actions.
+
+    Args:
+        address: "host:port" or "unix:path"
+        name: Player name to sit down with
+    """
+    kind, where = parse_address(address)
+    if kind == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.connect(where)
+    stream = sock.makefile("rwb")
+    stream.write((json.dumps({"name": name}) + "\n").encode("utf-8"))
+    stream.flush()
+    for line in stream:
+        message = json.loads(line)
+        if message["type"] == "event":
+            print(message["message"])
+            continue
+        print(f"\nYour hand: {', '.join(message['hand'])}   Board: {', '.join(message['board']) or '-'}")
+        print(f"Pot: {message['pot']}  Chips: {message['chips']}  To call: {message['to_call']}  "
+              f"({message['timeout']:g}s to act)")
+        reply = input(f"Action ({'/'.join(message['valid'])}, 'raise N'): ").split()
+        action = reply[0] if reply else "fold"
+        amount = int(reply[1]) if len(reply) > 1 and reply[1].isdigit() else message["min_raise"]
+        reply = {"seq": message["seq"], "action": action, "amount": amount}
+        stream.write((json.dumps(reply) + "\n").encode("utf-8"))
+        stream.flush()
+    sock.close()
@@ -0,0 +1,172 @@
+"""
+Headless batch simulation.
+
+Plays complete hands with every seat driven by an NPC policy and no terminal
+I/O, carrying chip stacks from hand to hand, eliminating busted players and
+rotating the dealer button.
+"""
+import time
+from game.poker_game import Game
+from game.events import EventSink
+from game.npc import get_npc_action
+from models.deck import IndexedDeck
+from config import NUM_PLAYERS
+
+class SimulationResult:
+    """Aggregate results of a batch of simulated hands."""
+    
+    def __init__(self, player_names):
+        self.hands_played = 0
+        self.elapsed = 0.0
+        # Chip count of every starting player after each hand (0 once busted)
+        self.chip_history = {name: [] for name in player_names}
+        # Names of the winner(s) of each hand
+        self.hand_winners = []
+        # (hand number, player name) for each elimination, in order
+        self.eliminations = []
+        # Last player standing, if the table played down to one player
+        self.champion = None
+        # Rejected actions and fallback actions played, per player name
+        self.rejected_actions = {}
+        self.fallback_actions = {}
+        
+    @property
+    def hands_per_second(self):
+        return self.hands_played / self.elapsed if self.elapsed > 0 else 0.0
+        
+    def win_counts(self):
+        """Return how many hands each player won (split pots count for every winner)."""
+        counts = {name: 0 for name in self.chip_history}
+        for winners in self.hand_winners:
+            for name in winners:
+                counts[name] += 1
+        return counts
+        
+    def final_chips(self):
+        """Return each starting player's chip count after the last hand."""
+        return {name: history[-1] if history else 0 for name, history in self.chip_history.items()}
+        
+    def summary(self):
+        """Return a short multi-line text summary."""
+        lines = [f"Hands played: {self.hands_played} in {self.elapsed:.2f}s "
+                 f"({self.hands_per_second:.0f} hands/sec)"]
+        wins = self.win_counts()
+        for name, chips in self.final_chips().items():
+            lines.append(f"{name}: {chips} chips, {wins[name]} hands won")
+        if self.champion:
+            lines.append(f"Last player standing: {self.champion}")
+        if self.rejected_actions:
+            lines.append(f"Rejected actions: {sum(self.rejected_actions.values())} "
+                         f"({sum(self.fallback_actions.values())} fallbacks played)")
+        return "\n".join(lines)
+
+def hand_steps(game):
+    """
+    One complete hand from deal to payout, as a generator.
+    
+    Yields (player, valid_actions) for every decision and expects an
+    (action, amount) pair to be sent back (see Game.betting_steps()). Its
+    return value (the StopIteration value) is the list of winners.
+    """
+    game.start_hand()
+    game.events.emit("=== NEW HAND ===")
+    game.deal_cards()
+    game.post_blinds()
+    
+    # Pre-flop action starts with the player after the big blind
+    game.current_player_index = (game.dealer_position + 3) % len(game.players)
+    hand_over = not (yield from game.betting_steps())
+    
+    # Flop, Turn, and River
+    for _ in range(3):
+        if hand_over:
+            break
+        game.next_round()
+        hand_over = not (yield from game.betting_steps())
+        
+    if hand_over:
+        # Everyone else folded
+        winners = [p for p in game.players if not p.is_folded]
+    else:
+        winners = game.determine_winner()
+        
+    pot = game.pot
+    game.award_pot(winners)
+    game.events.emit(f"{', '.join(p.name for p in winners)} won the pot of {pot} chips.")
+    return winners
+
+def play_hand(game, func_get_npc_action=get_npc_action, func_get_human_action=None):
+    """
+    Play one complete hand from deal to payout.
+    
+    Args:
+        game: The game to play on; every seat should be an NPC unless a human action function is given
+        func_get_npc_action: Policy used for NPC decisions
+        func_get_human_action: Policy used for human seats, if any
+        
+    Returns:
+        list: The player(s) who won the pot
+    """
+    steps = hand_steps(game)
+    try:
+        player, valid_actions = next(steps)
+        while True:
+            if player.is_human:
+                decision = func_get_human_action(game, valid_actions)
+            else:
+                decision = func_get_npc_action(game, valid_actions)
+            player, valid_actions = steps.send(decision)
+    except StopIteration as done:
+        return done.value
+
+def run_simulation(num_hands, num_players=NUM_PLAYERS, func_get_npc_action=get_npc_action, events=None,
+                   profiler=None, report_every=0, on_report=print, recorder=None, rng=None):
+    """
+    Play up to num_hands hands at an all-NPC table, stopping early if one player has all the chips.
+    
+    Args:
+        num_hands: Maximum number of hands to play
+        num_players: Number of seats at the table
+        func_get_npc_action: Policy used for every seat
+        events: Optional event sink for narration; defaults to discarding everything
+        profiler: Optional Profiler; when given, per-phase timings are recorded into it
+        report_every: With a profiler, pass its summary to on_report every this many hands
+        on_report: Function receiving the periodic profile summaries
+        recorder: Optional hand history recorder (e.g. a HandHistoryWriter)
+        rng: Random stream for the deck and the NPCs (e.g. a utils.rng.RNG); defaults to the random module
+        
+    Returns:
+        SimulationResult: Aggregate results of the run
+    """
+    player_names = [f"Player {i+1}" for i in range(num_players)]
+    game = Game(player_names, deck=IndexedDeck(rng), events=events or EventSink(), human_seat=None,
+                recorder=recorder, rng=rng)
+    result = SimulationResult(player_names)
+    if profiler is not None:
+        game.enable_profiling(profiler)
+    
+    start = time.perf_counter()
+    while result.hands_played < num_hands and len(game.players) > 1:
+        winners = play_hand(game, func_get_npc_action)
+        result.hands_played += 1
+        result.hand_winners.append([p.name for p in winners])
+        
+        for player in game.end_hand():
+            result.eliminations.append((result.hands_played, player.name))
+            game.events.emit(f"{player.name} is out of chips.")
+            
+        chips = {p.name: p.chips for p in game.players}
+        for name, history in result.chip_history.items():
+            history.append(chips.get(name, 0))
+            
+        if profiler is not None and report_every and result.hands_played % report_every == 0:
+            on_report(f"--- profile after {result.hands_played} hands ---\n{profiler.summary()}")
+    result.elapsed = time.perf_counter() - start
+    result.rejected_actions = dict(game.rejected_actions)
+    result.fallback_actions = dict(game.fallback_actions)
+    if profiler is not None:
+        game.disable_profiling()
+    
+    if len(game.players) == 1:
+        result.champion = game.players[0].name
+    return result
@@ -0,0 +1,275 @@
+"""
+Flat, cheaply copied game state for lookahead search.
+
+A GameState holds everything a betting decision depends on as plain ints and
+tuples: per-seat chips and bets, pot, current bet, seat bitmasks, hole cards,
+board and the undealt deck as card indices. Forking a state copies two short
+lists; everything else is shared between parent and child, since tuples and
+ints are never modified in place.
+
+apply() runs an action through the same rules as Game.execute_action() and
+Game.betting_round(): it handles raises, round completion, skipping folded
+and all-in seats, dealing the next street and the showdown, and returns the
+child state at the next decision (or the end of the hand).
+"""
+from models.card import Card
+from models.hand import Hand
+from game import evaluator
+
+class GameState:
+    """One decision point of a hand, in a flat form that forks in microseconds."""
+
+    __slots__ = ('chips', 'bets', 'pot', 'current_bet', 'to_act', 'street', 'dealer',
+                 'active_mask', 'all_in_mask', 'acted', 'matched',
+                 'holes', 'board', 'deck', 'deck_remaining', 'terminal', 'winners')
+
+    def copy(self):
+        """Fork the state; the only mutable fields (chips, bets) are copied."""
+        child = GameState.__new__(GameState)
+        child.chips = self.chips[:]
+        child.bets = self.bets[:]
+        child.pot = self.pot
+        child.current_bet = self.current_bet
+        child.to_act = self.to_act
+        child.street = self.street
+        child.dealer = self.dealer
+        child.active_mask = self.active_mask
+        child.all_in_mask = self.all_in_mask
+        child.acted = self.acted
+        child.matched = self.matched
+        child.holes = self.holes
+        child.board = self.board
+        child.deck = self.deck
+        child.deck_remaining = self.deck_remaining
+        child.terminal = self.terminal
+        child.winners = self.winners
+        return child
+
+    @classmethod
+    def from_game(cls, game, acted=None):
+        """
+        Snapshot a Game at the current player's decision.
+
+        Args:
+            game: The game to snapshot
+            acted: Bitmask of seats that have acted since the last raise;
+                   defaults to the one betting_round() keeps on the game
+
+        Returns:
+            GameState: The snapshot
+        """
+        state = cls.__new__(cls)
+        players = game.players
+        state.chips = [p.chips for p in players]
+        state.bets = [p.current_bet for p in players]
+        state.pot = game.pot
+        state.current_bet = game.current_bet
+        state.to_act = game.current_player_index
+        state.street = game.round
+        state.dealer = game.dealer_position
+        game.refresh_seat_masks()
+        state.active_mask = game.active_mask
+        state.all_in_mask = game.all_in_mask
+        state.acted = game.acted_mask if acted is None else acted
+        state.matched = game.matched_mask()
+        state.holes = tuple(tuple(p.hand.get_indices()) for p in players)
+        state.board = tuple(game.community_cards.get_indices())
+        # Undealt cards, next card to be dealt last (the layout both decks use)
+        deck = game.deck
+        if hasattr(deck, "order"):
+            state.deck = tuple(deck.order[:deck.remaining])
+        else:
+            state.deck = tuple(card.index for card in deck.cards)
+        state.deck_remaining = len(state.deck)
+        state.terminal = False
+        state.winners = None
+        return state
+
+    def with_cards(self, holes, deck):
+        """
+        Fork the state with different hidden cards (e.g. a determinization).
+
+        Args:
+            holes: Hole card indices per seat
+            deck: Undealt card indices, next card to be dealt last
+        """
+        child = self.copy()
+        child.holes = tuple(tuple(hole) for hole in holes)
+        child.deck = tuple(deck)
+        child.deck_remaining = len(child.deck)
+        return child
+
+    @property
+    def num_seats(self):
+        return len(self.chips)
+
+    def valid_actions(self):
+        """Valid actions for the seat to act, the same list Game.get_valid_actions() gives."""
+        if self.terminal:
+            return []
+        seat = self.to_act
+        bit = 1 << seat
+        if not self.active_mask & bit or self.all_in_mask & bit:
+            return []
+        bet = self.bets[seat]
+        actions = ["fold"]
+        if bet == self.current_bet:
+            actions.append("check")
+        if bet < self.current_bet and self.chips[seat] > 0:
+            actions.append("call")
+        if self.chips[seat] >= self.current_bet * 2 - bet:
+            actions.append("raise")
+        return actions
+
+    def apply(self, action, amount=0):
+        """
+        Play one action for the seat to act and return the resulting state.
+
+        Args:
+            action: "fold", "check", "call" or "raise"
+            amount: The raise above the amount to call, as for Game.execute_action()
+
+        Returns:
+            GameState: The next decision point, or the finished hand (terminal)
+
+        Raises:
+            ValueError: If the game would reject the action
+        """
+        if self.terminal:
+            raise ValueError("The hand is over")
+        child = self.copy()
+        seat = child.to_act
+        bit = 1 << seat
+        previous_bet = child.current_bet
+        child._execute(seat, action, amount)
+
+        if action == "raise":
+            child.acted &= ~child.active_mask | child.all_in_mask
+            child.matched = 0 if child.current_bet > previous_bet else child._matched_mask()
+        child.acted |= bit
+        if child.bets[seat] == child.current_bet:
+            child.matched |= bit
+        else:
+            child.matched &= ~bit
+
+        active = child.active_mask
+        if active & (active - 1) == 0:
+            child._finish([(active & -active).bit_length() - 1])
+        elif child._round_complete() or not child._next_seat():
+            child._next_street()
+        else:
+            child._advance()
+        return child
+
+    def _execute(self, seat, action, amount):
+        """Apply an action to this state in place, mirroring Game.execute_action()."""
+        bit = 1 << seat
+        if action == "fold":
+            self.active_mask &= ~bit
+        elif action == "check":
+            if self.bets[seat] != self.current_bet:
+                raise ValueError(f"Invalid check: seat {seat} must match the current bet")
+        elif action == "call":
+            to_call = self.current_bet - self.bets[seat]
+            if to_call > 0:
+                self._put_in(seat, to_call)
+        elif action == "raise":
+            total = self.current_bet - self.bets[seat] + amount
+            if total <= 0 or self.chips[seat] < total:
+                raise ValueError(f"Invalid raise: seat {seat} doesn't have enough chips")
+            self._put_in(seat, total)
+            self.current_bet = self.bets[seat]
+        else:
+            raise ValueError(f"Invalid action: {action}")
+
+    def _put_in(self, seat, amount):
+        """Move chips from a seat to the pot, going all-in as Player.place_bet() does."""
+        if amount >= self.chips[seat]:
+            amount = self.chips[seat]
+            self.all_in_mask |= 1 << seat
+        self.chips[seat] -= amount
+        self.bets[seat] += amount
+        self.pot += amount
+
+    def _matched_mask(self):
+        mask = 0
+        for seat, bet in enumerate(self.bets):
+            if bet == self.current_bet:
+                mask |= 1 << seat
+        return mask
+
+    def _round_complete(self):
+        return self.active_mask & ~(self.acted & (self.matched | self.all_in_mask)) == 0
+
+    def _next_seat(self):
+        """Move to the next seat still in the hand; False if there isn't one (Game.next_active_player())."""
+        active = self.active_mask
+        if active & (active - 1) == 0:
+            return False
+        seat = self.to_act
+        later = active >> (seat + 1) << (seat + 1)
+        ring = later or active
+        next_seat = (ring & -ring).bit_length() - 1
+        if next_seat == seat:
+            return False
+        self.to_act = next_seat
+        return True
+
+    def _advance(self):
+        """Skip seats that cannot act, as betting_round() does, until someone has a decision."""
+        while not self.terminal:
+            bit = 1 << self.to_act
+            if self.active_mask & bit and not self.all_in_mask & bit:
+                return
+            self.acted |= bit
+            if self._round_complete() or not self._next_seat():
+                self._next_street()
+
+    def _next_street(self):
+        """Close the betting round: deal the next street (Game.next_round()) or go to showdown."""
+        if self.street >= 3:
+            self._showdown()
+            return
+        self.street += 1
+        self.current_bet = 0
+        self.bets = [0] * len(self.bets)
+        count = 3 if self.street == 1 else 1
+        end = self.deck_remaining
+        dealt = self.deck[max(end - count, 0):end][::-1]
+        self.deck_remaining = end - len(dealt)
+        self.board = self.board + tuple(dealt)
+        self.to_act = (self.dealer + 1) % len(self.chips)
+        self.acted = 0
+        self.matched = (1 << len(self.chips)) - 1
+        self._advance()
+
+    def _showdown(self):
+        """Pick the winners the way Game.determine_winner() does."""
+        seats = [s for s in range(len(self.chips)) if self.active_mask >> s & 1]
+        if len(seats) == 1:
+            self._finish(seats)
+            return
+        strengths = {s: evaluator.evaluate_indices(self.holes[s] + self.board) for s in seats}
+        best = max(strengths.values())
+        tied = [s for s in seats if strengths[s] == best]
+        if len(tied) > 1:
+            # Exactly equal hands fall back to the suit tiebreaker
+            scores = {}
+            for s in tied:
+                cards = [Card.DECK[i] for i in self.holes[s] + self.board]
+                best_hand = Hand()
+                for card in evaluator.best_five(cards, best):
+                    best_hand.add_card(card)
+                scores[s] = best_hand.calculate_score(evaluator.hand_rank(best))
+            top = max(scores.values())
+            tied = [s for s in tied if scores[s] == top]
+        self._finish(tied)
+
+    def _finish(self, winners):
+        """End the hand and pay the pot out like Game.award_pot()."""
+        self.terminal = True
+        self.winners = winners
+        share, odd_chips = divmod(self.pot, len(winners))
+        for i, seat in enumerate(winners):
+            self.chips[seat] += share + (1 if i < odd_chips else 0)
+        self.pot = 0
@@ -0,0 +1,147 @@
+"""
+Multi-process tournament runner.
+
+Plays independent last-player-standing tournaments (every seat an NPC, one
+buy-in each) and spreads them over a ProcessPoolExecutor. Tournament t plays
+on its own child stream of the base seed (see utils.rng), so merged results
+don't depend on how many workers ran them.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from game import evaluator
+from game.simulation import run_simulation
+from game.poker_game import StalledRoundError
+from utils.rng import RNG
+from config import NUM_PLAYERS
+
+# Safety cap so a tournament that never converges can't stall a worker
+MAX_HANDS_PER_TOURNAMENT = 10000
+
+class TournamentStats:
+    """Statistics for a batch of tournaments; batches from different workers can be merged."""
+    
+    def __init__(self, num_players=NUM_PLAYERS):
+        self.num_players = num_players
+        self.tournaments = 0
+        # Tournaments that hit the hand cap without a single winner
+        self.unfinished = 0
+        # Tournaments abandoned because a betting round stalled
+        self.stalled = 0
+        # Rejected actions and fallback actions played, over every tournament
+        self.rejected_actions = 0
+        self.fallback_actions = 0
+        # Tournament wins per seat
+        self.wins = [0] * num_players
+        # Eliminations per seat (a seat busts at most once per tournament)
+        self.busts = [0] * num_players
+        # Number of hands each finished tournament took
+        self.hands_to_finish = []
+        self.total_hands = 0
+        self.elapsed = 0.0
+        
+    def record(self, result):
+        """Add one tournament's SimulationResult."""
+        self.tournaments += 1
+        self.total_hands += result.hands_played
+        self.rejected_actions += sum(result.rejected_actions.values())
+        self.fallback_actions += sum(result.fallback_actions.values())
+        for _, name in result.eliminations:
+            self.busts[self.seat_of(name)] += 1
+        if result.champion:
+            self.wins[self.seat_of(result.champion)] += 1
+            self.hands_to_finish.append(result.hands_played)
+        else:
+            self.unfinished += 1
+            
+    def merge(self, other):
+        """Fold another TournamentStats into this one."""
+        self.tournaments += other.tournaments
+        self.unfinished += other.unfinished
+        self.stalled += other.stalled
+        self.rejected_actions += other.rejected_actions
+        self.fallback_actions += other.fallback_actions
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.busts = [a + b for a, b in zip(self.busts, other.busts)]
+        self.hands_to_finish.extend(other.hands_to_finish)
+        self.total_hands += other.total_hands
+        return self
+        
+    @staticmethod
+    def seat_of(name):
+        # Simulation players are named "Player 1" .. "Player N" in seat order
+        return int(name.rsplit(" ", 1)[1]) - 1
+        
+    def average_hands(self):
+        if not self.hands_to_finish:
+            return 0.0
+        return sum(self.hands_to_finish) / len(self.hands_to_finish)
+        
+    def summary(self):
+        """Return a short multi-line text summary."""
+        rate = self.total_hands / self.elapsed if self.elapsed > 0 else 0.0
+        lines = [f"Tournaments: {self.tournaments} ({self.unfinished} unfinished), "
+                 f"{self.total_hands} hands in {self.elapsed:.2f}s ({rate:.0f} hands/sec)",
+                 f"Average hands to finish: {self.average_hands():.1f}",
+                 f"Rejected actions: {self.rejected_actions} ({self.fallback_actions} fallbacks played), "
+                 f"{self.stalled} tournaments stalled"]
+        for seat in range(self.num_players):
+            lines.append(f"Seat {seat + 1}: {self.wins[seat]} wins, {self.busts[seat]} busts")
+        return "\n".join(lines)
+
+def tournament_rng(base_seed, index):
+    """Independent random stream for tournament number index."""
+    return RNG(base_seed).child("tournament", index)
+
+def run_shard(base_seed, start, count, num_players=NUM_PLAYERS):
+    """
+    Play tournaments start .. start+count-1 in this process.
+    
+    Returns:
+        TournamentStats: Statistics for this shard
+    """
+    stats = TournamentStats(num_players)
+    for index in range(start, start + count):
+        try:
+            stats.record(run_simulation(MAX_HANDS_PER_TOURNAMENT, num_players,
+                                        rng=tournament_rng(base_seed, index)))
+        except StalledRoundError:
+            # One broken table must not take the whole worker down with it
+            stats.tournaments += 1
+            stats.stalled += 1
+    return stats
+
+def run_tournaments(num_tournaments, workers=None, seed=0, num_players=NUM_PLAYERS):
+    """
+    Play num_tournaments tournaments across worker processes and merge their statistics.
+    
+    Args:
+        num_tournaments: Number of independent tournaments to play
+        workers: Number of worker processes (defaults to the CPU count; 1 runs in-process)
+        seed: Base seed; the same seed gives the same merged results for any worker count
+        num_players: Seats per tournament
+        
+    Returns:
+        TournamentStats: Merged statistics
+    """
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    stats = TournamentStats(num_players)
+    
+    if workers == 1 or num_tournaments <= 1:
+        stats.merge(run_shard(seed, 0, num_tournaments, num_players))
+    else:
+        # A few shards per worker keeps every core busy when tournament lengths vary
+        num_shards = min(num_tournaments, workers * 4)
+        bounds = [num_tournaments * i // num_shards for i in range(num_shards + 1)]
+        # Write the evaluator table file once, before the workers map it
+        evaluator.build_tables()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_shard, seed, bounds[i], bounds[i + 1] - bounds[i], num_players)
+                       for i in range(num_shards)]
+            # Merge in submission order so results don't depend on completion order
+            for future in futures:
+                stats.merge(future.result())
+                
+    stats.elapsed = time.perf_counter() - start_time
+    return stats
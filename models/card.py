@@ -1,6 +1,10 @@
 """
 Card class for representing a playing card.
 """
+from config import CARD_VALUES, CARD_SUITS
+
+# One prime per rank (2 through A); the product of a hand's primes identifies its ranks
+RANK_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
 
 class Card:
     # Suit emojis for better display
@@ -10,14 +14,50 @@ class Card:
         'Clubs': '♣️',
         'Spades': '♠️'
     }
-    
-    def __init__(self, suit, value):
-        self.suit = suit
-        self.value = value
-    
+
+    # No per-instance dict; all 52 cards are created once and shared
+    __slots__ = ('suit', 'value', 'rank', 'suit_index', 'index', 'bit', 'prime', 'code')
+
+    # Interned cards, keyed by (suit, value) and by index
+    _interned = {}
+    DECK = ()
+
+    def __new__(cls, suit, value):
+        card = cls._interned.get((suit, value))
+        if card is not None:
+            return card
+        if suit not in CARD_SUITS or value not in CARD_VALUES:
+            raise ValueError(f"Unknown card: {value} of {suit}")
+
+        card = super().__new__(cls)
+        card.suit = suit
+        card.value = value
+        # Integer identity, computed once
+        card.rank = CARD_VALUES[value]            # 2-14
+        card.suit_index = CARD_SUITS.index(suit)  # 0-3, same order as SUIT_VALUES
+        card.index = card.suit_index * 13 + card.rank - 2  # 0-51, fresh deck order
+        card.bit = 1 << (card.rank - 2)           # rank bitmask
+        card.prime = RANK_PRIMES[card.rank - 2]
+        # Packed as: rank bit (16-28) | suit bit (12-15) | rank 0-12 (8-11) | prime (0-7)
+        card.code = (card.bit << 16) | (1 << (12 + card.suit_index)) | ((card.rank - 2) << 8) | card.prime
+        cls._interned[(suit, value)] = card
+        return card
+
+    @classmethod
+    def from_index(cls, index):
+        """Return the shared Card for an index 0-51."""
+        return cls.DECK[index]
+
+    def __reduce__(self):
+        # Unpickling and copying hand back the shared instance
+        return (Card, (self.suit, self.value))
+
     def __str__(self):
         suit_symbol = self.SUIT_SYMBOLS.get(self.suit, self.suit)
         return f"{self.value}{suit_symbol}"
-    
+
     def __repr__(self):
-        return self.__str__() 
\ No newline at end of file
+        return self.__str__()
+
+# Build the 52 shared cards in fresh-deck order (index order)
+Card.DECK = tuple(Card(suit, value) for suit in CARD_SUITS for value in CARD_VALUES)
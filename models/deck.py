@@ -3,19 +3,97 @@ Deck class for representing a deck of cards.
 """
 import random
 from .card import Card
-from config import CARD_SUITS, CARD_VALUES
+from utils.rng import RNG
 
 class Deck:
-    def __init__(self):
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng: Random stream to shuffle with (e.g. a utils.rng.RNG); defaults to the random module
+        """
+        self.rng = rng if rng is not None else random
         self.cards = []
         self.reset()
         
     def reset(self):
-        self.cards = [Card(suit, value) for suit in CARD_SUITS for value in CARD_VALUES.keys()]
+        # Reuse the 52 shared Card objects instead of building new ones
+        self.cards = list(Card.DECK)
         
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
         
     def deal(self):
         if len(self.cards) > 0:
-            return self.cards.pop() 
\ No newline at end of file
+            return self.cards.pop()
+        
+    def deal_many(self, count):
+        """Deal up to count cards at once, in the same order deal() would."""
+        dealt = self.cards[-count:][::-1] if count > 0 else []
+        del self.cards[len(self.cards) - len(dealt):]
+        return dealt
+
+class IndexedDeck:
+    """
+    Allocation-free deck for long simulations.
+    
+    Keeps the shared 52-card table fixed and shuffles a permutation of card
+    indices in place. Dealing moves a cursor down the permutation instead of
+    popping from a list, and reset() just rewinds the cursor. Deals cards in
+    the same order as Deck: the last entry of `cards` comes out first.
+    
+    Given an RNG with bulk shuffling, a full shuffle takes the next of the
+    permutations it pre-generated with NumPy.
+    """
+    CARDS = Card.DECK
+    
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng: Random stream to shuffle with (e.g. a utils.rng.RNG); defaults to the random module
+        """
+        self.rng = rng if rng is not None else random
+        self.order = list(range(len(self.CARDS)))
+        self.remaining = len(self.order)
+        
+    @property
+    def cards(self):
+        """The undealt cards, next card to be dealt last (same layout as Deck.cards)."""
+        return [self.CARDS[i] for i in self.order[:self.remaining]]
+        
+    def reset(self):
+        """Put every dealt card back; the permutation is kept until the next shuffle."""
+        self.remaining = len(self.order)
+        
+    def shuffle(self):
+        """Shuffle the undealt cards in place."""
+        if self.remaining == len(self.order):
+            if isinstance(self.rng, RNG):
+                self.order = self.rng.permutation(len(self.order))
+            else:
+                self.rng.shuffle(self.order)
+        else:
+            undealt = self.order[:self.remaining]
+            self.rng.shuffle(undealt)
+            self.order[:self.remaining] = undealt
+        
+    def deal(self):
+        if self.remaining > 0:
+            self.remaining -= 1
+            return self.CARDS[self.order[self.remaining]]
+        
+    def deal_index(self):
+        """Deal the next card as its 0-51 index (None once the deck is empty)."""
+        if self.remaining > 0:
+            self.remaining -= 1
+            return self.order[self.remaining]
+        
+    def deal_many(self, count):
+        """Deal up to count cards at once, in the same order deal() would."""
+        return [self.CARDS[i] for i in self.deal_indices(count)]
+        
+    def deal_indices(self, count):
+        """Deal up to count cards at once as 0-51 indices."""
+        start = max(self.remaining - count, 0)
+        dealt = self.order[start:self.remaining][::-1]
+        self.remaining = start
+        return dealt
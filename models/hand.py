@@ -1,23 +1,53 @@
 """
 Hand class for representing a player's poker hand.
 """
-from config import CARD_VALUES, SUIT_VALUES
+from models import strength
+
+# One base-5 digit per rank (2 -> 5**0 ... A -> 5**12); summing them gives a key
+# that identifies the multiset of ranks in a hand (see models.strength)
+RANK_KEYS = [5 ** r for r in range(13)]
 
 class Hand:
     def __init__(self):
         self.cards = []
+        self.reset_state()
+    
+    def reset_state(self):
+        """Reset the running summary that add_card() keeps up to date."""
+        self.rank_counts = [0] * 13      # histogram indexed by rank - 2
+        self.suit_masks = [0, 0, 0, 0]   # rank bits held in each suit (flushes)
+        self.rank_mask = 0               # every rank held (straights)
+        self.rank_key = 0                # sum of RANK_KEYS over the cards
+        self.suit_counts = 0             # 4-bit card count per suit
+        self._classification = None      # cached by classify()
     
     def add_card(self, card):
         self.cards.append(card)
+        # O(1) update of the running summary, so strength never needs a rescan
+        self.rank_counts[card.rank - 2] += 1
+        self.suit_masks[card.suit_index] |= card.bit
+        self.rank_mask |= card.bit
+        self.rank_key += RANK_KEYS[card.rank - 2]
+        self.suit_counts += 1 << (4 * card.suit_index)
+        self._classification = None
     
     def clear(self):
         self.cards = []
+        self.reset_state()
+    
+    def state(self):
+        """Return the running summary as (rank key, suit counts, suit masks), the layout game.evaluator uses."""
+        return self.rank_key, self.suit_counts, tuple(self.suit_masks)
         
     def __str__(self):
         if not self.cards:
             return "Empty hand"
         return ", ".join(str(card) for card in self.cards)
     
+    def get_indices(self):
+        """Return the 0-51 integer index of every card in the hand."""
+        return [card.index for card in self.cards]
+    
     def get_rank_counts(self):
         """Count occurrences of each card rank in the hand.
         For example: {'A': 2, 'K': 1, '5': 2}
@@ -28,63 +58,76 @@ class Hand:
             counts[card.value] = counts.get(card.value, 0) + 1
         return counts
     
+    def get_rank_value_counts(self):
+        """Count occurrences of each numeric rank (2-14) in the hand.
+        For example: {14: 2, 13: 1, 5: 2}
+        """
+        counts = {}
+        for card in self.cards:
+            counts[card.rank] = counts.get(card.rank, 0) + 1
+        return counts
+    
+    def classify(self):
+        """
+        Classify the hand in a single pass over its running summary.
+        
+        The rank histogram, suit masks and straight mask are already kept up to
+        date by add_card(), so this is one scoring pass over them. The result
+        is cached until the next add_card() or clear().
+        
+        Returns:
+            tuple: (hand_rank, kickers) where hand_rank is 0-9 and kickers lists
+                   the card values that break ties, most significant first
+        """
+        if self._classification is None:
+            value = (strength.score_summary(self.rank_counts, self.suit_masks, self.suit_counts)
+                     if self.cards else 0)
+            flush = (self.suit_counts + strength.FLUSH_CHECK_ADD) & strength.FLUSH_CHECK_MASK
+            self._classification = (
+                strength.hand_rank(value),
+                strength.kickers(value),
+                strength.straight_high(self.rank_mask) > 0,
+                flush != 0,
+            )
+        return self._classification[0], self._classification[1]
+    
     def has_pair(self):
         """Check if the hand contains exactly one pair and no better hand."""
-        rank_counts = self.get_rank_counts()
-        pairs = sum(1 for count in rank_counts.values() if count == 2)
-        three_of_a_kind = any(count >= 3 for count in rank_counts.values())
-        return pairs == 1 and not three_of_a_kind
+        return self.classify()[0] == strength.PAIR
     
     def has_two_pairs(self):
         """Check if the hand contains exactly two pairs."""
-        rank_counts = self.get_rank_counts()
-        pairs = sum(1 for count in rank_counts.values() if count == 2)
-        return pairs == 2
+        return self.classify()[0] == strength.TWO_PAIR
     
     def has_three_of_a_kind(self):
         """Check if the hand contains three of a kind but not a full house."""
-        rank_counts = self.get_rank_counts()
-        three_of_a_kind = any(count == 3 for count in rank_counts.values())
-        pairs = any(count == 2 for count in rank_counts.values())
-        return three_of_a_kind and not pairs
+        return self.classify()[0] == strength.THREE_OF_A_KIND
     
     def has_straight(self):
-        # Get the numeric values of the cards and sort them
-        values = sorted([CARD_VALUES[card.value] for card in self.cards])
-        
-        # Check for regular straight
-        # len(values) check there are 5 vals; len(set(values)) checks there are 5 unique vals
-        if len(values) == 5 and values[4] - values[0] == 4 and len(set(values)) == 5:
-            return True
-            
-        # Check for A-2-3-4-5 straight
-        if set(values) == {2, 3, 4, 5, 14}:
-            return True
-            
-        return False
+        """Check if the hand contains five cards in sequence (A-2-3-4-5 included)."""
+        self.classify()
+        return self._classification[2]
     
     def has_flush(self):
-        return len(set(card.suit for card in self.cards)) == 1
+        """Check if the hand contains five cards of one suit."""
+        self.classify()
+        return self._classification[3]
 
     def has_full_house(self):
         """Check if the hand contains a full house (three of a kind and a pair)."""
-        rank_counts = self.get_rank_counts()
-        three_of_a_kind = any(count == 3 for count in rank_counts.values())
-        pairs = any(count == 2 for count in rank_counts.values())
-        return three_of_a_kind and pairs
+        return self.classify()[0] == strength.FULL_HOUSE
     
     def has_four_of_a_kind(self):
         """Check if the hand contains four of a kind."""
-        rank_counts = self.get_rank_counts()
-        return any(count == 4 for count in rank_counts.values())
+        return self.classify()[0] == strength.FOUR_OF_A_KIND
     
     def has_straight_flush(self):
         """Check if the hand contains a straight flush."""
-        return self.has_straight() and self.has_flush()
+        return self.classify()[0] >= strength.STRAIGHT_FLUSH
     
     def has_royal_flush(self):
-        if not self.has_straight_flush(): return False
-        return set(card.value for card in self.cards) == {'10', 'J', 'Q', 'K', 'A'}
+        """Check if the hand contains a royal flush."""
+        return self.classify()[0] == strength.ROYAL_FLUSH
 
     def calculate_score(self, hand_rank):
         """
@@ -100,61 +143,56 @@ class Hand:
         """
         if hand_rank == 9:  # Royal flush
             # Only suit matters for royal flush
-            highest_card = next(card for card in self.cards if card.value == 'A')
-            self.tiebreaker_score = 14 * 10 + SUIT_VALUES[highest_card.suit]
+            highest_card = next(card for card in self.cards if card.rank == 14)
+            self.tiebreaker_score = 14 * 10 + (highest_card.suit_index + 1)
         
         elif hand_rank in [0, 5]:  # High Card or Flush
             # Find highest card
-            highest_value = max(CARD_VALUES[card.value] for card in self.cards)
-            highest_card = next(card for card in self.cards if CARD_VALUES[card.value] == highest_value)
-            self.tiebreaker_score = highest_value * 10 + SUIT_VALUES[highest_card.suit]
+            highest_value = max(card.rank for card in self.cards)
+            highest_card = next(card for card in self.cards if card.rank == highest_value)
+            self.tiebreaker_score = highest_value * 10 + (highest_card.suit_index + 1)
         
         elif hand_rank in [4, 8]:  # Straight or Straight Flush
             # Handle special case: A-5 straight (Ace is low)
-            values = sorted([CARD_VALUES[card.value] for card in self.cards])
+            values = sorted([card.rank for card in self.cards])
             if set(values) == {2, 3, 4, 5, 14}:
-                five_card = next(card for card in self.cards if CARD_VALUES[card.value] == 5)
-                self.tiebreaker_score = 5 * 10 + SUIT_VALUES[five_card.suit]
+                five_card = next(card for card in self.cards if card.rank == 5)
+                self.tiebreaker_score = 5 * 10 + (five_card.suit_index + 1)
             else:
-                highest_value = max(CARD_VALUES[card.value] for card in self.cards)
-                highest_card = next(card for card in self.cards if CARD_VALUES[card.value] == highest_value)
-                self.tiebreaker_score = highest_value * 10 + SUIT_VALUES[highest_card.suit]
+                highest_value = max(card.rank for card in self.cards)
+                highest_card = next(card for card in self.cards if card.rank == highest_value)
+                self.tiebreaker_score = highest_value * 10 + (highest_card.suit_index + 1)
         
         elif hand_rank == 1:  # One Pair
             # Find the pair
-            rank_counts = self.get_rank_counts()
-            pair_rank = next(rank for rank, count in rank_counts.items() if count == 2)
-            pair_value = CARD_VALUES[pair_rank]
-            pair_cards = [card for card in self.cards if card.value == pair_rank]
-            highest_suit = max(SUIT_VALUES[card.suit] for card in pair_cards)
+            rank_counts = self.get_rank_value_counts()
+            pair_value = next(rank for rank, count in rank_counts.items() if count == 2)
+            pair_cards = [card for card in self.cards if card.rank == pair_value]
+            highest_suit = max(card.suit_index + 1 for card in pair_cards)
             self.tiebreaker_score = pair_value * 10 + highest_suit
         
         elif hand_rank == 2:  # Two Pair
             # Find high pair
-            rank_counts = self.get_rank_counts()
-            pair_ranks = [rank for rank, count in rank_counts.items() if count == 2]
-            high_pair_rank = max(pair_ranks, key=lambda r: CARD_VALUES[r])
-            high_pair_value = CARD_VALUES[high_pair_rank]
-            high_pair_cards = [card for card in self.cards if card.value == high_pair_rank]
-            highest_suit = max(SUIT_VALUES[card.suit] for card in high_pair_cards)
+            rank_counts = self.get_rank_value_counts()
+            high_pair_value = max(rank for rank, count in rank_counts.items() if count == 2)
+            high_pair_cards = [card for card in self.cards if card.rank == high_pair_value]
+            highest_suit = max(card.suit_index + 1 for card in high_pair_cards)
             self.tiebreaker_score = high_pair_value * 10 + highest_suit
         
         elif hand_rank in [3, 6]:  # Three of a Kind or Full House
             # Find the triplet
-            rank_counts = self.get_rank_counts()
-            triplet_rank = next(rank for rank, count in rank_counts.items() if count == 3)
-            triplet_value = CARD_VALUES[triplet_rank]
-            triplet_cards = [card for card in self.cards if card.value == triplet_rank]
-            highest_suit = max(SUIT_VALUES[card.suit] for card in triplet_cards)
+            rank_counts = self.get_rank_value_counts()
+            triplet_value = next(rank for rank, count in rank_counts.items() if count == 3)
+            triplet_cards = [card for card in self.cards if card.rank == triplet_value]
+            highest_suit = max(card.suit_index + 1 for card in triplet_cards)
             self.tiebreaker_score = triplet_value * 10 + highest_suit
         
         elif hand_rank == 7:  # Four of a Kind
             # Find the quad
-            rank_counts = self.get_rank_counts()
-            quad_rank = next(rank for rank, count in rank_counts.items() if count == 4)
-            quad_value = CARD_VALUES[quad_rank]
-            quad_cards = [card for card in self.cards if card.value == quad_rank]
-            highest_suit = max(SUIT_VALUES[card.suit] for card in quad_cards)
+            rank_counts = self.get_rank_value_counts()
+            quad_value = next(rank for rank, count in rank_counts.items() if count == 4)
+            quad_cards = [card for card in self.cards if card.rank == quad_value]
+            highest_suit = max(card.suit_index + 1 for card in quad_cards)
             self.tiebreaker_score = quad_value * 10 + highest_suit
         
         else:
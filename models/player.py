@@ -15,7 +15,8 @@ class Player:
     
     def place_bet(self, amount):
         """Place a bet with the specified amount."""
-        if amount > self.chips:
+        if amount >= self.chips:
+            # Betting the whole stack (or more than it) puts the player all-in
             amount = self.chips
             self.is_all_in = True
             
@@ -0,0 +1,115 @@
+"""
+Hand strength encoding and scoring.
+
+A hand's strength is a single integer: the hand rank (0-9) in the high bits,
+followed by up to five 4-bit kicker values, so a bigger number is a better
+hand. This module holds the encoding and the from-scratch scoring of a rank
+histogram or a flush suit's rank mask. game.evaluator precomputes these
+scores into lookup tables and re-exports the names below; models.hand scores
+its running summary with them directly.
+"""
+
+# Hand rank categories (same numbering as Game.evaluate_hand)
+HIGH_CARD = 0
+PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+ROYAL_FLUSH = 9
+
+HAND_NAMES = ["High Card", "Pair", "Two Pair", "Three of a Kind",
+              "Straight", "Flush", "Full House", "Four of a Kind",
+              "Straight Flush", "Royal Flush"]
+
+# Strength layout: rank << 20 | five 4-bit kicker slots (card values 2-14)
+RANK_SHIFT = 20
+
+NUM_RANKS = 13
+
+# Adding 3 to each suit field sets its top bit once that suit holds 5+ cards
+FLUSH_CHECK_ADD = 0x3333
+FLUSH_CHECK_MASK = 0x8888
+FLUSH_SUIT = {0x8 << (4 * suit): suit for suit in range(4)}
+
+def straight_high(mask):
+    """Return the high card value of the best straight in a 13-bit rank mask, or 0."""
+    for high in range(12, 3, -1):
+        run = 0x1F << (high - 4)
+        if mask & run == run:
+            return high + 2
+    # A-2-3-4-5 (the ace plays low)
+    if mask & 0x100F == 0x100F:
+        return 5
+    return 0
+
+def make_strength(hand_rank, kickers):
+    """Pack a hand rank and up to five kicker values into one integer."""
+    strength = hand_rank
+    for i in range(5):
+        strength = (strength << 4) | (kickers[i] if i < len(kickers) else 0)
+    return strength
+
+def score_flush(mask):
+    """Score the best flush or straight flush in a suit's rank mask."""
+    high = straight_high(mask)
+    if high == 14:
+        return make_strength(ROYAL_FLUSH, [14])
+    if high:
+        return make_strength(STRAIGHT_FLUSH, [high])
+    values = [r + 2 for r in range(NUM_RANKS - 1, -1, -1) if mask >> r & 1]
+    return make_strength(FLUSH, values[:5])
+
+def score_counts(counts):
+    """Score the best non-flush hand for a 13-entry rank count tuple."""
+    # Group ranks by how many times they appear, highest rank first
+    groups = {1: [], 2: [], 3: [], 4: []}
+    mask = 0
+    for r in range(NUM_RANKS - 1, -1, -1):
+        if counts[r]:
+            groups[counts[r]].append(r + 2)
+            mask |= 1 << r
+    quads, trips, pairs, singles = groups[4], groups[3], groups[2], groups[1]
+
+    if quads:
+        rest = sorted(trips + pairs + singles + quads[1:], reverse=True)
+        return make_strength(FOUR_OF_A_KIND, [quads[0]] + rest[:1])
+    if trips and len(trips) + len(pairs) >= 2:
+        pair = max(trips[1:] + pairs)
+        return make_strength(FULL_HOUSE, [trips[0], pair])
+    high = straight_high(mask)
+    if high:
+        return make_strength(STRAIGHT, [high])
+    if trips:
+        return make_strength(THREE_OF_A_KIND, [trips[0]] + singles[:2])
+    if len(pairs) >= 2:
+        kicker = sorted(pairs[2:] + singles, reverse=True)[:1]
+        return make_strength(TWO_PAIR, pairs[:2] + kicker)
+    if pairs:
+        return make_strength(PAIR, [pairs[0]] + singles[:3])
+    return make_strength(HIGH_CARD, singles[:5])
+
+def hand_rank(strength):
+    """Extract the hand rank (0-9) from a strength value."""
+    return strength >> RANK_SHIFT
+
+def kickers(strength):
+    """Extract the kicker values (highest first, zeros dropped) from a strength value."""
+    values = [(strength >> shift) & 0xF for shift in (16, 12, 8, 4, 0)]
+    return [v for v in values if v]
+
+def score_summary(rank_counts, suit_masks, suit_counts):
+    """
+    Score up to seven cards from their rank histogram, per-suit rank masks and
+    packed suit counts (the running summary models.hand.Hand keeps).
+
+    With at most seven cards a flush always beats any other made hand, so the
+    flush suit is scored alone when there is one.
+    """
+    flush = (suit_counts + FLUSH_CHECK_ADD) & FLUSH_CHECK_MASK
+    if flush:
+        return score_flush(suit_masks[FLUSH_SUIT[flush]])
+    return score_counts(rank_counts)
@@ -3,9 +3,12 @@
 Texas Hold'em Poker Game
 A text-based poker game played in the terminal.
 """
-from game.poker_game import Game
 from config import NUM_PLAYERS
-import random
+import argparse
+import sys
+
+# Everything else is imported where it is first needed, so each mode only pays
+# for the modules it uses (see --startup-profile)
 
 def display_initial_player_info(player):
     """Display information about a player."""
@@ -30,9 +33,11 @@ def get_human_action(game, valid_actions):
     Returns:
         tuple: (action, amount) where action is the chosen action and amount is used for raises
     """
+    from game.evaluator import HAND_NAMES
     player = game.players[game.current_player_index]
     
     print(f"Your hand: {player.hand}; your chips: {player.chips}")
+    print(f"Your best hand so far: {HAND_NAMES[game.current_hand_rank(player)]}")
     print(f"Current bet to match: {game.current_bet}")
     print(f"Your current bet: {player.current_bet}")
     
@@ -71,47 +76,12 @@ def get_human_action(game, valid_actions):
             except ValueError:
                 print("Please enter a valid number.")
 
-def get_npc_action(game, valid_actions):
-    """Generate an action for an NPC player using a simple strategy.
-    
-    Args:
-        game: The current game instance
-        valid_actions: List of valid actions for the player
-        
-    Returns:
-        tuple: (action, amount) where action is the chosen action and amount is used for raises
-    """
-    player = game.players[game.current_player_index]
-    
-    # Simple random strategy with weighted probabilities
-    if "check" in valid_actions:
-        # If check is available, 60% check, 20% raise, 20% fold
-        weights = {"check": 60, "raise": 20, "fold": 20}
-    elif "call" in valid_actions:
-        # If call is required, 50% call, 30% raise, 20% fold
-        weights = {"call": 50, "raise": 30, "fold": 20}
-    else:
-        # Limited options, equal weights
-        weights = {action: 100/len(valid_actions) for action in valid_actions}
-    
-    # Filter to only include valid actions
-    valid_weights = {a: w for a, w in weights.items() if a in valid_actions}
-    
-    # Choose action based on weights
-    actions = list(valid_weights.keys())
-    action_weights = [valid_weights[a] for a in actions]
-    action = random.choices(actions, weights=action_weights, k=1)[0]
-    
-    # Handle raise amount if needed
-    if action == "raise":
-        min_raise = game.current_bet * 2 - player.current_bet
-        max_raise = player.chips
-        # Choose a random raise amount between min and max
-        amount = random.randint(min_raise, max_raise)
-        return action, amount
-    
-    # For other actions, amount is not needed
-    return action, 0
+def default_policy(npc_policy):
+    """Return npc_policy, or the standard NPC policy if it is None."""
+    if npc_policy is None:
+        from game.npc import get_npc_action
+        return get_npc_action
+    return npc_policy
 
 def handle_early_winner(game):
     """Handle case where all but one player has folded."""
@@ -121,19 +91,22 @@ def handle_early_winner(game):
     winner.chips += game.pot
     return True
 
-def handle_round(game, round_name):
+def handle_round(game, round_name, npc_policy=None):
     """Handle a complete round of the poker game (deal cards and betting)"""
+    npc_policy = default_policy(npc_policy)
     print(f"\n=== {round_name} ===")
     new_cards = game.next_round()
     display_community_cards(game.community_cards)
     
     print(f"\n=== {round_name} BETTING ===")
-    if not game.betting_round(get_human_action, get_npc_action):
+    if not game.betting_round(get_human_action, npc_policy):
         return False  # Hand ended early
     return True
 
-def play(game):
+def play(game, npc_policy=None):
     """Play a complete hand of poker from deal to showdown."""
+    from game.evaluator import HAND_NAMES
+    npc_policy = default_policy(npc_policy)
     print("\n=== NEW HAND ===")
     
     # Deal cards to players
@@ -161,13 +134,13 @@ def play(game):
     game.current_player_index = (game.dealer_position + 3) % len(game.players)
     
     # Run the pre-flop betting round
-    if not game.betting_round(get_human_action, get_npc_action):
+    if not game.betting_round(get_human_action, npc_policy):
         return handle_early_winner(game)  # Hand ended early
         
     # Flop, Turn, and River
     rounds = ["FLOP", "TURN", "RIVER"]
     for round_name in rounds:
-        if not handle_round(game, round_name):
+        if not handle_round(game, round_name, npc_policy):
             return handle_early_winner(game)  # Hand ended early
         
     # Showdown
@@ -177,10 +150,7 @@ def play(game):
     print("Remaining players show their hands:")
     for player in active_players:
         hand_rank, best_hand = game.evaluate_hand(player)
-        hand_types = ["High Card", "Pair", "Two Pair", "Three of a Kind", 
-                      "Straight", "Flush", "Full House", "Four of a Kind", 
-                      "Straight Flush", "Royal Flush"]
-        hand_name = hand_types[hand_rank] if hand_rank < len(hand_types) else "Unknown"
+        hand_name = HAND_NAMES[hand_rank] if 0 <= hand_rank < len(HAND_NAMES) else "Unknown"
         print(f"{player.name}: {player.hand} - {hand_name}")
     
     # Determine winner(s)
@@ -194,18 +164,150 @@ def play(game):
     
     return True
 
-def main():
+def run_headless(num_hands, num_players=NUM_PLAYERS, profile=False, report_every=0, history_path=None,
+                 npc_policy=None, rng=None):
+    """Play num_hands hands with NPCs in every seat and print the aggregate results."""
+    from game.simulation import run_simulation
+    npc_policy = default_policy(npc_policy)
+    profiler = recorder = None
+    if profile:
+        from utils.profiling import Profiler
+        profiler = Profiler()
+    if history_path:
+        from game.history import HandHistoryWriter
+        recorder = HandHistoryWriter(history_path)
+    try:
+        result = run_simulation(num_hands, num_players, npc_policy, profiler=profiler,
+                                report_every=report_every, recorder=recorder, rng=rng)
+    finally:
+        if recorder:
+            recorder.close()
+    print(result.summary())
+    stats = getattr(npc_policy, "stats", None)
+    if stats is not None:
+        print(stats.summary())
+    if profiler:
+        print(profiler.summary())
+    return result
+
+def main(argv=None):
     """Main entry point for the poker game."""
+    parser = argparse.ArgumentParser(description="Texas Hold'em Poker")
+    parser.add_argument("--headless", type=int, metavar="N",
+                        help="play N hands with NPCs in every seat and no table output")
+    parser.add_argument("--lockstep", type=int, metavar="K",
+                        help="with --headless, play N hands at each of K tables in lockstep (needs NumPy)")
+    parser.add_argument("--tournaments", type=int, metavar="N",
+                        help="play N all-NPC last-player-standing tournaments across worker processes")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --tournaments (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for a reproducible run (default: a fresh one; 0 for --tournaments)")
+    parser.add_argument("--bulk-shuffle", type=int, default=0, metavar="N",
+                        help="with --headless, pre-generate N deck shuffles at a time (needs NumPy)")
+    parser.add_argument("--players", type=int, default=NUM_PLAYERS,
+                        help="number of seats for headless mode")
+    parser.add_argument("--profile", action="store_true",
+                        help="record per-phase timings in headless mode")
+    parser.add_argument("--report-every", type=int, default=0, metavar="N",
+                        help="with --profile, print the profile every N hands")
+    parser.add_argument("--history", metavar="FILE",
+                        help="append every headless hand to a binary hand history file")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="re-execute every hand in a hand history file and report mismatches")
+    parser.add_argument("--mcts", type=float, metavar="MS",
+                        help="NPCs search each decision with MCTS for MS milliseconds")
+    parser.add_argument("--preflop-table", action="store_true",
+                        help="NPCs decide pre-flop by a lookup in the precomputed equity table "
+                             "(with --mcts, instead of searching)")
+    parser.add_argument("--serve", metavar="ADDRESS",
+                        help="host tables for human players connecting to ADDRESS (host:port or unix:path)")
+    parser.add_argument("--tables", type=int, default=0, metavar="N",
+                        help="with --serve, also run N all-NPC tables")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS",
+                        help="with --serve, time a human has to act before auto-check/fold (default: 30)")
+    parser.add_argument("--connect", metavar="ADDRESS",
+                        help="play at a table hosted with --serve")
+    parser.add_argument("--name", default="Human", help="your name at the table, with --connect")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="report the time taken by each module import")
+    args = parser.parse_args(argv)
+    if not args.startup_profile:
+        return run(args)
+    
+    from utils.profiling import ImportProfiler
+    imports = ImportProfiler().install()
+    try:
+        return run(args)
+    finally:
+        imports.uninstall()
+        print(imports.summary(), file=sys.stderr)
+
+def run(args):
+    """Run the mode selected by the parsed command line arguments."""
+    from utils.rng import RNG
+    rng = RNG(args.seed, bulk=args.bulk_shuffle)
+    npc_policy = None
+    if args.preflop_table:
+        from game.npc import get_preflop_table_action
+        npc_policy = get_preflop_table_action
+    if args.mcts:
+        from game.mcts import MCTSPolicy
+        # Searches sample from a child of each game's own stream
+        npc_policy = MCTSPolicy(args.mcts, preflop_policy=npc_policy)
+    
+    if args.replay is not None:
+        from game.replay import replay_file
+        summary = replay_file(args.replay)
+        print(summary.summary())
+        return 1 if summary.failures else 0
+    
+    if args.serve is not None:
+        import asyncio
+        from game.server import TableHost, DEFAULT_TIMEOUT
+        timeout = DEFAULT_TIMEOUT if args.timeout is None else args.timeout
+        host = TableHost(args.players, default_policy(npc_policy), timeout, seed=rng.root_seed)
+        for _ in range(args.tables):
+            host.add_npc_table()
+        print(f"Hosting tables on {args.serve}")
+        try:
+            asyncio.run(host.serve(args.serve))
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    if args.connect is not None:
+        from game.server import run_client
+        run_client(args.connect, args.name)
+        return
+    
+    if args.headless is not None and args.lockstep:
+        from game.vector_engine import run_lockstep
+        print(run_lockstep(args.lockstep, args.headless, args.players, rng=rng.child("lockstep")).summary())
+        return
+    
+    if args.headless is not None:
+        run_headless(args.headless, args.players, args.profile, args.report_every, args.history, npc_policy,
+                     rng)
+        return
+    
+    if args.tournaments is not None:
+        from game.tournament import run_tournaments
+        stats = run_tournaments(args.tournaments, args.workers, args.seed or 0, args.players)
+        print(stats.summary())
+        return
+    
     print("Welcome to Texas Hold'em Poker!")
     
     # Create player names (for demo purposes)
     player_names = [f"Player {i+1}" for i in range(NUM_PLAYERS)]
     
     # Initialize the game
-    game = Game(player_names)
+    from game.poker_game import Game
+    game = Game(player_names, rng=rng)
     
     # Play a single hand
-    play(game)
+    play(game, npc_policy)
     
     # Display final chips
     print("\n=== GAME SUMMARY ===")
@@ -214,4 +316,4 @@ def main():
         print(f"{player.name}: {player.chips} chips")
     
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
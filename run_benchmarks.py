@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for poker game.
+Run this script to time the evaluator, deck, betting loop and full hands.
+"""
+import argparse
+import sys
+from benchmarks.suite import BENCHMARKS
+from benchmarks.runner import run_benchmark, format_results, save_results, compare_to_baseline
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the poker benchmarks")
+    parser.add_argument("--samples", type=int, default=20, help="timed samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1234, help="seed for benchmark inputs")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--output", help="save results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown vs. the baseline that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+    
+    results = []
+    for name, setup, ops in BENCHMARKS:
+        if args.filter in name:
+            results.append(run_benchmark(name, setup, ops, args.samples, args.seed))
+    print(format_results(results))
+    
+    if args.output:
+        save_results(results, args.output)
+        print(f"Results saved to {args.output}")
+        
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before:,.0f} -> {after:,.0f} ops/sec ({change:+.1%})")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
@@ -0,0 +1,102 @@
+"""
+Unit tests for the seat bitmasks behind the betting loop.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.poker_game import Game, StalledRoundError
+from game.events import EventSink
+from config import STARTING_CHIPS, BIG_BLIND
+
+def make_game(num_players):
+    return Game([f"Player {i+1}" for i in range(num_players)], events=EventSink(), human_seat=None)
+
+class TestBetting(unittest.TestCase):
+    def test_next_active_seat_wraps(self):
+        game = make_game(6)
+        self.assertEqual(game.active_mask, 0b111111)
+        game.players[4].fold()
+        game.players[0].fold()
+        game.refresh_seat_masks()
+        self.assertEqual(game.next_active_seat(3), 5)
+        self.assertEqual(game.next_active_seat(5), 1)
+        game.current_player_index = 5
+        self.assertTrue(game.next_active_player())
+        self.assertEqual(game.current_player_index, 1)
+
+    def test_masks_follow_actions(self):
+        game = make_game(4)
+        game.start_hand()
+        game.deal_cards()
+        game.post_blinds()
+        game.current_player_index = 3
+        game.execute_action("fold")
+        self.assertFalse(game.active_mask & (1 << 3))
+        game.players[0].chips = 15
+        game.current_player_index = 0
+        game.execute_action("call")
+        self.assertTrue(game.all_in_mask & 1)
+
+    def test_raise_war_on_a_big_table(self):
+        random.seed(5)
+        game = make_game(40)
+        for player in game.players:
+            player.chips = 100 * STARTING_CHIPS
+        game.start_hand()
+        game.deal_cards()
+        game.post_blinds()
+        game.current_player_index = 3
+        raises = []
+
+        def policy(game, valid_actions):
+            # Small raises a few times round the table, then everyone calls down
+            if "raise" in valid_actions and len(raises) < 100:
+                raises.append(game.current_player_index)
+                return "raise", BIG_BLIND
+            return ("call", 0) if "call" in valid_actions else ("check", 0)
+
+        self.assertTrue(game.betting_round(None, policy))
+        self.assertEqual(len(raises), 100)
+        in_hand = [p for p in game.players if not p.is_folded]
+        self.assertTrue(all(p.current_bet == game.current_bet or p.is_all_in for p in in_hand))
+        self.assertEqual(game.pot + sum(p.chips for p in game.players), 40 * 100 * STARTING_CHIPS)
+
+    def test_invalid_choices_fall_back(self):
+        random.seed(7)
+        game = make_game(4)
+        game.start_hand()
+        game.deal_cards()
+        game.post_blinds()
+        game.current_player_index = 3
+        asked = []
+
+        def stubborn(game, valid_actions):
+            # Always tries to raise more than the stack
+            asked.append(game.current_player_index)
+            return "raise", 10 ** 6
+
+        self.assertTrue(game.betting_round(None, stubborn))
+        self.assertEqual(len(asked), 4 * game.max_retries)
+        self.assertEqual(sum(game.rejected_actions.values()), 4 * game.max_retries)
+        self.assertEqual(sum(game.fallback_actions.values()), 4)
+        # Fallback is check when allowed, else call: everyone ends up matching the big blind
+        self.assertEqual(game.pot, 4 * BIG_BLIND)
+
+    def test_stalled_round_raises(self):
+        game = make_game(3)
+        game.start_hand()
+        game.deal_cards()
+        game.post_blinds()
+        game.current_player_index = 0
+        # A rule change that rejects everything, fallback included
+        game.execute_action = lambda action, amount=0: False
+        with self.assertRaises(StalledRoundError):
+            game.betting_round(None, lambda game, valid_actions: ("call", 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Unit tests for suit-isomorphism canonicalization and the preflop table.
+"""
+import unittest
+import itertools
+import tempfile
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.card import Card
+from game.canonical import (starting_hand_class, class_label, class_representative,
+                            canonicalize, canonicalize_spot, NUM_STARTING_HANDS)
+from game.preflop import PreflopTable, preflop_equity
+from game.poker_game import Game
+from game.events import EventSink
+from game.npc import get_preflop_table_action
+from models.hand import Hand
+
+class TestCanonical(unittest.TestCase):
+    def test_169_starting_hands(self):
+        classes = {}
+        for a, b in itertools.combinations(range(52), 2):
+            classes.setdefault(starting_hand_class(a, b), []).append((a, b))
+        self.assertEqual(len(classes), NUM_STARTING_HANDS)
+        # 6 combos per pair, 4 per suited hand, 12 per offsuit hand
+        self.assertEqual(sum(len(combos) for combos in classes.values()), 1326)
+        for hand_class, combos in classes.items():
+            self.assertEqual(starting_hand_class(*class_representative(hand_class)), hand_class)
+            label = class_label(hand_class)
+            expected = 6 if len(label) == 2 else 4 if label.endswith("s") else 12
+            self.assertEqual(len(combos), expected)
+
+    def test_labels(self):
+        self.assertEqual(class_label(starting_hand_class(Card('Hearts', 'A'), Card('Hearts', 'K'))), "AKs")
+        self.assertEqual(class_label(starting_hand_class(Card('Hearts', '9'), Card('Spades', '10'))), "T9o")
+        self.assertEqual(class_label(starting_hand_class(Card('Clubs', 'Q'), Card('Spades', 'Q'))), "QQ")
+
+    def test_suit_relabeling(self):
+        hole = [Card('Hearts', 'A'), Card('Hearts', 'K')]
+        board = [Card('Hearts', '2'), Card('Spades', '7'), Card('Clubs', '7')]
+        renamed_hole = [Card('Spades', 'K'), Card('Spades', 'A')]
+        renamed_board = [Card('Diamonds', '7'), Card('Spades', '2'), Card('Hearts', '7')]
+        self.assertEqual(canonicalize(hole, board), canonicalize(renamed_hole, renamed_board))
+        # A different suit structure is not isomorphic
+        other_board = [Card('Clubs', '2'), Card('Spades', '7'), Card('Clubs', '7')]
+        self.assertNotEqual(canonicalize(hole, board), canonicalize(hole, other_board))
+
+    def test_spot_order(self):
+        holes = [[Card('Hearts', 'A'), Card('Hearts', 'K')], [Card('Clubs', '2'), Card('Spades', '2')]]
+        forward = canonicalize_spot(holes)
+        backward = canonicalize_spot(list(reversed(holes)))
+        self.assertEqual(forward[:2], backward[:2])
+        self.assertEqual(forward[2], list(reversed(backward[2])))
+
+class TestPreflopTable(unittest.TestCase):
+    def test_lookup(self):
+        aces = [Card('Hearts', 'A'), Card('Spades', 'A')]
+        self.assertAlmostEqual(preflop_equity(aces, 1), 85.2, delta=1.0)
+        trash = [Card('Hearts', '7'), Card('Spades', '2')]
+        self.assertLess(preflop_equity(trash, 1), preflop_equity(aces, 1))
+        self.assertLess(preflop_equity(aces, 7), preflop_equity(aces, 1))
+
+    def _preflop_decision(self, cards, num_players):
+        game = Game([f"Player {i+1}" for i in range(num_players)], events=EventSink(), human_seat=None)
+        game.start_hand()
+        game.deal_cards()
+        game.post_blinds()
+        game.current_player_index = (game.dealer_position + 3) % num_players
+        player = game.players[game.current_player_index]
+        player.hand = Hand()
+        for card in cards:
+            player.hand.add_card(card)
+        return get_preflop_table_action(game, game.get_valid_actions())
+
+    def test_npc_policy_uses_table(self):
+        aces = [Card('Hearts', 'A'), Card('Spades', 'A')]
+        trash = [Card('Hearts', '7'), Card('Spades', '2')]
+        action, amount = self._preflop_decision(aces, 6)
+        self.assertEqual(action, "raise")
+        self.assertGreater(amount, 0)
+        self.assertEqual(self._preflop_decision(trash, 6), ("fold", 0))
+
+    def test_save_and_load(self):
+        table = PreflopTable(2, 100, list(range(NUM_STARTING_HANDS * 2)))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.bin")
+            table.save(path)
+            self.assertEqual(os.path.getsize(path), 14 + NUM_STARTING_HANDS * 2 * 2)
+            loaded = PreflopTable.load(path)
+        self.assertEqual(loaded.cells, table.cells)
+        self.assertEqual(loaded.equity(3, 2), 7 / 100.0)
+        self.assertRaises(ValueError, loaded.equity, 3, 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,5 +22,20 @@ class TestCard(unittest.TestCase):
         self.assertEqual(str(card), "K of Spades")
         print("Card string representation test passed!")
 
+    def test_card_integer_identity(self):
+        card = Card("Spades", "K")
+        self.assertEqual(card.rank, 13)
+        self.assertEqual(card.suit_index, 3)
+        self.assertEqual(card.index, 3 * 13 + 11)
+        self.assertEqual(card.bit, 1 << 11)
+        self.assertEqual(card.prime, 37)
+        self.assertIs(Card.from_index(card.index), card)
+
+    def test_cards_are_interned(self):
+        self.assertIs(Card("Hearts", "A"), Card("Hearts", "A"))
+        self.assertEqual(len(Card.DECK), 52)
+        self.assertEqual(len(set(card.code for card in Card.DECK)), 52)
+        self.assertRaises(ValueError, Card, "Stars", "A")
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
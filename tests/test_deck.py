@@ -8,7 +8,7 @@ import os
 # Add the parent directory to the path so imports work properly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from models.deck import Deck
+from models.deck import Deck, IndexedDeck
 from models.card import Card
 
 class TestDeck(unittest.TestCase):
@@ -27,5 +27,39 @@ class TestDeck(unittest.TestCase):
         self.assertNotEqual(str(firstPeek), str(secondPeek))
         print("Deck shuffle test passed")
 
+    def test_deal_many(self):
+        deck = Deck()
+        deck.shuffle()
+        expected = list(reversed(deck.cards[-5:]))
+        self.assertEqual(deck.deal_many(5), expected)
+        self.assertEqual(len(deck.cards), 47)
+
+class TestIndexedDeck(unittest.TestCase):
+    def test_matches_deck_layout(self):
+        deck = IndexedDeck()
+        self.assertEqual(deck.cards, Deck().cards)
+        self.assertIs(deck.deal(), Deck().deal())
+
+    def test_deal_and_reset(self):
+        deck = IndexedDeck()
+        deck.shuffle()
+        order = list(reversed(deck.cards))
+        dealt = [deck.deal() for _ in range(2)] + deck.deal_many(50)
+        self.assertEqual(dealt, order)
+        self.assertIsNone(deck.deal())
+        self.assertEqual(deck.deal_many(3), [])
+
+        # Reset rewinds to the same permutation without rebuilding anything
+        deck.reset()
+        self.assertEqual(deck.deal_many(52), order)
+
+    def test_shuffle_undealt_only(self):
+        deck = IndexedDeck()
+        deck.shuffle()
+        first = deck.deal_indices(10)
+        deck.shuffle()
+        rest = deck.deal_indices(42)
+        self.assertEqual(sorted(first + rest), list(range(52)))
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
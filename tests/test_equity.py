@@ -0,0 +1,101 @@
+"""
+Unit tests for the equity calculator.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.card import Card
+from game import evaluator
+from game.equity import equity, exact_equity, game_equity
+from game.poker_game import Game
+from game.events import EventSink
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ACES = [Card('Hearts', 'A'), Card('Spades', 'A')]
+KINGS = [Card('Hearts', 'K'), Card('Spades', 'K')]
+
+class TestEquity(unittest.TestCase):
+    def test_aces_beat_kings_python(self):
+        result = equity([ACES, KINGS], backend="python", max_samples=20000, margin=1.0, seed=1)
+        self.assertAlmostEqual(result.equity[0], 82.6, delta=2.0)
+        self.assertAlmostEqual(sum(result.equity), 100.0)
+        for w, t, l in zip(result.win, result.tie, result.lose):
+            self.assertAlmostEqual(w + t + l, 100.0)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_aces_beat_kings_numpy(self):
+        result = equity([ACES, KINGS], backend="numpy", margin=0.2, seed=1)
+        self.assertAlmostEqual(result.equity[0], 82.6, delta=0.5)
+        self.assertLessEqual(result.margin(0.95), 0.2)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_batch_evaluator_matches_evaluator(self):
+        from game.batch_evaluator import evaluate_batch
+        rng = numpy.random.default_rng(2)
+        hands = numpy.argsort(rng.random((2000, 52)), axis=1)[:, :7]
+        strengths = evaluate_batch(hands)
+        for hand, strength in zip(hands.tolist(), strengths.tolist()):
+            self.assertEqual(evaluator.evaluate_indices(hand), strength)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_evaluate_with_board_matches_batch(self):
+        from game.batch_evaluator import evaluate_batch, evaluate_with_board
+        rng = numpy.random.default_rng(3)
+        # Six players at each of 2000 tables, with the board dealt after the hole cards
+        decks = numpy.argsort(rng.random((2000, 52)), axis=1)
+        holes, board = decks[:, :12].reshape(2000, 6, 2), decks[:, 12:17]
+        seven = numpy.concatenate([holes, numpy.repeat(board[:, None, :], 6, axis=1)], axis=2)
+        expected = evaluate_batch(seven.reshape(-1, 7)).reshape(2000, 6)
+        self.assertTrue((evaluate_with_board(holes, board) == expected).all())
+
+    def test_full_board_is_exact(self):
+        board = [Card('Hearts', 'Q'), Card('Hearts', 'J'), Card('Hearts', '10'),
+                 Card('Clubs', '2'), Card('Diamonds', '3')]
+        result = equity([ACES, KINGS], board)
+        self.assertTrue(result.exact)
+        self.assertEqual(result.win, [100.0, 0.0])
+
+    def test_exact_turn_equity(self):
+        # Kings need one of the two remaining kings on the river
+        board = [Card('Clubs', '2'), Card('Diamonds', '7'), Card('Clubs', '9'), Card('Hearts', '4')]
+        result = exact_equity([ACES, KINGS], board)
+        self.assertTrue(result.exact)
+        self.assertEqual(result.samples, 44)
+        self.assertAlmostEqual(result.win[1], 100.0 * 2 / 44)
+        self.assertAlmostEqual(result.win[0], 100.0 * 42 / 44)
+
+    def test_exact_matches_sampling(self):
+        board = [Card('Clubs', '2'), Card('Diamonds', 'K'), Card('Clubs', '9')]
+        exact = exact_equity([ACES, KINGS], board)
+        sampled = equity([ACES, KINGS], board, backend="python", batch_size=500,
+                         max_samples=20000, margin=0.5, seed=3)
+        self.assertFalse(sampled.exact)
+        self.assertAlmostEqual(exact.equity[0], sampled.equity[0], delta=1.5)
+
+    def test_exact_results_independent_of_order(self):
+        board = [Card('Clubs', '2'), Card('Diamonds', '7'), Card('Clubs', '9'), Card('Hearts', '4')]
+        forward = exact_equity([ACES, KINGS], board)
+        backward = exact_equity([list(reversed(KINGS)), ACES], list(reversed(board)))
+        self.assertEqual(forward.equity, list(reversed(backward.equity)))
+
+    def test_duplicate_cards_rejected(self):
+        self.assertRaises(ValueError, equity, [ACES, ACES])
+        self.assertRaises(ValueError, equity, [ACES, KINGS], [Card('Hearts', 'A')])
+
+    def test_game_equity(self):
+        game = Game(["Player 1", "Player 2"], events=EventSink())
+        game.deal_cards()
+        shares = game_equity(game, backend="python", max_samples=2000, margin=5.0, seed=4)
+        self.assertEqual(set(shares), set(game.players))
+        self.assertAlmostEqual(sum(shares.values()), 100.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Unit tests for the memory-mapped evaluator table file.
+"""
+import unittest
+from unittest import mock
+import random
+import tempfile
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game import evaluator
+from models import strength
+from game import eval_tables
+from game.eval_tables import EvalTables, HEADER, fingerprint, get_tables, load_or_build
+
+class TestEvalTables(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "tables.bin")
+        get_tables().save(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_round_trip(self):
+        tables = EvalTables.load(self.path)
+        shared = get_tables()
+        self.assertEqual(len(tables.rank), len(shared.rank))
+        self.assertEqual(tables.flush.tolist(), list(shared.flush))
+        rng = random.Random(1)
+        for _ in range(2000):
+            cards = rng.sample(range(evaluator.NUM_CARDS), 7)
+            key = sum(evaluator.RANK_KEY[i] for i in cards)
+            self.assertEqual(tables.lookup(key), shared.lookup(key))
+
+    def test_evaluator_reads_the_mapped_tables(self):
+        evaluator.build_tables()
+        # A pair of aces with K-Q-J kickers, no flush
+        cards = [12, 25, 11, 36, 22, 1, 2]
+        key = sum(evaluator.RANK_KEY[i] for i in cards)
+        self.assertEqual(evaluator.evaluate7(*cards), get_tables().lookup(key))
+        self.assertEqual(evaluator.hand_rank(evaluator.evaluate7(*cards)), evaluator.PAIR)
+
+    def _corrupt(self, offset, data):
+        path = os.path.join(self.directory.name, "corrupt.bin")
+        with open(self.path, "rb") as f:
+            contents = bytearray(f.read())
+        contents[offset:offset + len(data)] = data
+        with open(path, "wb") as f:
+            f.write(contents)
+        return path
+
+    def test_checksum_mismatch_is_rejected(self):
+        path = self._corrupt(HEADER.size + 100, b"\xff\xff")
+        with self.assertRaises(ValueError):
+            EvalTables.load(path)
+        # Skipping verification maps the file anyway
+        EvalTables.load(path, verify=False)
+
+    def test_other_version_is_rejected(self):
+        with self.assertRaises(ValueError):
+            EvalTables.load(self._corrupt(4, b"\x63\x00"))
+
+    def test_stale_build_is_rejected(self):
+        # The fingerprint sits just before the checksum at the end of the header
+        stale = (fingerprint() + 1) & 0xFFFFFFFF
+        path = self._corrupt(HEADER.size - 8, stale.to_bytes(4, "little"))
+        with self.assertRaises(ValueError):
+            EvalTables.load(path, verify=False)
+
+    def test_fingerprint_tracks_scoring_code(self):
+        original = fingerprint()
+        self.assertEqual(fingerprint(), original)
+        def changed_score(counts):
+            return strength.score_counts(counts) + 1
+        with mock.patch.object(strength, "score_counts", changed_score):
+            self.assertNotEqual(fingerprint(), original)
+
+    def test_truncated_file_is_rejected(self):
+        path = os.path.join(self.directory.name, "short.bin")
+        with open(self.path, "rb") as f:
+            contents = f.read()
+        with open(path, "wb") as f:
+            f.write(contents[:-4])
+        with self.assertRaises(ValueError):
+            EvalTables.load(path)
+
+    def test_path_override_and_cache_dir(self):
+        with mock.patch.dict(os.environ, {"POKER_EVAL_TABLES": self.path}):
+            self.assertEqual(eval_tables.default_table_path(), self.path)
+        with mock.patch.dict(os.environ, {"POKER_EVAL_TABLES": "", "XDG_CACHE_HOME": self.directory.name}):
+            path = eval_tables.default_table_path()
+        self.assertTrue(path.startswith(os.path.join(self.directory.name, "poker") + os.sep))
+
+    def test_save_creates_cache_directory(self):
+        path = os.path.join(self.directory.name, "cache", "poker", "tables.bin")
+        get_tables().save(path)
+        self.assertEqual(len(load_or_build(path).rank), len(get_tables().rank))
+
+    def test_unwritable_path_warns_and_falls_back(self):
+        # A regular file where the directory should be makes the save fail
+        path = os.path.join(self.path, "tables.bin")
+        shared = get_tables()
+        with mock.patch.object(EvalTables, "build", classmethod(lambda cls: shared)):
+            with self.assertWarns(RuntimeWarning):
+                tables = load_or_build(path)
+        self.assertIs(tables, shared)
+
+if __name__ == '__main__':
+    unittest.main()
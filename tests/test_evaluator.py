@@ -0,0 +1,92 @@
+"""
+Unit tests for the table-driven hand evaluator.
+"""
+import unittest
+import itertools
+import random
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.card import Card
+from models.deck import Deck
+from game import evaluator
+from game.poker_game import Game
+
+def cards_from(*specs):
+    return [Card(suit, value) for value, suit in specs]
+
+class TestEvaluator(unittest.TestCase):
+    def test_hand_ranks(self):
+        cases = [
+            (cards_from(('A', 'Hearts'), ('K', 'Hearts'), ('Q', 'Hearts'), ('J', 'Hearts'),
+                        ('10', 'Hearts'), ('2', 'Clubs'), ('3', 'Spades')), evaluator.ROYAL_FLUSH),
+            (cards_from(('A', 'Clubs'), ('2', 'Clubs'), ('3', 'Clubs'), ('4', 'Clubs'),
+                        ('5', 'Clubs'), ('K', 'Hearts'), ('K', 'Spades')), evaluator.STRAIGHT_FLUSH),
+            (cards_from(('9', 'Clubs'), ('9', 'Hearts'), ('9', 'Spades'), ('9', 'Diamonds'),
+                        ('5', 'Clubs')), evaluator.FOUR_OF_A_KIND),
+            (cards_from(('9', 'Clubs'), ('9', 'Hearts'), ('9', 'Spades'), ('5', 'Diamonds'),
+                        ('5', 'Clubs'), ('5', 'Hearts'), ('A', 'Spades')), evaluator.FULL_HOUSE),
+            (cards_from(('2', 'Spades'), ('7', 'Spades'), ('9', 'Spades'), ('J', 'Spades'),
+                        ('K', 'Spades'), ('K', 'Hearts')), evaluator.FLUSH),
+            (cards_from(('A', 'Spades'), ('2', 'Hearts'), ('3', 'Spades'), ('4', 'Clubs'),
+                        ('5', 'Diamonds')), evaluator.STRAIGHT),
+            (cards_from(('Q', 'Spades'), ('Q', 'Hearts'), ('Q', 'Clubs'), ('4', 'Clubs'),
+                        ('7', 'Diamonds')), evaluator.THREE_OF_A_KIND),
+            (cards_from(('Q', 'Spades'), ('Q', 'Hearts'), ('4', 'Spades'), ('4', 'Clubs'),
+                        ('7', 'Diamonds')), evaluator.TWO_PAIR),
+            (cards_from(('Q', 'Spades'), ('Q', 'Hearts'), ('3', 'Spades'), ('4', 'Clubs'),
+                        ('7', 'Diamonds')), evaluator.PAIR),
+            (cards_from(('Q', 'Spades'), ('9', 'Hearts'), ('3', 'Spades'), ('4', 'Clubs'),
+                        ('7', 'Diamonds')), evaluator.HIGH_CARD),
+        ]
+        for cards, expected in cases:
+            strength = evaluator.evaluate_cards(cards)
+            self.assertEqual(evaluator.hand_rank(strength), expected, cards)
+
+    def test_kickers_break_ties(self):
+        board = cards_from(('K', 'Spades'), ('K', 'Hearts'), ('8', 'Clubs'), ('5', 'Diamonds'), ('2', 'Clubs'))
+        ace_kicker = evaluator.evaluate_cards(board + cards_from(('A', 'Clubs'), ('3', 'Hearts')))
+        queen_kicker = evaluator.evaluate_cards(board + cards_from(('Q', 'Clubs'), ('3', 'Hearts')))
+        self.assertGreater(ace_kicker, queen_kicker)
+
+        wheel = evaluator.evaluate_cards(cards_from(('A', 'Spades'), ('2', 'Hearts'), ('3', 'Spades'),
+                                                    ('4', 'Clubs'), ('5', 'Diamonds')))
+        six_high = evaluator.evaluate_cards(cards_from(('6', 'Spades'), ('2', 'Hearts'), ('3', 'Spades'),
+                                                       ('4', 'Clubs'), ('5', 'Diamonds')))
+        self.assertGreater(six_high, wheel)
+
+    def test_matches_best_of_all_combinations(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            indices = rng.sample(range(52), 7)
+            best = max(evaluator.evaluate_indices(combo) for combo in itertools.combinations(indices, 5))
+            self.assertEqual(evaluator.evaluate_indices(indices), best)
+            self.assertEqual(evaluator.evaluate7(*indices), best)
+
+    def test_best_five(self):
+        deck = Deck()
+        deck.shuffle()
+        cards = [deck.deal() for _ in range(7)]
+        strength = evaluator.evaluate_cards(cards)
+        best = evaluator.best_five(cards, strength)
+        self.assertEqual(len(best), 5)
+        self.assertEqual(evaluator.evaluate_cards(best), strength)
+
+    def test_game_evaluate_hand(self):
+        game = Game(["Player 1", "Player 2"])
+        player = game.players[0]
+        for card in cards_from(('9', 'Clubs'), ('9', 'Hearts')):
+            player.hand.add_card(card)
+        for card in cards_from(('9', 'Spades'), ('5', 'Diamonds'), ('5', 'Clubs'), ('K', 'Hearts'), ('2', 'Spades')):
+            game.community_cards.add_card(card)
+        hand_rank, best_hand = game.evaluate_hand(player)
+        self.assertEqual(hand_rank, evaluator.FULL_HOUSE)
+        self.assertEqual(len(best_hand.cards), 5)
+        self.assertEqual(best_hand.strength, game.hand_strength(player))
+        self.assertEqual(best_hand.tiebreaker_score, 9 * 10 + 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@
 Unit tests for the Card class.
 """
 import unittest
+import subprocess
 import sys
 import os
 
@@ -11,6 +12,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from models.card import Card
 from models.hand import Hand
 from models.deck import Deck
+from game import evaluator
+from game.poker_game import Game
+from game.events import EventSink
 
 class TestHand(unittest.TestCase):
     def test_hand_initialization(self):
@@ -168,5 +172,54 @@ class TestHand(unittest.TestCase):
         hand.clear() 
 
 
+    def test_classify(self):
+        hand = Hand()
+        for value, suit in [('K', 'Hearts'), ('K', 'Clubs'), ('9', 'Spades'), ('4', 'Diamonds'), ('2', 'Spades')]:
+            hand.add_card(Card(suit, value))
+        self.assertEqual(hand.classify(), (evaluator.PAIR, [13, 9, 4, 2]))
+        self.assertTrue(hand.has_pair())
+
+        # Adding a card invalidates the cached classification
+        hand.add_card(Card('Diamonds', 'K'))
+        self.assertEqual(hand.classify(), (evaluator.THREE_OF_A_KIND, [13, 9, 4]))
+        self.assertFalse(hand.has_pair())
+        self.assertTrue(hand.has_three_of_a_kind())
+
+        hand.clear()
+        self.assertEqual(hand.classify(), (evaluator.HIGH_CARD, []))
+        self.assertFalse(hand.has_flush())
+
+    def test_incremental_state(self):
+        deck = Deck()
+        deck.shuffle()
+        hand = Hand()
+        for _ in range(7):
+            hand.add_card(deck.deal())
+            self.assertEqual(hand.state(), evaluator.partial_state(hand.get_indices()))
+            self.assertEqual(sum(hand.rank_counts), len(hand.cards))
+        hand.clear()
+        self.assertEqual(hand.state(), (0, 0, (0, 0, 0, 0)))
+        self.assertEqual(hand.rank_mask, 0)
+
+    def test_strength_tracks_each_street(self):
+        game = Game(["Player 1", "Player 2"], events=EventSink())
+        game.deal_cards()
+        player = game.players[0]
+        self.assertIn(game.current_hand_rank(player), (0, 1))
+        for street in (1, 2, 3):
+            game.round = street
+            game.deal_community_cards()
+            self.assertEqual(game.hand_strength(player),
+                             evaluator.evaluate_cards(player.hand.cards + game.community_cards.cards))
+
+    def test_models_do_not_import_game(self):
+        # A fresh interpreter, so modules loaded by other tests don't count
+        code = ("import sys, models.card, models.hand, models.deck, models.player; "
+                "print(' '.join(m for m in sys.modules if m == 'game' or m.startswith('game.')))")
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        loaded = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True,
+                                check=True).stdout.split()
+        self.assertEqual(loaded, [])
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
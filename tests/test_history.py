@@ -0,0 +1,93 @@
+"""
+Unit tests for the binary hand history format.
+"""
+import unittest
+import random
+import tempfile
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.history import HandHistoryWriter, HandHistoryReader, NO_CARD
+from game.simulation import run_simulation
+from config import NUM_PLAYERS, STARTING_CHIPS
+
+class TestHandHistory(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def record(self, num_hands, seed):
+        random.seed(seed)
+        with HandHistoryWriter(self.path) as writer:
+            return run_simulation(num_hands, recorder=writer)
+
+    def test_round_trip(self):
+        result = self.record(30, seed=5)
+        with HandHistoryReader(self.path) as reader:
+            hands = list(reader)
+        self.assertEqual(len(hands), result.hands_played)
+        self.assertEqual([hand.hand_id for hand in hands], list(range(1, len(hands) + 1)))
+
+        first = hands[0]
+        self.assertEqual(len(first.seats), NUM_PLAYERS)
+        self.assertTrue(all(stack == STARTING_CHIPS for _, stack, _ in first.seats))
+        for hand in hands:
+            cards = [c for _, _, hole in hand.seats for c in hole] + list(hand.board)
+            self.assertNotIn(NO_CARD, cards)
+            self.assertEqual(len(cards), len(set(cards)))
+            self.assertLessEqual(len(hand.board), 5)
+            # Blinds open every hand and the winners take exactly the pot
+            self.assertEqual([a[2] for a in hand.actions[:2]], ["small_blind", "big_blind"])
+            self.assertEqual(sum(chips for _, chips in hand.winners), hand.pot)
+            self.assertEqual(hand.actions[-1][4], hand.pot)
+
+    def test_append_reuses_player_ids(self):
+        self.record(5, seed=1)
+        size = os.path.getsize(self.path)
+        self.record(5, seed=2)
+        with HandHistoryReader(self.path) as reader:
+            self.assertEqual(reader.count_hands(), 10)
+            self.assertEqual(len(reader.player_ids), NUM_PLAYERS)
+            hands = list(reader)
+        self.assertGreater(os.path.getsize(self.path), size)
+        self.assertEqual(hands[0].seats[0][0], hands[5].seats[0][0])
+
+    def test_offsets_identify_appended_hands(self):
+        self.record(5, seed=1)
+        self.record(5, seed=2)
+        with HandHistoryReader(self.path) as reader:
+            hands = list(reader)
+        # Both runs number their hands from 1, but offsets stay unique
+        self.assertEqual(hands[0].hand_id, hands[5].hand_id)
+        self.assertEqual(len({hand.offset for hand in hands}), 10)
+        with HandHistoryReader(self.path) as reader:
+            again = reader.hand_at(hands[7].offset)
+            with self.assertRaises(ValueError):
+                reader.hand_at(0)
+        self.assertEqual((again.hand_id, again.seats, again.actions),
+                         (hands[7].hand_id, hands[7].seats, hands[7].actions))
+
+    def test_truncated_file(self):
+        self.record(5, seed=3)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+        with HandHistoryReader(self.path) as reader:
+            self.assertEqual(len(list(reader)), 4)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a hand history")
+        with self.assertRaises(ValueError):
+            with HandHistoryReader(self.path) as reader:
+                list(reader)
+
+if __name__ == "__main__":
+    unittest.main()
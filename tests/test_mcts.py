@@ -0,0 +1,128 @@
+"""
+Unit tests for the Monte Carlo tree search NPC.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.poker_game import Game
+from game.events import EventSink
+from game.simulation import play_hand
+from game.mcts import MCTSPolicy, action_keys
+from models.deck import IndexedDeck
+from utils.rng import RNG
+from config import STARTING_CHIPS
+
+def make_game(num_players=4):
+    return Game([f"Player {i+1}" for i in range(num_players)], deck=IndexedDeck(),
+                events=EventSink(), human_seat=None)
+
+class TestMCTS(unittest.TestCase):
+    def test_plays_valid_actions(self):
+        random.seed(6)
+        policy = MCTSPolicy(budget_ms=1000, max_iterations=50, rng=random.Random(6))
+        chosen = []
+
+        def checked(game, valid_actions):
+            action, amount = policy(game, valid_actions)
+            self.assertIn(action, valid_actions)
+            chosen.append(action)
+            return action, amount
+
+        game = make_game()
+        for _ in range(5):
+            play_hand(game, checked)
+            self.assertEqual(sum(p.chips for p in game.players), 4 * STARTING_CHIPS)
+            game.end_hand()
+            if len(game.players) < 2:
+                break
+        self.assertEqual(policy.stats.decisions, len(chosen))
+        self.assertEqual(policy.stats.iterations, 50 * len(chosen))
+        self.assertGreater(policy.stats.iterations_per_second, 0)
+
+    def test_time_budget(self):
+        random.seed(2)
+        game = make_game()
+        game.start_hand()
+        game.deal_cards()
+        game.post_blinds()
+        game.current_player_index = (game.dealer_position + 3) % len(game.players)
+        policy = MCTSPolicy(budget_ms=20, rng=random.Random(2))
+        policy(game, game.get_valid_actions())
+        self.assertGreater(policy.stats.last_iterations, 1)
+        self.assertLess(policy.stats.elapsed, 0.5)
+
+    def test_reuses_subtree_within_hand(self):
+        random.seed(9)
+        policy = MCTSPolicy(budget_ms=1000, max_iterations=200, rng=random.Random(9))
+        game = make_game(2)
+        for _ in range(5):
+            play_hand(game, policy)
+            game.end_hand()
+            if len(game.players) < 2:
+                break
+        self.assertGreater(policy.stats.reused_visits, 0)
+
+    def test_tables_sharing_a_policy_stay_reproducible(self):
+        def seeded_game(seed):
+            return Game(["Player 1", "Player 2", "Player 3"], events=EventSink(), human_seat=None, rng=RNG(seed))
+
+        def chips(game):
+            return [p.chips for p in game.players]
+
+        # Each table alone, with its own policy
+        alone = []
+        for seed in (1, 2):
+            game = seeded_game(seed)
+            policy = MCTSPolicy(budget_ms=1000, max_iterations=30)
+            for _ in range(3):
+                play_hand(game, policy)
+            alone.append(chips(game))
+
+        # Both tables taking turns with one policy, as on a TableHost
+        shared = MCTSPolicy(budget_ms=1000, max_iterations=30)
+        games = [seeded_game(1), seeded_game(2)]
+        for _ in range(3):
+            for game in games:
+                play_hand(game, shared)
+        self.assertEqual([chips(game) for game in games], alone)
+
+    def test_preflop_policy_replaces_search(self):
+        asked = []
+
+        def preflop(game, valid_actions):
+            asked.append(game.round)
+            return ("check", 0) if "check" in valid_actions else ("call", 0)
+
+        policy = MCTSPolicy(budget_ms=1000, max_iterations=20, rng=random.Random(3), preflop_policy=preflop)
+        rounds = []
+
+        def recorded(game, valid_actions):
+            rounds.append(game.round)
+            return policy(game, valid_actions)
+
+        random.seed(3)
+        play_hand(make_game(), recorded)
+        self.assertEqual(asked, [r for r in rounds if r == 0])
+        # Only the decisions after the flop were searched
+        self.assertEqual(policy.stats.decisions, sum(1 for r in rounds if r > 0))
+
+    def test_raise_sizes_are_affordable(self):
+        random.seed(1)
+        game = make_game()
+        game.start_hand()
+        game.deal_cards()
+        game.post_blinds()
+        game.current_player_index = (game.dealer_position + 3) % len(game.players)
+        state = game.snapshot()
+        raises = [amount for action, amount in action_keys(state) if action == "raise"]
+        self.assertTrue(raises)
+        for amount in raises:
+            state.apply("raise", amount)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for opt-in Game profiling.
+"""
+import unittest
+import random
+import subprocess
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.card import Card
+from models.hand import Hand
+from game.poker_game import Game
+from game.events import EventSink
+from game.simulation import play_hand, run_simulation
+from utils.profiling import Profiler, ImportProfiler
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+class TestProfiling(unittest.TestCase):
+    def test_phases_recorded(self):
+        random.seed(2)
+        game = Game([f"Player {i+1}" for i in range(4)], events=EventSink(), human_seat=None)
+        profiler = game.enable_profiling()
+        play_hand(game)
+        snapshot = profiler.snapshot()
+        self.assertEqual(snapshot["phases"]["deal_cards"]["calls"], 1)
+        self.assertEqual(snapshot["phases"]["post_blinds"]["calls"], 1)
+        self.assertIn("betting_round[pre-flop]", snapshot["phases"])
+        game.disable_profiling()
+        self.assertNotIn("deal_cards", game.__dict__)
+
+    def test_hand_counters(self):
+        game = Game(["Player 1", "Player 2"], events=EventSink())
+        profiler = game.enable_profiling()
+        hand = Hand()
+        hand.add_card(Card('Hearts', 'A'))
+        hand.has_pair()
+        hand.has_flush()
+        hand.has_flush()
+        counters = profiler.snapshot()["counters"]
+        self.assertEqual(counters["hand_allocations"], 1)
+        self.assertEqual(counters["hand.has_flush"], 2)
+
+        # Switching off restores the plain methods
+        game.disable_profiling()
+        Hand().has_pair()
+        self.assertEqual(profiler.snapshot()["counters"]["hand_allocations"], 1)
+
+    def test_hand_counters_across_games(self):
+        first = Game(["Player 1", "Player 2"], events=EventSink())
+        second = Game(["Player 1", "Player 2"], events=EventSink())
+        first_profiler = first.enable_profiling()
+        second_profiler = second.enable_profiling()
+        Hand()
+        # Hands belong to no game, so every active profiler counts them
+        self.assertEqual(first_profiler.snapshot()["counters"]["hand_allocations"], 1)
+        self.assertEqual(second_profiler.snapshot()["counters"]["hand_allocations"], 1)
+
+        # One game stopping leaves the other's counters running
+        second.disable_profiling()
+        Hand()
+        self.assertEqual(first_profiler.snapshot()["counters"]["hand_allocations"], 2)
+        self.assertEqual(second_profiler.snapshot()["counters"]["hand_allocations"], 1)
+        first.disable_profiling()
+        self.assertFalse(hasattr(Hand.__init__, "__wrapped__"))
+        Hand()
+        self.assertEqual(first_profiler.snapshot()["counters"]["hand_allocations"], 2)
+
+    def test_shared_profiler_counts_once(self):
+        games = [Game(["Player 1", "Player 2"], events=EventSink()) for _ in range(2)]
+        profiler = Profiler()
+        for game in games:
+            game.enable_profiling(profiler)
+        Hand()
+        self.assertEqual(profiler.snapshot()["counters"]["hand_allocations"], 1)
+        games[0].disable_profiling()
+        Hand()
+        self.assertEqual(profiler.snapshot()["counters"]["hand_allocations"], 2)
+        games[1].disable_profiling()
+
+    def test_periodic_reports(self):
+        random.seed(4)
+        reports = []
+        run_simulation(10, num_players=8, profiler=Profiler(), report_every=2, on_report=reports.append)
+        self.assertTrue(reports)
+        self.assertIn("profile after 2 hands", reports[0])
+
+class TestStartup(unittest.TestCase):
+    def test_import_profiler_records_new_modules(self):
+        sys.modules.pop("colorsys", None)
+        imports = ImportProfiler().install()
+        try:
+            import colorsys
+        finally:
+            imports.uninstall()
+        names = [name for name, _, _, _ in imports.imports]
+        self.assertIn("colorsys", names)
+        self.assertGreater(imports.total(), 0.0)
+        self.assertIn("colorsys", imports.summary())
+
+    def test_entry_point_defers_heavy_modules(self):
+        # A fresh interpreter, so modules loaded by other tests don't count
+        code = ("import sys, poker; "
+                "print(' '.join(m for m in ('asyncio', 'concurrent.futures', 'numpy', 'game.server', "
+                "'game.tournament', 'game.mcts', 'game.poker_game', 'game.eval_tables') if m in sys.modules))")
+        loaded = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.split()
+        self.assertEqual(loaded, [])
+
+    def test_headless_hand_loads_only_what_it_uses(self):
+        # Start-up time is tracked by the startup.headless_hand benchmark; here, only what gets imported
+        code = ("import sys, poker; poker.main(['--headless', '1']); "
+                "print(' '.join(m for m in ('asyncio', 'numpy', 'utils.profiling', 'game.equity', 'game.server', "
+                "'game.mcts', 'game.tournament', 'game.history', 'game.preflop', 'game.state') "
+                "if m in sys.modules), file=sys.stderr)")
+        completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                                   check=True)
+        self.assertEqual(completed.stderr.split(), [])
+
+    def test_startup_profile_flag(self):
+        completed = subprocess.run([sys.executable, "poker.py", "--headless", "1", "--startup-profile"],
+                                   cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertIn("game.poker_game", completed.stderr)
+        self.assertIn("(all imports)", completed.stderr)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Unit tests for weighted ranges and range-vs-range equity.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.card import Card
+from game import evaluator
+from game.canonical import class_label
+from game.equity import exact_equity
+from game.ranges import Range, COMBOS, NUM_COMBOS, parse_classes, range_equity
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ACES = [Card('Hearts', 'A'), Card('Spades', 'A')]
+KINGS = [Card('Hearts', 'K'), Card('Spades', 'K')]
+# 2♣ 7♦ 9♥ J♠ 4♣
+BOARD = [Card('Clubs', '2'), Card('Diamonds', '7'), Card('Hearts', '9'), Card('Spades', 'J'), Card('Clubs', '4')]
+
+class TestRange(unittest.TestCase):
+    def test_combo_table(self):
+        self.assertEqual(NUM_COMBOS, 1326)
+        self.assertEqual(len(set(COMBOS)), 1326)
+
+    def test_parse_notation(self):
+        self.assertEqual([class_label(c) for c in parse_classes("TT+")], ["TT", "JJ", "QQ", "KK", "AA"])
+        self.assertEqual([class_label(c) for c in parse_classes("ATs+")], ["ATs", "AJs", "AQs", "AKs"])
+        self.assertEqual(sorted(class_label(c) for c in parse_classes("KQ")), ["KQo", "KQs"])
+        hand_range = Range.parse("QQ+, AKs, AQo:0.5")
+        # 3 pairs x 6 + 4 suited + 12 offsuit
+        self.assertEqual(len(hand_range), 34)
+        self.assertEqual(hand_range.weight(*ACES), 1.0)
+        self.assertEqual(hand_range.weight(Card('Hearts', 'A'), Card('Spades', 'Q')), 0.5)
+        self.assertEqual(hand_range.weight(*KINGS), 1.0)
+        self.assertEqual(hand_range.weight(Card('Hearts', 'A'), Card('Spades', 'K')), 0.0)
+
+    def test_bad_notation(self):
+        for token in ("AAs", "AX", "A", "AKx"):
+            with self.assertRaises(ValueError):
+                Range.parse(token)
+
+    def test_bad_weights(self):
+        for text in ("AA:1.5", "KK:-1", "AA:-1, QQ", "QQ:nan"):
+            with self.assertRaises(ValueError):
+                Range.parse(text)
+        with self.assertRaises(ValueError):
+            Range([2.0] * NUM_COMBOS)
+
+    def test_set_combo(self):
+        hand_range = Range()
+        hand_range.set(*KINGS, weight=0.25)
+        self.assertEqual(hand_range.combos(), [((KINGS[0], KINGS[1]), 0.25)])
+        with self.assertRaises(ValueError):
+            hand_range.set(KINGS[0], KINGS[0])
+
+@unittest.skipUnless(numpy, "NumPy is not installed")
+class TestRangeEquity(unittest.TestCase):
+    def _single(self, cards):
+        hand_range = Range()
+        hand_range.set(*cards)
+        return hand_range
+
+    def test_single_combos_match_exact_equity(self):
+        for board in (BOARD, BOARD[:4], BOARD[:3]):
+            result = range_equity([self._single(ACES), self._single(KINGS)], board)
+            expected = exact_equity([ACES, KINGS], board)
+            for got, want in zip(result.equity, expected.equity):
+                self.assertAlmostEqual(got, want)
+            self.assertAlmostEqual(result.tie[0], expected.tie[0])
+
+    def test_weighted_ranges_match_brute_force(self):
+        rng = random.Random(4)
+        hero = Range([rng.random() if rng.random() < 0.2 else 0.0 for _ in range(NUM_COMBOS)])
+        villain = Range([rng.random() if rng.random() < 0.2 else 0.0 for _ in range(NUM_COMBOS)])
+        board = [card.index for card in BOARD]
+        shares = total = 0.0
+        for i, hero_combo in enumerate(COMBOS):
+            if not hero.weights[i] or set(hero_combo) & set(board):
+                continue
+            hero_strength = evaluator.evaluate_indices(list(hero_combo) + board)
+            for j, villain_combo in enumerate(COMBOS):
+                if not villain.weights[j] or set(villain_combo) & (set(board) | set(hero_combo)):
+                    continue
+                villain_strength = evaluator.evaluate_indices(list(villain_combo) + board)
+                weight = hero.weights[i] * villain.weights[j]
+                total += weight
+                if hero_strength > villain_strength:
+                    shares += weight
+                elif hero_strength == villain_strength:
+                    shares += weight / 2
+        result = range_equity([hero, villain], BOARD)
+        self.assertAlmostEqual(result.equity[0], 100.0 * shares / total)
+        self.assertAlmostEqual(sum(result.equity), 100.0)
+
+    def test_card_removal(self):
+        # With the A♥ dead, three aces combos are left, each meeting all six kings
+        result = range_equity([Range.parse("AA"), Range.parse("KK")], BOARD, dead=[ACES[0]])
+        self.assertEqual(result.samples, 18)
+        self.assertEqual(len(result.combo_equity(0)), 3)
+        self.assertTrue(all(ACES[0] not in combo for combo in result.combo_equity(0)))
+        self.assertAlmostEqual(result.equity[0], 100.0)
+        result = range_equity([Range.parse("AA"), Range.parse("AK")], BOARD)
+        # Each AK combo holds one ace, so it meets only the three aces combos it doesn't block
+        self.assertEqual(len(result.combo_equity(1)), 16)
+        self.assertEqual(result.samples, 16 * 3)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            range_equity([Range.full(), Range.full()], BOARD[:2])
+        with self.assertRaises(ValueError):
+            range_equity([Range.full(), Range.full()], BOARD, dead=[BOARD[0]])
+        with self.assertRaises(ValueError):
+            range_equity([Range.full()], BOARD)
+
+if __name__ == '__main__':
+    unittest.main()
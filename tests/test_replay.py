@@ -0,0 +1,54 @@
+"""
+Unit tests for replaying hand histories.
+"""
+import unittest
+import random
+import tempfile
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.history import HandHistoryWriter, HandHistoryReader
+from game.replay import replay_file, replay_hand
+from game.simulation import run_simulation
+
+class TestReplay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        os.remove(cls.path)
+        random.seed(11)
+        with HandHistoryWriter(cls.path) as writer:
+            cls.result = run_simulation(40, recorder=writer)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+
+    def test_replay_matches_log(self):
+        summary = replay_file(self.path)
+        self.assertEqual(summary.hands, self.result.hands_played)
+        self.assertEqual(summary.failures, [], summary.summary())
+
+    def test_detects_changed_outcome(self):
+        with HandHistoryReader(self.path) as reader:
+            record = next(iter(reader))
+        seat, amount = record.winners[0]
+        record.winners[0] = ((seat + 1) % len(record.seats), amount)
+        result = replay_hand(record)
+        self.assertFalse(result.ok)
+        self.assertTrue(any("winners" in m for m in result.mismatches))
+        self.assertEqual(result.offset, record.offset)
+
+    def test_detects_missing_actions(self):
+        with HandHistoryReader(self.path) as reader:
+            record = next(r for r in reader if len(r.actions) > 4)
+        record.actions = record.actions[:3]
+        result = replay_hand(record)
+        self.assertFalse(result.ok)
+
+if __name__ == "__main__":
+    unittest.main()
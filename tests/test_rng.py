@@ -0,0 +1,89 @@
+"""
+Unit tests for the seedable, splittable random streams.
+"""
+import unittest
+import pickle
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.rng import RNG
+from models.deck import Deck, IndexedDeck
+from game.simulation import run_simulation
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TestRNG(unittest.TestCase):
+    def test_same_seed_same_stream(self):
+        self.assertEqual([RNG(7).random() for _ in range(3)], [RNG(7).random() for _ in range(3)])
+        self.assertNotEqual(RNG(7).random(), RNG(8).random())
+
+    def test_children_depend_only_on_their_path(self):
+        parent = RNG(3)
+        first = parent.child("table", 1).random()
+        for _ in range(10):
+            parent.random()
+        self.assertEqual(parent.child("table", 1).random(), first)
+        self.assertEqual(RNG(3, ("table", 1)).random(), first)
+        draws = {child.random() for child in parent.spawn(20)}
+        self.assertEqual(len(draws), 20)
+        self.assertNotIn(first, draws)
+
+    def test_fresh_seed_is_kept(self):
+        rng = RNG()
+        self.assertEqual(RNG(rng.root_seed).random(), rng.random())
+
+    def test_pickle_keeps_position(self):
+        rng = RNG(5).child("worker", 2)
+        rng.random()
+        copy = pickle.loads(pickle.dumps(rng))
+        self.assertEqual(copy.key, ("worker", 2))
+        self.assertEqual(copy.random(), rng.random())
+        self.assertEqual(copy.child("x").random(), rng.child("x").random())
+
+    def test_decks_shuffle_reproducibly(self):
+        for deck_class in (Deck, IndexedDeck):
+            orders = []
+            for _ in range(2):
+                deck = deck_class(RNG(11))
+                deck.shuffle()
+                orders.append([deck.deal().index for _ in range(52)])
+            self.assertEqual(orders[0], orders[1])
+            self.assertEqual(sorted(orders[0]), list(range(52)))
+
+    def test_seeded_simulation_is_reproducible(self):
+        first = run_simulation(50, 4, rng=RNG(21))
+        second = run_simulation(50, 4, rng=RNG(21))
+        self.assertEqual(first.hand_winners, second.hand_winners)
+        self.assertEqual(first.chip_history, second.chip_history)
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_bulk_permutations(self):
+        rows = RNG(1).permutations(1000)
+        self.assertEqual(rows.shape, (1000, 52))
+        self.assertTrue((numpy.sort(rows, axis=1) == numpy.arange(52)).all())
+        self.assertTrue((rows == RNG(1).permutations(1000)).all())
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_bulk_shuffled_deck(self):
+        rng = RNG(2, bulk=8)
+        deck = IndexedDeck(rng)
+        orders = set()
+        # More shuffles than one batch holds, so the buffer is refilled
+        for _ in range(20):
+            deck.reset()
+            deck.shuffle()
+            order = deck.deal_indices(52)
+            self.assertEqual(sorted(order), list(range(52)))
+            orders.add(tuple(order))
+        self.assertEqual(len(orders), 20)
+        result = run_simulation(20, 4, rng=RNG(3, bulk=16))
+        self.assertGreater(result.hands_played, 0)
+
+if __name__ == '__main__':
+    unittest.main()
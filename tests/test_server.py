@@ -0,0 +1,128 @@
+"""
+Unit tests for the asyncio table host.
+"""
+import unittest
+import asyncio
+import json
+import random
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.server import RemoteSeat, TableHost, auto_action, parse_address
+from game.poker_game import Game
+from config import STARTING_CHIPS
+
+async def human_client(port, reply=None):
+    """Connect, answer every prompt with reply (or never answer), and collect what was received."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b'{"name": "Alice"}\n')
+    received = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        message = json.loads(line)
+        received.append(message)
+        if message["type"] == "prompt" and reply is not None:
+            action = "check" if "check" in message["valid"] else reply
+            writer.write((json.dumps({"seq": message["seq"], "action": action}) + "\n").encode())
+    writer.close()
+    return received
+
+class FakeWriter:
+    """Collects written lines; drain() never finishes when stalled, like a client that stopped reading."""
+
+    def __init__(self, stalled=False):
+        self.lines = []
+        self.stalled = stalled
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+    async def drain(self):
+        if self.stalled:
+            await asyncio.sleep(3600)
+
+class TestServer(unittest.TestCase):
+    def test_many_npc_tables(self):
+        random.seed(2)
+        host = TableHost(players_per_table=4, max_hands=5)
+        for _ in range(200):
+            host.add_npc_table()
+        tables = asyncio.run(host.run_tables())
+        for table in tables:
+            self.assertGreater(table.hands_played, 0)
+            self.assertEqual(sum(p.chips for p in table.game.players), 4 * STARTING_CHIPS)
+
+    def run_human_table(self, reply, timeout):
+        async def scenario():
+            host = TableHost(players_per_table=3, timeout=timeout, max_hands=3)
+            for _ in range(20):
+                host.add_npc_table()
+            server = await host.start("127.0.0.1:0")
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                received, tables = await asyncio.gather(human_client(port, reply), host.run_tables())
+            return received, tables
+        return asyncio.run(scenario())
+
+    def test_human_seat_over_tcp(self):
+        random.seed(3)
+        received, tables = self.run_human_table("call", timeout=5)
+        prompts = [m for m in received if m["type"] == "prompt"]
+        self.assertTrue(prompts)
+        self.assertEqual(len(prompts[0]["hand"]), 2)
+        self.assertIn({"type": "event", "message": "Table closed."}, received)
+        self.assertTrue(all(table.hands_played for table in tables))
+
+    def test_timeout_auto_acts(self):
+        random.seed(4)
+        received, _ = self.run_human_table(None, timeout=0.02)
+        self.assertTrue(any(m.get("message", "").startswith("Out of time") for m in received))
+        self.assertIn({"type": "event", "message": "Table closed."}, received)
+
+    def prompt_seat(self, replies, writer, timeout=0.2):
+        """Ask a RemoteSeat for two decisions, with replies already waiting in its stream."""
+        async def scenario():
+            reader = asyncio.StreamReader()
+            for reply in replies:
+                reader.feed_data((json.dumps(reply) + "\n").encode())
+            seat = RemoteSeat(reader, writer, timeout)
+            game = Game(["Alice", "Bob"])
+            game.start_hand()
+            actions = [await seat(game, ["fold", "call", "raise"]) for _ in range(2)]
+            return seat, actions
+        return asyncio.run(scenario())
+
+    def test_late_reply_is_dropped(self):
+        # A reply to prompt 1 arriving after it timed out must not answer prompt 2
+        writer = FakeWriter()
+        seat, actions = self.prompt_seat([{"seq": 1, "action": "raise", "amount": 500},
+                                          {"seq": 2, "action": "call"}], writer)
+        self.assertEqual([m["seq"] for m in writer.lines if m["type"] == "prompt"], [1, 2])
+        self.assertEqual(actions[0], ("raise", 500))
+        self.assertEqual(actions[1], ("call", 0))
+        writer = FakeWriter()
+        seat, actions = self.prompt_seat([{"seq": 0, "action": "raise", "amount": 500},
+                                          {"seq": 1, "action": "call"}], writer)
+        self.assertEqual(actions[0], ("call", 0))
+        # Nothing answers prompt 2, so it times out rather than taking a stale reply
+        self.assertEqual(actions[1], ("fold", 0))
+        self.assertEqual((seat.stale_replies, seat.timeouts), (1, 1))
+
+    def test_stalled_client_is_dropped(self):
+        seat, actions = self.prompt_seat([], FakeWriter(stalled=True), timeout=0.02)
+        self.assertTrue(seat.closed)
+        self.assertEqual(actions, [("fold", 0), ("fold", 0)])
+
+    def test_helpers(self):
+        self.assertEqual(auto_action(["fold", "check", "raise"]), ("check", 0))
+        self.assertEqual(auto_action(["fold", "call"]), ("fold", 0))
+        self.assertEqual(parse_address("localhost:9000"), ("tcp", ("localhost", 9000)))
+        self.assertEqual(parse_address("unix:/tmp/poker.sock"), ("unix", "/tmp/poker.sock"))
+
+if __name__ == "__main__":
+    unittest.main()
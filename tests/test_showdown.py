@@ -0,0 +1,64 @@
+"""
+Unit tests for the showdown engine.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.card import Card
+from game import evaluator, showdown
+from game.poker_game import Game
+from game.events import EventSink
+
+def setup_showdown(holes, board):
+    game = Game([f"Player {i+1}" for i in range(len(holes))], events=EventSink())
+    for player, hole in zip(game.players, holes):
+        for value, suit in hole:
+            player.hand.add_card(Card(suit, value))
+    for value, suit in board:
+        game.community_cards.add_card(Card(suit, value))
+    return game
+
+class TestShowdown(unittest.TestCase):
+    def test_matches_individual_evaluation(self):
+        for _ in range(50):
+            game = Game([f"Player {i+1}" for i in range(8)], events=EventSink())
+            game.deal_cards()
+            for street in (1, 2, 3):
+                game.round = street
+                game.deal_community_cards()
+            strengths = showdown.evaluate_holes(showdown.board_state(game.community_cards),
+                                                [p.hand for p in game.players])
+            for player, strength in zip(game.players, strengths):
+                self.assertEqual(strength, evaluator.evaluate_cards(player.hand.cards + game.community_cards.cards))
+            # Also works from a plain list of board cards
+            self.assertEqual(strengths, showdown.evaluate_holes(
+                showdown.board_state(game.community_cards.cards), [p.hand.cards for p in game.players]))
+
+    def test_kicker_decides(self):
+        # Both players pair kings; the ace kicker wins even though the other player holds the spade king
+        game = setup_showdown([[('K', 'Hearts'), ('A', 'Clubs')], [('K', 'Spades'), ('Q', 'Clubs')]],
+                              [('K', 'Diamonds'), ('8', 'Clubs'), ('5', 'Hearts'), ('3', 'Spades'), ('2', 'Diamonds')])
+        self.assertEqual(game.determine_winner(), [game.players[0]])
+        tiers = game.showdown_ranking()
+        self.assertEqual([[p.name for p, _ in tier] for tier in tiers], [["Player 1"], ["Player 2"]])
+
+    def test_board_plays_splits_pot(self):
+        game = setup_showdown([[('2', 'Hearts'), ('3', 'Clubs')], [('2', 'Spades'), ('3', 'Diamonds')],
+                               [('4', 'Spades'), ('4', 'Diamonds')]],
+                              [('10', 'Diamonds'), ('J', 'Clubs'), ('Q', 'Hearts'), ('K', 'Spades'), ('A', 'Diamonds')])
+        tiers = game.showdown_ranking()
+        self.assertEqual(len(tiers), 1)
+        self.assertEqual(game.determine_winner(), game.players)
+
+    def test_exact_tie_uses_suit_tiebreaker(self):
+        game = setup_showdown([[('A', 'Hearts'), ('3', 'Clubs')], [('A', 'Spades'), ('3', 'Diamonds')]],
+                              [('A', 'Diamonds'), ('J', 'Clubs'), ('8', 'Hearts'), ('6', 'Spades'), ('5', 'Diamonds')])
+        self.assertEqual(len(game.showdown_ranking()[0]), 2)
+        self.assertEqual(game.determine_winner(), [game.players[1]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Unit tests for headless simulation.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.poker_game import Game
+from game.events import EventSink, ListSink
+from game.simulation import play_hand, run_simulation
+from models.deck import IndexedDeck
+from config import STARTING_CHIPS
+
+class TestSimulation(unittest.TestCase):
+    def test_play_hand_conserves_chips(self):
+        random.seed(3)
+        game = Game([f"Player {i+1}" for i in range(6)], deck=IndexedDeck(), events=EventSink(), human_seat=None)
+        for _ in range(20):
+            winners = play_hand(game)
+            self.assertTrue(winners)
+            self.assertEqual(game.pot, 0)
+            self.assertEqual(sum(p.chips for p in game.players), 6 * STARTING_CHIPS)
+            game.end_hand()
+            if len(game.players) == 1:
+                break
+
+    def test_events_are_routed_to_sink(self):
+        random.seed(5)
+        sink = ListSink()
+        game = Game(["Player 1", "Player 2", "Player 3"], events=sink, human_seat=None)
+        play_hand(game)
+        self.assertEqual(sink.messages[0], "=== NEW HAND ===")
+        self.assertIn("won the pot", sink.messages[-1])
+
+    def test_run_simulation(self):
+        random.seed(11)
+        result = run_simulation(200, num_players=4)
+        self.assertGreater(result.hands_played, 0)
+        self.assertLessEqual(result.hands_played, 200)
+        self.assertEqual(len(result.hand_winners), result.hands_played)
+        for history in result.chip_history.values():
+            self.assertEqual(len(history), result.hands_played)
+        self.assertEqual(sum(result.final_chips().values()), 4 * STARTING_CHIPS)
+        if result.champion:
+            self.assertEqual(len(result.eliminations), 3)
+
+    def test_end_hand_rotates_dealer_and_removes_busted(self):
+        game = Game(["Player 1", "Player 2", "Player 3"], events=EventSink(), human_seat=None)
+        game.players[1].chips = 0
+        busted = game.end_hand()
+        self.assertEqual([p.name for p in busted], ["Player 2"])
+        self.assertEqual([p.name for p in game.players], ["Player 1", "Player 3"])
+        self.assertEqual(game.players[game.dealer_position].name, "Player 3")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+Unit tests for the multi-process tournament runner.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.tournament import run_tournaments, TournamentStats
+
+class TestTournament(unittest.TestCase):
+    def test_single_process(self):
+        stats = run_tournaments(4, workers=1, seed=1, num_players=4)
+        self.assertEqual(stats.tournaments, 4)
+        self.assertEqual(sum(stats.wins) + stats.unfinished, 4)
+        self.assertEqual(len(stats.hands_to_finish), sum(stats.wins))
+        # Everyone but the winner busts in a finished tournament
+        self.assertEqual(sum(stats.busts), 3 * sum(stats.wins))
+
+    def test_results_independent_of_worker_count(self):
+        single = run_tournaments(6, workers=1, seed=9, num_players=3)
+        pooled = run_tournaments(6, workers=2, seed=9, num_players=3)
+        self.assertEqual(single.wins, pooled.wins)
+        self.assertEqual(single.busts, pooled.busts)
+        self.assertEqual(single.hands_to_finish, pooled.hands_to_finish)
+
+    def test_merge(self):
+        a = TournamentStats(2)
+        a.tournaments, a.wins, a.hands_to_finish = 1, [1, 0], [10]
+        b = TournamentStats(2)
+        b.tournaments, b.wins, b.hands_to_finish = 2, [1, 1], [4, 6]
+        a.merge(b)
+        self.assertEqual(a.tournaments, 3)
+        self.assertEqual(a.wins, [2, 1])
+        self.assertEqual(a.average_hands(), 20 / 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Unit tests for the NumPy lockstep table engine.
+"""
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so imports work properly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+from config import STARTING_CHIPS
+from game import evaluator
+from game.replay import replay_hand
+from models.card import Card
+from models.hand import Hand
+from utils.rng import RNG
+
+try:
+    import numpy
+    from game.vector_engine import TableBatch, run_lockstep, next_seat, tiebreak_scores
+except ImportError:
+    numpy = None
+
+@unittest.skipUnless(numpy, "NumPy is not installed")
+class TestVectorEngine(unittest.TestCase):
+    def test_next_seat_wraps_round_the_table(self):
+        masks = numpy.array([0b1011, 0b1011, 0b0100, 0b1000])
+        seats = numpy.array([1, 3, 2, 0])
+        self.assertEqual(next_seat(masks, seats).tolist(), [3, 0, 2, 3])
+
+    def test_tiebreak_scores_match_hand(self):
+        rng = random.Random(5)
+        hands = [rng.sample(range(evaluator.NUM_CARDS), 7) for _ in range(2000)]
+        # Plus straights and straight flushes, which random hands rarely make
+        for _ in range(500):
+            suit, high = rng.randrange(4), rng.randrange(4, 13)
+            run = [(suit if rng.random() < 0.5 else rng.randrange(4)) * 13 + (high - i) % 13 for i in range(5)]
+            rest = rng.sample([c for c in range(evaluator.NUM_CARDS) if c not in run], 2)
+            hands.append(rng.sample(run + rest, 7))
+        strengths = [evaluator.evaluate_indices(hand) for hand in hands]
+        scores = tiebreak_scores(numpy.array(hands), numpy.array(strengths))
+        for hand, strength, score in zip(hands, strengths, scores.tolist()):
+            best = Hand()
+            for card in evaluator.best_five([Card.DECK[c] for c in hand], strength):
+                best.add_card(card)
+            self.assertEqual(best.calculate_score(evaluator.hand_rank(strength)), score)
+
+    def test_rng_streams(self):
+        def final_chips(rng):
+            tables = TableBatch(20, 4, rng=rng)
+            for _ in range(10):
+                tables.play_hand()
+            return tables.chips.tolist()
+        self.assertEqual(final_chips(RNG(5).child("lockstep")), final_chips(RNG(5).child("lockstep")))
+        self.assertNotEqual(final_chips(RNG(5).child("lockstep")), final_chips(RNG(6).child("lockstep")))
+
+    def test_chips_are_conserved(self):
+        tables = TableBatch(200, 6, seed=1)
+        for _ in range(40):
+            tables.play_hand()
+            self.assertTrue((tables.chips.sum(axis=1) == 6 * STARTING_CHIPS).all())
+            self.assertTrue((tables.chips >= 0).all())
+        # Busted players are unseated
+        self.assertTrue((tables.seats_of(tables.seated) == (tables.chips > 0)).all())
+
+    def test_records_replay_through_object_engine(self):
+        tables = TableBatch(50, 5, seed=2, record=True)
+        for _ in range(20):
+            tables.play_hand()
+        self.assertGreater(len(tables.records), 500)
+        for record in tables.records:
+            result = replay_hand(record)
+            self.assertTrue(result.ok, f"hand {record.hand_id}: {result.mismatches}")
+
+    def test_heads_up_tables(self):
+        tables = TableBatch(100, 2, seed=3, record=True)
+        for _ in range(10):
+            tables.play_hand()
+        for record in tables.records:
+            self.assertTrue(replay_hand(record).ok)
+
+    def test_invalid_choices_replay_through_object_engine(self):
+        # Any action with any amount, including raises that lower the current bet
+        def careless(tables, rows, seats, valid, chips, min_raise):
+            codes = tables.rng.integers(0, 4, len(rows))
+            amounts = numpy.where(tables.rng.random(len(rows)) < 0.5, tables.rng.integers(-5, 60, len(rows)),
+                                  tables.rng.integers(0, chips + 1))
+            return codes, amounts
+        tables = TableBatch(40, 6, seed=6, record=True)
+        for _ in range(15):
+            tables.play_hand(careless)
+        self.assertGreater(tables.fallback_actions.sum(), 0)
+        for record in tables.records:
+            result = replay_hand(record)
+            self.assertTrue(result.ok, f"hand {record.hand_id}: {result.mismatches}")
+
+    def test_large_tables_replay(self):
+        # Past LOOKUP_SEATS the next seat is found with bit arithmetic instead of a table
+        tables = TableBatch(30, 12, seed=7, record=True)
+        for _ in range(10):
+            tables.play_hand()
+        for record in tables.records:
+            self.assertTrue(replay_hand(record).ok)
+
+    def test_run_lockstep(self):
+        result = run_lockstep(100, 5, num_players=4, seed=4)
+        # A table stops early once one player has every chip
+        self.assertGreater(result.hands_played, 400)
+        self.assertLessEqual(result.hands_played, 500)
+        self.assertIn("100 tables", result.summary())
+
+if __name__ == '__main__':
+    unittest.main()
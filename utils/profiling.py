@@ -0,0 +1,238 @@
+"""
+Opt-in per-phase profiling for Game.
+
+A Profiler records call counts and wall time for named phases plus plain
+event counters. Instrumentation is installed by wrapping methods only while
+profiling is switched on, so an unprofiled game runs the original methods
+with no extra checks at all.
+
+ImportProfiler does the same for imports: while installed it wraps the
+import statement and records how long each newly loaded module took.
+"""
+import builtins
+import functools
+import sys
+import time
+
+# Names used for Game.round in phase labels
+ROUND_NAMES = ["pre-flop", "flop", "turn", "river"]
+
+# Game methods timed as phases (betting_steps is what betting_round runs, reported as betting_round)
+GAME_PHASES = ["deal_cards", "post_blinds", "betting_steps", "deal_community_cards",
+               "evaluate_hand", "determine_winner"]
+
+# Hand predicates whose calls are counted
+HAND_PREDICATES = ["has_pair", "has_two_pairs", "has_three_of_a_kind", "has_straight", "has_flush",
+                   "has_full_house", "has_four_of_a_kind", "has_straight_flush", "has_royal_flush"]
+
+class Profiler:
+    """Accumulates phase timings and counters."""
+    
+    def __init__(self):
+        self.reset()
+        
+    def reset(self):
+        # phase name -> [calls, total seconds]
+        self.phases = {}
+        # counter name -> count
+        self.counters = {}
+        
+    def record(self, phase, seconds):
+        entry = self.phases.get(phase)
+        if entry is None:
+            self.phases[phase] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            
+    def count(self, counter, amount=1):
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+        
+    def timed(self, phase, func, label=None):
+        """Wrap func so each call is recorded under phase (or under label(), if given)."""
+        clock = time.perf_counter
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(label() if label else phase, clock() - start)
+        return wrapper
+    
+    def timed_steps(self, phase, func, label=None):
+        """Like timed(), for a generator function: times each generator from start to finish."""
+        clock = time.perf_counter
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return (yield from func(*args, **kwargs))
+            finally:
+                self.record(label() if label else phase, clock() - start)
+        return wrapper
+    
+    def counted(self, counter, func):
+        """Wrap func so each call bumps a counter."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.count(counter)
+            return func(*args, **kwargs)
+        return wrapper
+        
+    def snapshot(self):
+        """
+        Return the current numbers as plain data.
+        
+        Returns:
+            dict: {"phases": {name: {"calls", "seconds", "mean_us"}}, "counters": {name: count}}
+        """
+        phases = {}
+        for name, (calls, seconds) in self.phases.items():
+            phases[name] = {"calls": calls, "seconds": seconds, "mean_us": seconds / calls * 1e6}
+        return {"phases": phases, "counters": dict(self.counters)}
+    
+    def summary(self):
+        """Return a text table of phases (slowest total first) and counters."""
+        lines = [f"{'phase':<32}{'calls':>10}{'total s':>10}{'mean us':>10}"]
+        for name, (calls, seconds) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<32}{calls:>10}{seconds:>10.3f}{seconds / calls * 1e6:>10.1f}")
+        for name, count in sorted(self.counters.items()):
+            lines.append(f"{name:<32}{count:>10}")
+        return "\n".join(lines)
+
+def instrument_game(game, profiler):
+    """Wrap a Game instance's phase methods so they report to profiler."""
+    for phase in GAME_PHASES:
+        method = getattr(game, phase)
+        if phase == "betting_steps":
+            # One entry per street
+            label = lambda: f"betting_round[{ROUND_NAMES[min(game.round, 3)]}]"
+            setattr(game, phase, profiler.timed_steps("betting_round", method, label))
+        else:
+            setattr(game, phase, profiler.timed(phase, method))
+
+def uninstrument_game(game):
+    """Remove the wrappers installed by instrument_game()."""
+    for phase in GAME_PHASES:
+        game.__dict__.pop(phase, None)
+
+# Per instrumented Hand class: original methods, and one profiler entry per instrument_hands() call
+_hand_originals = {}
+_hand_profilers = {}
+# Per instrumented Hand class: the distinct profilers the installed wrappers report to
+_hand_targets = {}
+
+def _hand_counted(hand_class, counter, func):
+    targets = _hand_targets[hand_class]
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for profiler in targets:
+            profiler.count(counter)
+        return func(*args, **kwargs)
+    return wrapper
+
+def _update_hand_targets(hand_class):
+    # Updated in place, so wrappers already installed see the change
+    targets = _hand_targets[hand_class]
+    targets[:] = list({id(p): p for p in _hand_profilers[hand_class]}.values())
+
+def instrument_hands(hand_class, profiler):
+    """
+    Count Hand allocations and has_* predicate calls into profiler (affects every Hand).
+
+    Calls are reference-counted: the wrappers are installed once and report to
+    every profiler registered by a game that is still profiling (each distinct
+    profiler once), until the last one is removed with uninstrument_hands().
+    """
+    if hand_class not in _hand_originals:
+        _hand_originals[hand_class] = {name: hand_class.__dict__[name] for name in ["__init__"] + HAND_PREDICATES}
+        _hand_profilers[hand_class] = []
+        _hand_targets[hand_class] = []
+        originals = _hand_originals[hand_class]
+        hand_class.__init__ = _hand_counted(hand_class, "hand_allocations", originals["__init__"])
+        for name in HAND_PREDICATES:
+            setattr(hand_class, name, _hand_counted(hand_class, f"hand.{name}", originals[name]))
+    _hand_profilers[hand_class].append(profiler)
+    _update_hand_targets(hand_class)
+
+def uninstrument_hands(hand_class, profiler):
+    """Stop counting into profiler; the original Hand methods come back once no profiler is left."""
+    profilers = _hand_profilers.get(hand_class, [])
+    for i, entry in enumerate(profilers):
+        if entry is profiler:
+            del profilers[i]
+            break
+    if profilers:
+        _update_hand_targets(hand_class)
+        return
+    for name, method in _hand_originals.pop(hand_class, {}).items():
+        setattr(hand_class, name, method)
+    _hand_profilers.pop(hand_class, None)
+    _hand_targets.pop(hand_class, None)
+
+class ImportProfiler:
+    """Records the time taken by every module imported while it is installed (like python -X importtime)."""
+    
+    def __init__(self):
+        # (module name, self seconds, cumulative seconds, nesting depth), in the order loading finished
+        self.imports = []
+        self._children = []
+        self._original = None
+        
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+        return self
+    
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+            
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        loaded = len(sys.modules)
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            if len(sys.modules) != loaded:
+                # sys.modules keeps insertion order, so the new entries are at the end
+                new = set(list(sys.modules)[loaded:])
+                self.imports.append((self._module_name(name, globals, fromlist, level, new),
+                                     elapsed - children, elapsed, len(self._children)))
+                
+    @staticmethod
+    def _module_name(name, globals, fromlist, level, new):
+        """The module an import statement loaded, e.g. game.evaluator for "from game import evaluator"."""
+        if level and globals:
+            package = globals.get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0]
+            name = f"{base}.{name}" if name else base
+        if name in new:
+            return name
+        for item in fromlist or ():
+            if f"{name}.{item}" in new:
+                return f"{name}.{item}"
+        return name
+    
+    def total(self):
+        """Seconds spent in top-level imports."""
+        return sum(cumulative for _, _, cumulative, depth in self.imports if depth == 0)
+    
+    def summary(self, limit=None):
+        """Return a text table of imports in load order, indented by nesting, optionally only the slowest."""
+        imports = self.imports
+        if limit is not None:
+            slowest = sorted(imports, key=lambda entry: -entry[2])[:limit]
+            imports = [entry for entry in imports if entry in slowest]
+        lines = [f"{'self ms':>9}{'total ms':>10}  module"]
+        for name, own, cumulative, depth in imports:
+            lines.append(f"{own * 1000:>9.2f}{cumulative * 1000:>10.2f}  {'  ' * depth}{name}")
+        lines.append(f"{'':>9}{self.total() * 1000:>10.2f}  (all imports)")
+        return "\n".join(lines)
@@ -0,0 +1,89 @@
+"""
+Seedable, splittable random number streams.
+
+An RNG is a random.Random that remembers where it came from: a root seed
+plus a key path such as ("tournament", 17) or ("table", 3). child() derives
+an independent stream for a sub-task by extending the path, and every
+stream is seeded by hashing its whole path, so results depend only on the
+root seed and the path, never on which worker or in what order streams were
+created. Decks, games and NPC policies take an RNG wherever they would
+otherwise use the global random module.
+
+For long runs, bulk shuffling draws deck permutations many at a time as a
+NumPy (hands, cards) matrix with a single vectorized call and hands them out
+one row per shuffle. NumPy is only imported when bulk shuffling is used.
+"""
+import random
+
+class RNG(random.Random):
+    """A random stream with an explicit seed that can split off independent child streams."""
+
+    def __init__(self, seed=None, key=(), bulk=0):
+        """
+        Args:
+            seed: Root seed (an int); None picks a fresh one from the OS, kept in self.root_seed
+            key: Path of this stream below the root, as built by child()
+            bulk: Pre-generate this many deck permutations at a time with NumPy (0: shuffle one by one)
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.root_seed = seed
+        self.key = tuple(key)
+        self.bulk = bulk
+        # Pre-generated permutations: (size, rows as lists, next row)
+        self._rows = (0, [], 0)
+        super().__init__(self._stream_seed())
+
+    def _stream_seed(self):
+        # Strings are hashed with SHA-512 by random.seed(), so nearby paths give unrelated streams
+        return "/".join([str(self.root_seed)] + [str(part) for part in self.key])
+
+    def child(self, *key):
+        """
+        Derive an independent stream, e.g. rng.child("table", 3).
+
+        The child depends only on this stream's seed and path plus key, not on
+        how much of this stream has been used.
+        """
+        return RNG(self.root_seed, self.key + key, self.bulk)
+
+    def spawn(self, count):
+        """Derive count independent child streams, numbered 0 to count - 1."""
+        return [self.child(i) for i in range(count)]
+
+    def __reduce__(self):
+        # Pickle (e.g. to a worker process) with the path and the current position in the stream
+        return (_restore, (self.root_seed, self.key, self.bulk, self.getstate()))
+
+    def numpy(self):
+        """A NumPy Generator seeded from this stream (requires NumPy)."""
+        import numpy as np
+        return np.random.default_rng(self.getrandbits(128))
+
+    def permutations(self, count, size=52):
+        """
+        Draw count random permutations of range(size) in one vectorized call (requires NumPy).
+
+        Returns:
+            numpy.ndarray: Array of shape (count, size), one permutation per row
+        """
+        import numpy as np
+        rows = np.broadcast_to(np.arange(size, dtype=np.int8 if size < 128 else np.intp), (count, size))
+        return self.numpy().permuted(rows, axis=1)
+
+    def permutation(self, size):
+        """A random permutation of range(size) as a list, from the bulk buffer if bulk is set."""
+        if not self.bulk:
+            order = list(range(size))
+            self.shuffle(order)
+            return order
+        row_size, rows, position = self._rows
+        if row_size != size or position == len(rows):
+            row_size, rows, position = size, self.permutations(self.bulk, size).tolist(), 0
+        self._rows = (row_size, rows, position + 1)
+        return rows[position]
+
+def _restore(seed, key, bulk, state):
+    rng = RNG(seed, key, bulk)
+    rng.setstate(state)
+    return rng